@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_project.settings")
 
 application = get_asgi_application()
+
+# Pre-resuelve URLconf, _meta de los modelos y schema antes del primer request
+from core.warmup import warm_up  # noqa: E402
+
+warm_up(connect_db=False)
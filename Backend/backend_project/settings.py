@@ -4,6 +4,7 @@ Django settings for backend_project project.
 Generated by 'django-admin startproject' using Django 5.2.8.
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # keep CORS at the top
+    "core.middleware.MetricsMiddleware",  # latencia/queries por ruta (/api/metrics/)
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -80,7 +82,7 @@ WSGI_APPLICATION = "backend_project.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("DJANGO_DB_NAME") or BASE_DIR / "db.sqlite3",
     }
 }
 
@@ -135,6 +137,22 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # JSON con orjson si está instalado (core.renderers); si no, el de DRF
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # token buckets de core.throttling (login/registro): capacidad/periodo
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "20/min",
+        "login_username": "10/min",
+        "register_ip": "10/hour",
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -155,6 +173,13 @@ SPECTACULAR_SETTINGS = {
     "SWAGGER_UI_SETTINGS": {"persistAuthorization": True},
 }
 
+# Schema pre-generado (core.schema / manage.py build_schema). Se regenera cuando
+# cambia SCHEMA_CODE_VERSION (p.ej. el SHA del deploy) o, si no se define, el
+# hash del código del proyecto.
+SCHEMA_CODE_VERSION = os.environ.get("SCHEMA_CODE_VERSION") or None
+SCHEMA_CACHE_DIR = Path(os.environ.get("SCHEMA_CACHE_DIR", BASE_DIR / ".schema_cache"))
+SCHEMA_CACHE_MAX_AGE = 86400  # segundos; los clientes revalidan con ETag
+
 # ---------------------------------------------------------------------------
 # Simple JWT: rotación y blacklist para mayor seguridad
 # ---------------------------------------------------------------------------
@@ -164,8 +189,81 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,  # rota refresh tokens cuando se usan
     "BLACKLIST_AFTER_ROTATION": True,  # marca el refresh antiguo como inválido
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # verifica la blacklist contra la deny-list en memoria (core.revocation)
+    "TOKEN_REFRESH_SERIALIZER": "core.serializers.CachedTokenRefreshSerializer",
 }
 
+# ---------------------------------------------------------------------------
+# Cachés
+# ---------------------------------------------------------------------------
+# DJANGO_CACHE_URL (redis://host:6379/0) configura una caché Redis compartida por
+# todos los workers; idempotencia, deny-list de jti y conteos del admin la usan.
+# Sin ella se usa LocMem, que es por proceso: sólo para desarrollo y tests.
+CACHE_URL = os.environ.get("DJANGO_CACHE_URL") or None
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        },
+    }
+
+# Backend de la deny-list de jti (core.revocation). LocalBackend trae de la BD las
+# revocaciones nuevas cada REVOCATION_SYNC_INTERVAL segundos; CacheBackend las
+# resuelve con la caché compartida, que no debe desalojar claves (noeviction).
+REVOCATION_BACKEND = os.environ.get("DJANGO_REVOCATION_BACKEND") or (
+    "core.revocation.CacheBackend" if CACHE_URL else "core.revocation.LocalBackend"
+)
+REVOCATION_SYNC_INTERVAL = 2.0
+
+# Idempotency-Key (core.idempotency): respuestas y locks en una caché compartida
+IDEMPOTENCY_CACHE = "default"
+IDEMPOTENCY_TTL = 86400  # segundos que se puede reintentar con la misma clave
+IDEMPOTENCY_LOCK_TTL = 30  # vida máxima del lock de una petición en curso
+IDEMPOTENCY_WAIT = 10  # segundos que un duplicado espera a la original
+# COUNT(*) cacheado de los changelists del admin (core.pagination)
+ADMIN_COUNT_CACHE_TTL = 60
+
+# ---------------------------------------------------------------------------
+# Peticiones agrupadas: POST /api/batch/ (core.batch)
+# ---------------------------------------------------------------------------
+BATCH_MAX_REQUESTS = 20  # sub-peticiones por batch
+BATCH_MAX_WORKERS = 4  # hilos para GET consecutivos
+
+# ---------------------------------------------------------------------------
+# Métricas Prometheus (/api/metrics/)
+# ---------------------------------------------------------------------------
+# Con varios workers (gunicorn) apunta METRICS_MULTIPROC_DIR a un directorio
+# compartido: cada worker vuelca ahí sus contadores y el scrape los combina.
+METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR") or None
+METRICS_FLUSH_INTERVAL = 5.0  # segundos entre volcados de cada worker
+# Acceso: "Authorization: Bearer $METRICS_TOKEN", sesión de staff o REMOTE_ADDR en
+# METRICS_ALLOWED_IPS (detrás de un proxy, REMOTE_ADDR es la IP del proxy).
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN") or None
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+METRICS_TABLE_COUNT_TTL = 60  # segundos que se cachea el tamaño de las tablas
+
+# ---------------------------------------------------------------------------
+# Warm-up de workers (core.warmup, llamado desde wsgi.py/asgi.py)
+# ---------------------------------------------------------------------------
+WARMUP_ON_STARTUP = os.environ.get("DJANGO_WARMUP", "1") != "0"
+
+# ---------------------------------------------------------------------------
+# Auditoría (core.audit): eventos encolados y escritos por lotes en segundo plano
+# ---------------------------------------------------------------------------
+# con DJANGO_AUDIT_SYNC=1 (scripts) cada evento se inserta en el acto; los tests
+# que lo necesitan usan override_settings(AUDIT_SYNC=True)
+AUDIT_SYNC = os.environ.get("DJANGO_AUDIT_SYNC") == "1"
+AUDIT_BATCH_SIZE = 200
+AUDIT_FLUSH_INTERVAL = 2.0  # segundos
+
 # ---------------------------------------------------------------------------
 # Custom user model
 # ---------------------------------------------------------------------------
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_project.settings")
 
 application = get_wsgi_application()
+
+# Pre-resuelve URLconf, _meta de los modelos, schema y conexión a BD antes del primer request
+from core.warmup import warm_up  # noqa: E402
+
+warm_up()
@@ -1,21 +1,58 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
 
-# Register your models here.
+from .models import AuditEvent, Classroom, StudentProfile, DeletionLog, User
+from .pagination import EstimatedCountPaginator
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    """
+    Base para changelists de tablas que crecen: conteo estimado/cacheado y sin
+    el segundo COUNT(*) del total sin filtrar.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
-from django.contrib import admin
-from .models import Classroom, StudentProfile, DeletionLog
+
+@admin.register(User)
+class CoreUserAdmin(ScalableAdmin, UserAdmin):
+    list_display = ("username", "email", "role", "is_active", "is_staff")
+    list_filter = ("role", "is_active", "is_staff")
+    # prefijo (^): usa los índices de username/email; lo usa autocomplete_fields
+    search_fields = ("^username", "^email")
+    fieldsets = UserAdmin.fieldsets + (("Rol", {"fields": ("role",)}),)
 
 
 @admin.register(Classroom)
-class ClassroomAdmin(admin.ModelAdmin):
-    list_display = ("id", "nombre", "created_at")
+class ClassroomAdmin(ScalableAdmin):
+    list_display = (
+        "id",
+        "nombre",
+        "students_count",
+        "active_students_count",
+        "created_at",
+    )
+    search_fields = ("nombre",)
 
 
 @admin.register(StudentProfile)
-class StudentProfileAdmin(admin.ModelAdmin):
+class StudentProfileAdmin(ScalableAdmin):
     list_display = ("id", "user", "classroom", "created_at")
+    list_select_related = ("user", "classroom")
+    autocomplete_fields = ("user", "classroom")
 
 
 @admin.register(DeletionLog)
-class DeletionLogAdmin(admin.ModelAdmin):
+class DeletionLogAdmin(ScalableAdmin):
     list_display = ("id", "deleted_user", "deleted_by", "created_at", "reason")
+    list_select_related = ("deleted_user", "deleted_by")
+    autocomplete_fields = ("deleted_user", "deleted_by")
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(ScalableAdmin):
+    list_display = ("id", "action", "actor", "target_type", "target_id", "created_at")
+    list_filter = ("action",)
+    list_select_related = ("actor",)
+    autocomplete_fields = ("actor",)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        # conecta las señales de la deny-list de jti y de los resúmenes
+        from . import revocation, summaries  # noqa: F401
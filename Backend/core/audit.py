@@ -0,0 +1,198 @@
+# core/audit.py
+"""
+Auditoría asíncrona por lotes.
+
+record() no escribe en la BD en el camino de la petición: arma el AuditEvent,
+lo encola en memoria (tras el commit de la transacción en curso) y un hilo de
+fondo por proceso lo inserta con bulk_create cuando se juntan AUDIT_BATCH_SIZE
+eventos o pasan AUDIT_FLUSH_INTERVAL segundos. Lo pendiente se vuelca también
+al salir del proceso (atexit). Si la BD no responde el lote vuelve a la cola;
+si lo que falla es una fila (dato inválido), el lote se parte en mitades hasta
+aislarla y sólo esa se descarta, con un log.
+
+Con settings.AUDIT_SYNC = True (tests, scripts) cada evento se inserta en el
+momento dentro de la transacción actual.
+"""
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import (
+    InterfaceError,
+    OperationalError,
+    close_old_connections,
+    transaction,
+)
+from django.utils import timezone
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    def __init__(self, batch_size=200, flush_interval=2.0, max_pending=10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self.written = 0  # eventos guardados por este writer
+
+    def submit(self, event):
+        if self._closed:
+            AuditEvent.objects.bulk_create([event])
+            return
+        self._ensure_thread()
+        with self._lock:
+            self._pending.append(event)
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            # el hilo no da abasto (¿BD caída?): escribe quien encola
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        try:
+            written = self._insert(batch)
+        except (OperationalError, InterfaceError):
+            logger.exception("audit: no se pudieron guardar %d eventos", len(batch))
+            with self._lock:
+                # vuelven al frente de la cola para el próximo intento, sin
+                # pasar de max_pending (se descartan los más nuevos del lote)
+                keep = max(0, self.max_pending - len(self._pending))
+                if keep < len(batch):
+                    logger.error(
+                        "audit: cola llena, se descartan %d eventos",
+                        len(batch) - keep,
+                    )
+                self._pending[:0] = batch[:keep]
+            return 0
+        with self._lock:
+            self.written += written
+        return written
+
+    def _insert(self, batch):
+        """
+        Inserta el lote y devuelve cuántos eventos se guardaron. Un error de
+        conexión se propaga (el lote se reintenta entero); cualquier otro se
+        atribuye a alguna fila: se reintenta por mitades y las filas que fallan
+        solas se descartan.
+        """
+        try:
+            with transaction.atomic():  # todo o nada: el reintento no duplica
+                AuditEvent.objects.bulk_create(batch, batch_size=self.batch_size)
+            return len(batch)
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception:
+            if len(batch) == 1:
+                logger.exception("audit: se descarta un evento inválido")
+                return 0
+        half = len(batch) // 2
+        return self._insert(batch[:half]) + self._insert(batch[half:])
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # proceso hijo tras fork: lo pendiente es del padre
+                self._pending = []
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def close(self, timeout=5.0):
+        """
+        Detiene el hilo y vuelca lo pendiente (atexit).
+        """
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        return self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter(
+                    batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 200),
+                    flush_interval=getattr(settings, "AUDIT_FLUSH_INTERVAL", 2.0),
+                )
+                atexit.register(_writer.close)
+    return _writer
+
+
+def _event(action, actor, target, data):
+    return AuditEvent(
+        action=action,
+        actor_id=actor.pk if actor is not None and actor.is_authenticated else None,
+        target_type=target._meta.label_lower if target is not None else "",
+        target_id=str(target.pk) if target is not None else "",
+        data=data,
+        created_at=timezone.now(),
+    )
+
+
+def _dispatch(events):
+    if getattr(settings, "AUDIT_SYNC", False):
+        AuditEvent.objects.bulk_create(events)
+        return
+
+    def submit():
+        writer = get_writer()
+        for event in events:
+            writer.submit(event)
+
+    # sólo lo que realmente se confirmó; sin transacción abierta corre ya
+    transaction.on_commit(submit)
+
+
+def record(action, actor=None, target=None, **data):
+    """
+    Registra un evento de auditoría.
+    record("tarea.updated", actor=request.user, target=tarea, fields=["titulo"])
+    """
+    event = _event(action, actor, target, data)
+    _dispatch([event])
+    return event
+
+
+def record_many(action, actor=None, targets=(), **data):
+    """
+    Un evento por objetivo (escrituras masivas); en modo síncrono, un solo INSERT.
+    """
+    events = [_event(action, actor, target, data) for target in targets]
+    if events:
+        _dispatch(events)
+    return events
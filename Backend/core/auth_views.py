@@ -6,6 +6,36 @@ from rest_framework_simplejwt.token_blacklist.models import (
     BlacklistedToken,
     OutstandingToken,
 )
+from rest_framework_simplejwt.exceptions import ExpiredTokenError, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from . import audit
+from .revocation import get_revocation_cache
+from .throttling import AllThrottlesMixin, LoginIPThrottle, LoginUsernameThrottle
+
+
+class LoginView(AllThrottlesMixin, TokenObtainPairView):
+    """
+    TokenObtainPairView con throttling por IP y por username.
+    Los throttles corren antes de validar credenciales, así que un intento
+    rechazado (429) nunca llega a calcular el hash de la contraseña, y si
+    bloquea uno no se gasta cupo del otro.
+    """
+
+    throttle_classes = (LoginIPThrottle, LoginUsernameThrottle)
+
+    def get_serializer(self, *args, **kwargs):
+        self._login_serializer = super().get_serializer(*args, **kwargs)
+        return self._login_serializer
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            user = self._login_serializer.user
+            audit.record("auth.login", actor=user, target=user)
+        return response
 
 
 class LogoutView(APIView):
@@ -17,9 +47,23 @@ class LogoutView(APIView):
             return Response(
                 {"detail": "refresh token required"}, status=status.HTTP_400_BAD_REQUEST
             )
+        try:
+            # buscar por jti (índice único) en lugar de comparar el texto completo
+            jti = UntypedToken(refresh_token)[api_settings.JTI_CLAIM]
+        except ExpiredTokenError:
+            # firma válida pero vencido: ya no sirve para refrescar, así que la
+            # sesión está cerrada de hecho
+            return Response({"detail": "token expired"}, status=status.HTTP_200_OK)
+        except (TokenError, KeyError):
+            return Response(
+                {"detail": "token not found"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if get_revocation_cache().is_revoked(jti):
+            # ya revocado: idempotente y sin escrituras
+            return Response({"detail": "token blacklisted"}, status=status.HTTP_200_OK)
         try:
             # blacklisting the provided refresh token
-            token = OutstandingToken.objects.get(token=refresh_token)
+            token = OutstandingToken.objects.get(jti=jti)
             BlacklistedToken.objects.get_or_create(token=token)
             return Response({"detail": "token blacklisted"}, status=status.HTTP_200_OK)
         except OutstandingToken.DoesNotExist:
@@ -0,0 +1,195 @@
+# core/batch.py
+"""
+POST /api/batch/: varias llamadas a la API en un solo round trip.
+
+Cada sub-petición se resuelve con el URL resolver y se despacha a la vista
+existente dentro del mismo proceso, con el usuario ya autenticado por la
+petición batch (el JWT se valida una sola vez). Los GET consecutivos se
+ejecutan en paralelo en un pool de hilos compartido por todo el proceso
+(BATCH_MAX_WORKERS hilos, creado una sola vez); las escrituras, en orden y de
+a una.
+
+Las sub-peticiones no pasan por la cadena de middlewares: CORS, seguridad,
+CSRF y clickjacking ya se aplicaron a la petición batch, y de Session/Auth se
+heredan `session` y `user`. Las métricas por ruta (MetricsMiddleware) se
+registran aquí para cada sub-petición. Una excepción en una sub-petición se
+registra en el log y se devuelve como {"status": 500} sin cortar el resto.
+"""
+import json
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, connections
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import metrics
+from .middleware import _QueryCounter
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD")
+# no se copian de la petición batch a las sub-peticiones
+DROPPED_META = (
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "QUERY_STRING",
+    "HTTP_IDEMPOTENCY_KEY",
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "BATCH_MAX_WORKERS", 4),
+                    thread_name_prefix="batch",
+                )
+                atexit.register(_pool.shutdown, wait=False)
+    return _pool
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
+    )
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
+
+    def validate_path(self, value):
+        if not value.startswith("/api/"):
+            raise serializers.ValidationError("Sólo rutas bajo /api/.")
+        return value
+
+
+class BatchView(APIView):
+    """
+    Body: [{"method": "GET", "path": "/api/auth/me/"}, ...]
+    Respuesta: [{"status": 200, "body": {...}}, ...] en el mismo orden.
+    """
+
+    permission_classes = (AllowAny,)  # cada sub-petición aplica sus permisos
+
+    def post(self, request):
+        max_items = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+        serializer = BatchItemSerializer(
+            data=request.data, many=True, max_length=max_items
+        )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+
+        user, auth = request.user, request.auth  # una sola autenticación
+        results = [None] * len(items)
+        i = 0
+        while i < len(items):
+            j = i
+            while j < len(items) and items[j]["method"] in SAFE_METHODS:
+                j += 1
+            if j - i > 1 and self._can_parallelize():
+                self._run_parallel(request, items, i, j, user, auth, results)
+                i = j
+            else:
+                results[i] = self._dispatch(request, items[i], user, auth)
+                i += 1
+        return Response(results, status=status.HTTP_200_OK)
+
+    def _can_parallelize(self):
+        # dentro de una transacción (ATOMIC_REQUESTS, tests) otros hilos no
+        # verían sus datos: se ejecuta en serie
+        return not connection.in_atomic_block
+
+    def _run_parallel(self, request, items, start, end, user, auth, results):
+        def run(index):
+            try:
+                return self._dispatch(request, items[index], user, auth)
+            finally:
+                # el hilo sobrevive a la petición: no le queda conexión abierta
+                connections.close_all()
+
+        indexes = range(start, end)
+        for index, result in zip(indexes, get_pool().map(run, indexes)):
+            results[index] = result
+
+    def _dispatch(self, request, item, user, auth):
+        try:
+            return self._call(request, item, user, auth)
+        except Exception:
+            logger.exception("batch: %s %s falló", item["method"], item["path"])
+            return {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "body": None}
+
+    def _call(self, request, item, user, auth):
+        path, _, query = item["path"].partition("?")
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return {"status": status.HTTP_404_NOT_FOUND, "body": None}
+        if match.func is request.resolver_match.func:
+            return {
+                "status": status.HTTP_400_BAD_REQUEST,
+                "body": {"detail": "No se permiten batch anidados."},
+            }
+
+        body = b""
+        if "body" in item:
+            body = json.dumps(item["body"]).encode()
+        environ = {k: v for k, v in request.META.items() if k not in DROPPED_META}
+        environ.update(
+            {
+                "REQUEST_METHOD": item["method"],
+                "PATH_INFO": path,
+                "QUERY_STRING": query,
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "wsgi.input": BytesIO(body),
+            }
+        )
+        sub_request = WSGIRequest(environ)
+        sub_request.resolver_match = match
+        # lo que dejarían SessionMiddleware y AuthenticationMiddleware
+        sub_request.user = user
+        if hasattr(request, "session"):
+            sub_request.session = request.session
+        if user.is_authenticated:
+            # DRF usa estos atributos en lugar de volver a autenticar
+            sub_request._force_auth_user = user
+            sub_request._force_auth_token = auth
+
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = match.func(sub_request, *match.args, **match.kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        metrics.observe_request(
+            item["method"],
+            match.route,
+            response.status_code,
+            time.perf_counter() - start,
+            counter.count,
+        )
+        return {"status": response.status_code, "body": self._body(response)}
+
+    def _body(self, response):
+        if response.streaming:
+            content = b"".join(response.streaming_content)
+        else:
+            content = response.content
+        if not content:
+            return None
+        if response.get("Content-Type", "").startswith("application/json"):
+            return json.loads(content)
+        return content.decode(response.charset or "utf-8", errors="replace")
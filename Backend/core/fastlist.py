@@ -0,0 +1,100 @@
+# core/fastlist.py
+"""
+Camino rápido de sólo lectura para list().
+
+En vez de instanciar un modelo por fila y recorrer el serializer completo,
+ValuesListMixin lee las columnas con values_list() y aplica a cada valor el
+to_representation() del propio campo del serializer, así que la salida es la
+misma que la del camino normal. Los campos que no salen de una columna
+(SerializerMethodField, source="*", serializers anidados, relaciones que no son
+por PK) o un to_representation() propio hacen que la vista use el list() de
+siempre.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PKOnlyObject
+from rest_framework.response import Response
+
+
+def _model_field(model, attrs):
+    field = None
+    for attr in attrs:
+        if model is None:
+            return None
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def _converter(field, model_field):
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return lambda value: field.to_representation(PKOnlyObject(value))
+    if isinstance(model_field, models.FileField):
+        return lambda value: field.to_representation(
+            model_field.attr_class(None, model_field, value)
+        )
+    return field.to_representation
+
+
+def values_plan(serializer, model):
+    """
+    [(nombre, columna, conversor)] para el serializer, o None si algún campo
+    no se puede leer de una columna o si el serializer redefine
+    to_representation() (su salida ya no es campo por campo).
+    """
+    if (
+        type(serializer).to_representation
+        is not serializers.ModelSerializer.to_representation
+    ):
+        return None
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if (
+            field.source == "*"
+            or isinstance(field, (serializers.BaseSerializer, ManyRelatedField))
+            or isinstance(field, serializers.SerializerMethodField)
+            or (
+                isinstance(field, serializers.RelatedField)
+                and not isinstance(field, serializers.PrimaryKeyRelatedField)
+            )
+        ):
+            return None
+        model_field = _model_field(model, field.source_attrs)
+        if model_field is None or model_field.many_to_many or model_field.one_to_many:
+            return None
+        plan.append(
+            (name, "__".join(field.source_attrs), _converter(field, model_field))
+        )
+    return plan
+
+
+class ValuesListMixin:
+    """
+    Para ModelViewSets sin paginación. values_list_fast_path = False lo apaga.
+    """
+
+    values_list_fast_path = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_list_fast_path or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = values_plan(self.get_serializer(), queryset.model)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = queryset.values_list(*[column for _, column, _ in plan])
+        data = [
+            {
+                name: None if value is None else convert(value)
+                for (name, _, convert), value in zip(plan, row)
+            }
+            for row in rows
+        ]
+        return Response(data)
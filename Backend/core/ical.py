@@ -0,0 +1,175 @@
+# core/ical.py
+"""
+Feed iCalendar (.ics) de entregas de tareas, uno por usuario.
+
+Las apps de calendario no mandan el JWT: se suscriben a una URL con un token
+firmado (django.core.signing) con el pk del usuario y su
+calendar_token_version; al rotarla (POST /api/tareas/calendar/) las URLs
+anteriores dejan de valer. El cuerpo se genera en streaming con iterator()
+—nunca se cargan todas las tareas en memoria— y la vista soporta GET
+condicional: cada sondeo cuesta validar el token y un agregado y, si nada
+cambió, un 304 sin cuerpo.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_GET
+
+from .models import Tarea
+
+SALT = "core.ical.feed"
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+EVENT_DURATION = timedelta(hours=1)
+
+
+# ---------------- token ----------------
+def feed_token(user):
+    return signing.dumps([user.pk, user.calendar_token_version], salt=SALT)
+
+
+def user_from_token(token):
+    try:
+        pk, version = signing.loads(token, salt=SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return (
+        get_user_model()
+        .objects.filter(pk=pk, is_active=True, calendar_token_version=version)
+        .first()
+    )
+
+
+# ---------------- formato ----------------
+def _escape(text):
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """
+    RFC 5545: líneas de hasta 75 octetos, las continuaciones empiezan con espacio.
+    """
+    out, current, size = [], [], 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > 75:
+            out.append("".join(current))
+            current, size = [" "], 1
+        current.append(char)
+        size += width
+    out.append("".join(current))
+    return "\r\n".join(out) + "\r\n"
+
+
+def _stamp(dt):
+    return dt.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _start_of_day(now):
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _window_start(now):
+    past_days = getattr(settings, "ICS_FEED_PAST_DAYS", 90)
+    return _start_of_day(now) - timedelta(days=past_days)
+
+
+def feed_queryset(now=None):
+    return (
+        Tarea.objects.filter(fecha_entrega__gte=_window_start(now or timezone.now()))
+        .select_related("materia")
+        .only(
+            "id",
+            "titulo",
+            "descripcion",
+            "fecha_entrega",
+            "updated_at",
+            "materia__nombre",
+        )
+        .order_by("fecha_entrega", "id")
+    )
+
+
+def iter_calendar(queryset, host="efds"):
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "PRODID:-//EFDS//Tareas//ES\r\n"
+    yield "CALSCALE:GREGORIAN\r\n"
+    yield _fold("X-WR-CALNAME:Entregas de tareas")
+    for tarea in queryset.iterator(chunk_size=500):
+        due = tarea.fecha_entrega
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:tarea-{tarea.pk}@{host}",
+            f"DTSTAMP:{_stamp(tarea.updated_at)}",
+            f"DTSTART:{_stamp(due - EVENT_DURATION)}",
+            f"DTEND:{_stamp(due)}",
+            f"SUMMARY:{_escape(f'{tarea.materia.nombre}: {tarea.titulo}')}",
+        ]
+        if tarea.descripcion:
+            lines.append(f"DESCRIPTION:{_escape(tarea.descripcion)}")
+        lines.append("END:VEVENT")
+        yield "".join(_fold(line) for line in lines)
+    yield "END:VCALENDAR\r\n"
+
+
+# ---------------- GET condicional ----------------
+def _feed_state(request):
+    """
+    Validadores del feed, calculados una vez por petición.
+    Un borrado no mueve Max(updated_at) pero sí el recuento, que va en el ETag.
+    Sólo se agregan las tareas de la ventana del feed (las mismas que lista
+    feed_queryset), con un rango sobre el índice (fecha_entrega, updated_at).
+    """
+    state = getattr(request, "_ical_state", None)
+    if state is None:
+        now = timezone.now()
+        tareas = Tarea.objects.filter(fecha_entrega__gte=_window_start(now)).aggregate(
+            count=Count("pk"), last=Max("updated_at")
+        )
+        # la ventana avanza cada día aunque no haya escrituras
+        stamps = [_start_of_day(now), tareas["last"]]
+        last_modified = max(s for s in stamps if s is not None)
+        raw = f"{tareas['count']}:{last_modified.isoformat()}"
+        state = request._ical_state = (
+            hashlib.sha1(raw.encode()).hexdigest(),
+            last_modified,
+        )
+    return state
+
+
+@require_GET
+def tareas_feed(request, token):
+    """
+    GET /api/calendar/<token>.ics
+    El token se valida antes del GET condicional: un token revocado recibe 404,
+    nunca un 304.
+    """
+    if user_from_token(token) is None:
+        raise Http404
+    return _calendar_response(request)
+
+
+@condition(
+    etag_func=lambda request: _feed_state(request)[0],
+    last_modified_func=lambda request: _feed_state(request)[1],
+)
+def _calendar_response(request):
+    response = StreamingHttpResponse(
+        iter_calendar(feed_queryset(), host=request.get_host()),
+        content_type=CONTENT_TYPE,
+    )
+    response["Content-Disposition"] = 'inline; filename="tareas.ics"'
+    response["Cache-Control"] = "private, no-cache"
+    return response
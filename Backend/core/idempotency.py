@@ -0,0 +1,163 @@
+# core/idempotency.py
+"""
+Soporte de la cabecera Idempotency-Key para endpoints de creación.
+
+La primera respuesta a (usuario o IP, método, ruta, clave) se guarda en la caché
+settings.IDEMPOTENCY_CACHE durante IDEMPOTENCY_TTL y los reintentos la reciben
+tal cual, con "Idempotent-Replayed: true", sin volver a validar ni escribir.
+Mientras la primera está en curso un lock (cache.add, atómico en Redis y
+Memcached) hace que los duplicados esperen su resultado en vez de ejecutarse
+otra vez. Reusar la clave con otro cuerpo devuelve 422.
+
+La caché tiene que ser compartida por todos los workers (DJANGO_CACHE_URL): con
+LocMem, que es por proceso, un reintento que cae en otro worker se ejecuta de
+nuevo. LocMem sólo sirve para desarrollo y tests.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+from rest_framework.utils.encoders import JSONEncoder
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+REPLAYED_HEADERS = ("Location",)
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Hay una petición en curso con la misma Idempotency-Key."
+    default_code = "idempotency_in_flight"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "La Idempotency-Key ya se usó con otro cuerpo."
+    default_code = "idempotency_key_reused"
+
+
+class _Replay(Exception):
+    def __init__(self, stored):
+        self.stored = stored
+
+
+def _cache():
+    return caches[getattr(settings, "IDEMPOTENCY_CACHE", "default")]
+
+
+def _fingerprint(data):
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _keys(owner, method, path, key):
+    raw = f"{owner}:{method}:{path}:{key}"
+    cache_key = "idem:" + hashlib.sha256(raw.encode()).hexdigest()
+    return cache_key, cache_key + ":lock"
+
+
+class IdempotencyMixin:
+    """
+    Para APIViews/ViewSets. Sólo actúa en idempotent_methods y cuando el cliente
+    manda la cabecera; sin ella el endpoint se comporta como siempre.
+    """
+
+    idempotent_methods = ("POST",)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        key = request.headers.get(HEADER)
+        if not key or request.method not in self.idempotent_methods:
+            return
+        if len(key) > 255:
+            raise ValidationError({HEADER: "Máximo 255 caracteres."})
+
+        user = request.user
+        owner = (
+            f"u{user.pk}"
+            if user.is_authenticated
+            else BaseThrottle().get_ident(request)
+        )
+        cache_key, lock_key = _keys(owner, request.method, request.path, key)
+        fingerprint = _fingerprint(request.data)
+
+        cache = _cache()
+        stored = cache.get(cache_key)
+        if stored is None:
+            lock_ttl = getattr(settings, "IDEMPOTENCY_LOCK_TTL", 30)
+            if cache.add(lock_key, fingerprint, lock_ttl):
+                # la primera pudo guardar su respuesta y soltar el lock entre
+                # el get y el add: entonces se reproduce, no se ejecuta otra vez
+                stored = cache.get(cache_key)
+                if stored is None:
+                    request._idempotency = (cache_key, lock_key, fingerprint)
+                    return
+                cache.delete(lock_key)
+            else:
+                stored = self._wait_for_result(cache, cache_key, lock_key, fingerprint)
+        if stored["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReused()
+        raise _Replay(stored)
+
+    def _wait_for_result(self, cache, cache_key, lock_key, fingerprint):
+        """
+        Otra petición con la misma clave está en curso: espera su respuesta.
+        """
+        deadline = time.monotonic() + getattr(settings, "IDEMPOTENCY_WAIT", 10)
+        while True:
+            in_flight = cache.get(lock_key)
+            if in_flight is not None and in_flight != fingerprint:
+                raise IdempotencyKeyReused()
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return stored
+            if in_flight is None or time.monotonic() >= deadline:
+                # la primera falló (5xx) o tarda demasiado: el cliente reintenta
+                raise IdempotencyConflict()
+            time.sleep(0.05)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            stored = exc.stored
+            response = Response(stored["data"], status=stored["status"])
+            for name, value in stored["headers"].items():
+                response[name] = value
+            response[REPLAY_HEADER] = "true"
+            return response
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            self._release(self.request)
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        pending = getattr(request, "_idempotency", None)
+        if pending is None:
+            return response
+        cache_key, lock_key, fingerprint = pending
+        if response.status_code < 500:
+            data = getattr(response, "data", None)
+            stored = {
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                # copia JSON: no guardar ReturnDict/instancias en la caché
+                "data": json.loads(json.dumps(data, cls=JSONEncoder)),
+                "headers": {h: response[h] for h in REPLAYED_HEADERS if h in response},
+            }
+            ttl = getattr(settings, "IDEMPOTENCY_TTL", 86400)
+            _cache().set(cache_key, stored, ttl)
+        self._release(request)
+        return response
+
+    def _release(self, request):
+        pending = getattr(request, "_idempotency", None)
+        if pending is not None:
+            _cache().delete(pending[1])
+            request._idempotency = None
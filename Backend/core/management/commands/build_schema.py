@@ -0,0 +1,16 @@
+# core/management/commands/build_schema.py
+from django.core.management.base import BaseCommand
+
+from core.schema import code_version, generate_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera el schema OpenAPI de la versión de código actual y lo guarda en "
+        "SCHEMA_CACHE_DIR para que /api/schema/ no lo introspeccione en runtime."
+    )
+
+    def handle(self, *args, **options):
+        version = code_version()
+        path = write_schema(generate_schema(), version)
+        self.stdout.write(f"schema {version} escrito en {path}")
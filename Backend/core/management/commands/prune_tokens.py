@@ -0,0 +1,57 @@
+# core/management/commands/prune_tokens.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra en lotes acotados los OutstandingToken expirados y sus "
+        "BlacklistedToken. Cada lote es una transacción corta, así que no "
+        "mantiene locks largos sobre las tablas mientras el API sigue atendiendo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Pausa en segundos entre lotes para ceder la BD.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Detenerse tras N lotes (útil para cron con ventana acotada).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by("pk")
+
+        batches = deleted_outstanding = deleted_blacklisted = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            ids = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                bl, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                out, _ = OutstandingToken.objects.filter(pk__in=ids).delete()
+            batches += 1
+            deleted_blacklisted += bl
+            deleted_outstanding += out
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            f"{deleted_outstanding} outstanding y {deleted_blacklisted} blacklisted "
+            f"borrados en {batches} lotes"
+        )
@@ -0,0 +1,29 @@
+# core/management/commands/rebuild_materia_summaries.py
+from django.core.management.base import BaseCommand
+
+from core.summaries import rebuild_all, refresh_stale_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye MateriaSummary desde Tarea con un único agregado por materia "
+        "(repara desvíos, p.ej. tras queryset.update() o cargas masivas). "
+        "Con --stale sólo refresca las filas cuya próxima entrega ya pasó; "
+        "programarlo cada pocos minutos mantiene overdue_count al día."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--stale",
+            action="store_true",
+            help="Sólo las filas vencidas (next_fecha_entrega en el pasado).",
+        )
+
+    def handle(self, *args, **options):
+        if options["stale"]:
+            count = refresh_stale_summaries()
+            self.stdout.write(f"{count} resúmenes de materia vencidos refrescados")
+            return
+        count = rebuild_all(batch_size=options["batch_size"])
+        self.stdout.write(f"{count} resúmenes de materia reconstruidos")
@@ -0,0 +1,34 @@
+# core/management/commands/recount_classrooms.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from core.models import Classroom
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula students_count/active_students_count de todos los salones con "
+        "una sola query agregada (repara desvíos de los contadores desnormalizados, "
+        "p.ej. tras un queryset.update() que no dispara señales)."
+    )
+
+    def handle(self, *args, **options):
+        rooms = list(
+            Classroom.objects.annotate(
+                n=Count("students"),
+                n_active=Count("students", filter=Q(students__user__is_active=True)),
+            )
+        )
+        drifted = [
+            room
+            for room in rooms
+            if (room.students_count, room.active_students_count)
+            != (room.n, room.n_active)
+        ]
+        for room in drifted:
+            room.students_count = room.n
+            room.active_students_count = room.n_active
+        Classroom.objects.bulk_update(
+            drifted, ["students_count", "active_students_count"], batch_size=500
+        )
+        self.stdout.write(f"{len(drifted)} de {len(rooms)} salones corregidos")
@@ -0,0 +1,92 @@
+# core/management/commands/startup_profile.py
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Lo que hace un worker al arrancar: importar la app WSGI (que incluye el warm-up).
+TARGETS = {
+    "wsgi": "import backend_project.wsgi",
+    "asgi": "import backend_project.asgi",
+    "setup": "import django; django.setup()",
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parsea la salida de `python -X importtime`:
+        import time: self [us] | cumulative | imported package
+    Devuelve [(módulo, self_us, cumulative_us)].
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:") :].split("|")
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Arranca un proceso limpio con `python -X importtime` y reporta el "
+        "tiempo de import por módulo (self y acumulado)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=sorted(TARGETS), default="wsgi")
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument(
+            "--sort", choices=("cumulative", "self"), default="cumulative"
+        )
+        parser.add_argument(
+            "--no-warmup",
+            action="store_true",
+            help="Desactiva el warm-up (WARMUP_ON_STARTUP=0) para medir sólo imports.",
+        )
+
+    def handle(self, *args, **options):
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=os.environ.get(
+                "DJANGO_SETTINGS_MODULE", "backend_project.settings"
+            ),
+        )
+        if options["no_warmup"]:
+            env["DJANGO_WARMUP"] = "0"
+
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", TARGETS[options["target"]]],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            self.stderr.write(proc.stderr[-2000:])
+            raise SystemExit(proc.returncode)
+
+        rows = parse_importtime(proc.stderr)
+        col = 2 if options["sort"] == "cumulative" else 1
+        rows.sort(key=lambda r: r[col], reverse=True)
+
+        self.stdout.write(f"{'módulo':<60} {'self ms':>9} {'acum ms':>9}")
+        self.stdout.write("-" * 80)
+        for module, self_us, cumulative_us in rows[: options["limit"]]:
+            self.stdout.write(
+                f"{module[:60]:<60} {self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}"
+            )
+        imports_ms = sum(r[1] for r in rows) / 1000
+        self.stdout.write("-" * 80)
+        self.stdout.write(
+            f"{len(rows)} módulos, {imports_ms:.0f} ms en imports, "
+            f"{wall * 1000:.0f} ms de arranque total ({options['target']})"
+        )
@@ -0,0 +1,322 @@
+# core/metrics.py
+"""
+Métricas agregadas por proceso, expuestas en formato de texto de Prometheus.
+
+El camino caliente (una petición HTTP) no toma locks: cada hilo escribe en su
+propio "shard" y sólo al hacer scrape se combinan todos. Los shards de hilos
+que ya terminaron se funden en uno base (al registrar uno nuevo y en cada
+scrape), así que los hilos de vida corta no acumulan shards. Con varios workers de
+gunicorn se puede activar el modo multiproceso (METRICS_MULTIPROC_DIR): cada
+worker vuelca periódicamente su snapshot a un archivo JSON en un directorio
+compartido y el worker que atiende el scrape combina todos los archivos.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# nombre -> (tipo, ayuda, buckets)
+FAMILIES = {
+    "http_request_duration_seconds": (
+        "histogram",
+        "Latencia de las peticiones HTTP por ruta del resolver.",
+        LATENCY_BUCKETS,
+    ),
+    "http_requests_total": (
+        "counter",
+        "Peticiones HTTP atendidas por ruta y status.",
+        None,
+    ),
+    "db_queries_per_request": (
+        "histogram",
+        "Número de queries SQL ejecutadas por petición.",
+        QUERY_BUCKETS,
+    ),
+    "cache_requests_total": (
+        "counter",
+        "Consultas a cachés internas de la app (result=hit|miss).",
+        None,
+    ),
+}
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters = {}
+        # (nombre, labels) -> [conteos por bucket (+Inf al final), suma]
+        self.histograms = {}
+
+
+class Registry:
+    """
+    Contadores e histogramas en memoria, particionados por hilo.
+    """
+
+    def __init__(self, families=None):
+        self.families = families or FAMILIES
+        self._local = threading.local()
+        self._shards = []  # [(weakref al hilo, shard)]
+        self._retired = _Shard()  # acumulado de hilos terminados
+        self._lock = threading.Lock()  # para registrar/fundir shards
+        self._last_flush = 0.0
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            with self._lock:
+                self._retire_dead_locked()
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+            self._local.shard = shard
+        return shard
+
+    def _retire_dead_locked(self):
+        """
+        Funde en _retired los shards de hilos terminados (ya nadie escribe en
+        ellos) y los descarta.
+        """
+        alive = []
+        for ref, shard in self._shards:
+            thread = ref()
+            if thread is not None and thread.is_alive():
+                alive.append((ref, shard))
+                continue
+            for key, value in shard.counters.items():
+                counters = self._retired.counters
+                counters[key] = counters.get(key, 0) + value
+            for key, (counts, total) in shard.histograms.items():
+                _merge_hist(self._retired.histograms, key, list(counts), total)
+        self._shards = alive
+
+    def inc(self, name, labels, amount=1):
+        counters = self._shard().counters
+        key = (name, _key(labels))
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = self.families[name][2]
+        histograms = self._shard().histograms
+        key = (name, _key(labels))
+        entry = histograms.get(key)
+        if entry is None:
+            entry = histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(buckets, value)] += 1
+        entry[1] += value
+
+    # ---------- snapshot / multiproceso ----------
+    def snapshot(self):
+        """
+        Combina los shards de todos los hilos. Devuelve un dict serializable.
+        """
+        counters, histograms = {}, {}
+        with self._lock:
+            self._retire_dead_locked()
+            shards = [shard for _, shard in self._shards]
+            retired = self._retired
+            counters.update(retired.counters)
+            for key, (counts, total) in retired.histograms.items():
+                histograms[key] = [list(counts), total]
+        for shard in shards:
+            # dict.copy() es atómico bajo el GIL: no choca con escrituras concurrentes
+            for key, value in shard.counters.copy().items():
+                counters[key] = counters.get(key, 0) + value
+            for key, (counts, total) in shard.histograms.copy().items():
+                _merge_hist(histograms, key, list(counts), total)
+        return {"counters": counters, "histograms": histograms}
+
+    def maybe_flush(self):
+        """
+        En modo multiproceso, vuelca el snapshot de este worker cada
+        METRICS_FLUSH_INTERVAL segundos.
+        """
+        directory = getattr(settings, "METRICS_MULTIPROC_DIR", None)
+        if not directory:
+            return
+        now = time.monotonic()
+        if now - self._last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0):
+            return
+        self._last_flush = now
+        self.flush(directory)
+
+    def flush(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(_dump(self.snapshot()), fh)
+        os.replace(tmp, path)  # reemplazo atómico: el lector nunca ve archivos a medias
+
+    def collect(self):
+        """
+        Snapshot de este proceso combinado con los de los demás workers (si aplica).
+        """
+        data = self.snapshot()
+        directory = getattr(settings, "METRICS_MULTIPROC_DIR", None)
+        if not directory or not os.path.isdir(directory):
+            return data
+        own = f"metrics-{os.getpid()}.json"
+        for fname in os.listdir(directory):
+            if not fname.endswith(".json") or fname == own:
+                continue
+            try:
+                with open(os.path.join(directory, fname), encoding="utf-8") as fh:
+                    other = _load(json.load(fh))
+            except (OSError, ValueError):
+                continue
+            for key, value in other["counters"].items():
+                data["counters"][key] = data["counters"].get(key, 0) + value
+            for key, (counts, total) in other["histograms"].items():
+                _merge_hist(data["histograms"], key, counts, total)
+        return data
+
+
+def _merge_hist(histograms, key, counts, total):
+    entry = histograms.get(key)
+    if entry is None:
+        histograms[key] = [counts, total]
+        return
+    for i, c in enumerate(counts):
+        entry[0][i] += c
+    entry[1] += total
+
+
+def _dump(data):
+    return {
+        kind: [
+            [name, [list(p) for p in labels], value]
+            for (name, labels), value in items.items()
+        ]
+        for kind, items in data.items()
+    }
+
+
+def _load(raw):
+    return {
+        kind: {
+            (name, tuple(tuple(p) for p in labels)): value
+            for name, labels, value in items
+        }
+        for kind, items in raw.items()
+    }
+
+
+# ---------- render ----------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _fmt_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render(data, gauges=None, families=None):
+    families = families or FAMILIES
+    lines = []
+    for name, (kind, help_text, buckets) in families.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (n, labels), value in sorted(data["counters"].items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_number(value)}")
+            continue
+        for (n, labels), (counts, total) in sorted(data["histograms"].items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _fmt_number(float(bound))
+                lines.append(
+                    f"{name}_bucket{_fmt_labels(labels, [('le', le)])} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_number(total)}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {cumulative}")
+    for name, (help_text, samples) in (gauges or {}).items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            lines.append(f"{name}{_fmt_labels(_key(labels))} {_fmt_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------- API del proceso ----------
+registry = Registry()
+
+
+def observe_request(method, route, status_code, duration, queries):
+    registry.observe("http_request_duration_seconds", {"route": route}, duration)
+    registry.inc(
+        "http_requests_total",
+        {"method": method, "route": route, "status": str(status_code)},
+    )
+    registry.observe("db_queries_per_request", {"route": route}, queries)
+    registry.maybe_flush()
+
+
+def record_cache(cache, hit):
+    """
+    Registra un acierto/fallo de una caché interna (p.ej. schema, revocación).
+    """
+    registry.inc(
+        "cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"}
+    )
+
+
+def blacklist_gauges():
+    """
+    Tamaño aproximado de las tablas de simplejwt (la BD es compartida, así que no
+    se combina entre workers): reltuples en PostgreSQL o COUNT(*) cacheado
+    METRICS_TABLE_COUNT_TTL segundos, para que cada scrape no recorra las tablas.
+    """
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+
+    from .pagination import estimated_count
+
+    ttl = getattr(settings, "METRICS_TABLE_COUNT_TTL", 60)
+    return {
+        "token_blacklist_rows": (
+            "Filas (aprox.) en las tablas de tokens de simplejwt.",
+            [
+                (
+                    {"table": "outstanding"},
+                    estimated_count(OutstandingToken.objects.all(), ttl),
+                ),
+                (
+                    {"table": "blacklisted"},
+                    estimated_count(BlacklistedToken.objects.all(), ttl),
+                ),
+            ],
+        )
+    }
+
+
+def render_metrics():
+    return render(registry.collect(), gauges=blacklist_gauges())
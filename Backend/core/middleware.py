@@ -0,0 +1,44 @@
+# core/middleware.py
+import time
+
+from django.db import connection
+
+from . import metrics
+
+
+class _QueryCounter:
+    """
+    execute_wrapper que sólo cuenta las queries ejecutadas durante la petición.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Mide latencia, status y número de queries de cada petición.
+    Las métricas se agrupan por la ruta del resolver (p.ej. "api/users/<pk>/"),
+    no por el path crudo, para no disparar la cardinalidad.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "<unmatched>"
+        metrics.observe_request(
+            request.method, route, response.status_code, elapsed, counter.count
+        )
+        return response
@@ -0,0 +1,23 @@
+# Índice sobre token_blacklist_outstandingtoken.expires_at para prune_tokens.
+# La tabla pertenece a simplejwt, por eso se crea con SQL en lugar de AddIndex.
+# (jti ya es UNIQUE, así que la búsqueda de LogoutView por jti ya está indexada.)
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_classroom_deletionlog_studentprofile"),
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS core_outstandingtoken_expires_at "
+                "ON token_blacklist_outstandingtoken (expires_at);"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS core_outstandingtoken_expires_at;",
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:09
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counts(apps, schema_editor):
+    Classroom = apps.get_model("core", "Classroom")
+    rooms = Classroom.objects.annotate(
+        n=Count("students"),
+        n_active=Count("students", filter=Q(students__user__is_active=True)),
+    )
+    for room in rooms:
+        room.students_count = room.n
+        room.active_students_count = room.n_active
+    Classroom.objects.bulk_update(rooms, ["students_count", "active_students_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_user_directory_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="classroom",
+            name="active_students_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="classroom",
+            name="students_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+
+def backfill_summaries(apps, schema_editor):
+    Materia = apps.get_model("core", "Materia")
+    MateriaSummary = apps.get_model("core", "MateriaSummary")
+    now = timezone.now()
+    rows = Materia.objects.annotate(
+        n=Count("tareas"),
+        next_fecha=Min(
+            "tareas__fecha_entrega", filter=Q(tareas__fecha_entrega__gt=now)
+        ),
+        overdue=Count("tareas", filter=Q(tareas__fecha_entrega__lte=now)),
+    )
+    MateriaSummary.objects.bulk_create(
+        [
+            MateriaSummary(
+                materia=m,
+                tareas_count=m.n,
+                next_fecha_entrega=m.next_fecha,
+                overdue_count=m.overdue,
+                refreshed_at=now,
+            )
+            for m in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_classroom_student_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MateriaSummary",
+            fields=[
+                (
+                    "materia",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="core.materia",
+                    ),
+                ),
+                ("tareas_count", models.PositiveIntegerField(default=0)),
+                ("next_fecha_entrega", models.DateTimeField(blank=True, null=True)),
+                ("overdue_count", models.PositiveIntegerField(default=0)),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="tarea",
+            index=models.Index(
+                fields=["materia", "fecha_entrega"], name="core_tarea_materia_fecha_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
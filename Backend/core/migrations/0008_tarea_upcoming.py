@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:12
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    Tarea = apps.get_model("core", "Tarea")
+    Tarea.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_materia_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tarea",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="tarea",
+            index=models.Index(fields=["fecha_entrega"], name="core_tarea_fecha_idx"),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_auditevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="calendar_token_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_user_calendar_token_version"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="tarea",
+            name="core_tarea_fecha_idx",
+        ),
+        migrations.AddIndex(
+            model_name="tarea",
+            index=models.Index(
+                fields=["fecha_entrega", "updated_at"], name="core_tarea_fecha_upd_idx"
+            ),
+        ),
+    ]
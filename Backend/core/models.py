@@ -1,18 +1,49 @@
 # core/models.py
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 
 
 class User(AbstractUser):
     ROLE_CHOICES = (("student", "Student"), ("teacher", "Teacher"))
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default="student")
+    # va dentro del token del feed .ics (core.ical): incrementarlo invalida las
+    # URLs de suscripción ya repartidas
+    calendar_token_version = models.PositiveIntegerField(default=0)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # filtros del directorio (/api/users/?role=&is_active=)
+            models.Index(
+                fields=["role", "is_active"], name="core_user_role_active_idx"
+            ),
+            # búsqueda por prefijo; la mayoría de consultas son sobre usuarios activos
+            models.Index(
+                fields=["username"],
+                name="core_user_active_uname_idx",
+                condition=models.Q(is_active=True),
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["email"],
+                name="core_user_email_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.role})"
 
-
-from django.db import models
-from django.conf import settings
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # para detectar soft delete/restore en las señales de contadores
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        return instance
 
 
 class Materia(models.Model):
@@ -45,17 +76,59 @@ class Tarea(models.Model):
     )
     archivo = models.FileField(upload_to="tareas_archivos/", null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last-Modified/ETag del feed iCalendar (core.ical)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # agregados por materia del resumen (core.summaries)
+            models.Index(
+                fields=["materia", "fecha_entrega"], name="core_tarea_materia_fecha_idx"
+            ),
+            # /api/tareas/upcoming/ y el feed .ics: rango sobre fecha_entrega;
+            # updated_at cubre el Max() de los validadores del feed sin leer filas
+            models.Index(
+                fields=["fecha_entrega", "updated_at"],
+                name="core_tarea_fecha_upd_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.titulo
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # si cambia de materia o de fecha se ajusta el resumen (core.summaries)
+        instance._loaded_materia_id = instance.__dict__.get("materia_id")
+        instance._loaded_fecha_entrega = instance.__dict__.get("fecha_entrega")
+        return instance
 
-# ---------- Nuevos modelos para classroom/profile/audit -----------
-from django.db import models
-from django.conf import settings
-from django.utils import timezone
 
+class MateriaSummary(models.Model):
+    """
+    Resumen por materia para los dashboards (una fila por Materia).
+    Lo mantienen las señales de Tarea en core/summaries.py;
+    `manage.py rebuild_materia_summaries` lo reconstruye si se desvía.
 
+    overdue_count es válido a fecha de refreshed_at: cuando next_fecha_entrega
+    queda en el pasado la fila está vencida hasta que la refresca
+    `manage.py rebuild_materia_summaries --stale` (programado).
+    """
+
+    materia = models.OneToOneField(
+        Materia, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    tareas_count = models.PositiveIntegerField(default=0)
+    next_fecha_entrega = models.DateTimeField(null=True, blank=True)
+    overdue_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"summary:{self.materia_id}"
+
+
+# ---------- Nuevos modelos para classroom/profile/audit -----------
 class Classroom(models.Model):
     """
     Representa un salon / grupo / clase.
@@ -64,6 +137,10 @@ class Classroom(models.Model):
     nombre = models.CharField(max_length=120, unique=True)
     descripcion = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # contadores desnormalizados (señales de StudentProfile/User más abajo;
+    # `manage.py recount_classrooms` repara cualquier desvío)
+    students_count = models.PositiveIntegerField(default=0, editable=False)
+    active_students_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.nombre
@@ -91,6 +168,12 @@ class StudentProfile(models.Model):
     def __str__(self):
         return f"profile:{self.user.username}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_classroom_id = instance.__dict__.get("classroom_id")
+        return instance
+
 
 class DeletionLog(models.Model):
     """
@@ -116,83 +199,84 @@ class DeletionLog(models.Model):
         return f"DeletionLog: {self.deleted_user} by {self.deleted_by} at {self.created_at}"
 
 
-# ---------- Nuevos modelos para classroom/profile/audit -----------
-from django.db import models
-from django.conf import settings
-from django.utils import timezone
-
-
-class Classroom(models.Model):
+class AuditEvent(models.Model):
     """
-    Representa un salon / grupo / clase.
+    Evento de auditoría genérico (login, restore, ediciones de Tarea, ...).
+    Se escriben en lotes desde core.audit; DeletionLog sigue siendo síncrono.
     """
 
-    nombre = models.CharField(max_length=120, unique=True)
-    descripcion = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        return self.nombre
-
-
-class StudentProfile(models.Model):
-    """
-    Perfil opcional para usuarios que son alumnos. Relacionado OneToOne con User.
-    Contiene referencia a Classroom (salon).
-    """
-
-    user = models.OneToOneField(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile"
-    )
-    classroom = models.ForeignKey(
-        Classroom,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name="students",
-    )
-    # Puedes añadir más campos: grado, matricula, telefono, etc.
-    created_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        return f"profile:{self.user.username}"
-
-
-class DeletionLog(models.Model):
-    """
-    Registro de auditoría cuando se realiza un 'soft delete' sobre un usuario.
-    """
-
-    deleted_user = models.ForeignKey(
+    action = models.CharField(max_length=50)
+    actor = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True,
-        related_name="deletion_logs",
+        related_name="audit_events",
     )
-    deleted_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.SET_NULL,
-        null=True,
-        related_name="performed_deletions",
-    )
-    reason = models.CharField(max_length=255, blank=True)
+    target_type = models.CharField(max_length=100, blank=True)
+    target_id = models.CharField(max_length=64, blank=True)
+    data = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="core_audit_created_idx"),
+            models.Index(
+                fields=["target_type", "target_id"], name="core_audit_target_idx"
+            ),
+        ]
+
     def __str__(self):
-        return f"DeletionLog: {self.deleted_user} by {self.deleted_by} at {self.created_at}"
+        return f"{self.action} by {self.actor_id} at {self.created_at}"
 
 
 # signal to create StudentProfile automatically
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-
-
 @receiver(post_save, sender=User)
 def create_profile_for_new_user(sender, instance, created, **kwargs):
     if created:
         # crea profile si no existe
         if not hasattr(instance, "profile"):
             StudentProfile.objects.create(user=instance)
+
+
+# ---------- contadores desnormalizados de Classroom -----------
+def _bump_classroom(classroom_id, students, active):
+    if classroom_id is None or (students == 0 and active == 0):
+        return
+    Classroom.objects.filter(pk=classroom_id).update(
+        students_count=F("students_count") + students,
+        active_students_count=F("active_students_count") + active,
+    )
+
+
+def _user_is_active(user_id):
+    return User.objects.filter(pk=user_id, is_active=True).exists()
+
+
+@receiver(post_save, sender=StudentProfile)
+def update_classroom_counts_on_profile_save(sender, instance, created, **kwargs):
+    old = None if created else getattr(instance, "_loaded_classroom_id", None)
+    new = instance.classroom_id
+    if old != new:
+        active = int(_user_is_active(instance.user_id))
+        _bump_classroom(old, -1, -active)
+        _bump_classroom(new, 1, active)
+    instance._loaded_classroom_id = new
+
+
+@receiver(post_delete, sender=StudentProfile)
+def update_classroom_counts_on_profile_delete(sender, instance, **kwargs):
+    if instance.classroom_id is not None:
+        active = int(_user_is_active(instance.user_id))
+        _bump_classroom(instance.classroom_id, -1, -active)
+
+
+@receiver(post_save, sender=User)
+def update_classroom_counts_on_user_active(sender, instance, created, **kwargs):
+    # soft delete / restore: is_active cambia pero el perfil no
+    old = getattr(instance, "_loaded_is_active", None)
+    if not created and old is not None and old != instance.is_active:
+        Classroom.objects.filter(students__user=instance).update(
+            active_students_count=F("active_students_count")
+            + (1 if instance.is_active else -1)
+        )
+    instance._loaded_is_active = instance.is_active
@@ -0,0 +1,81 @@
+# core/pagination.py
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) sobre la PK: cada página es un
+    `WHERE id < último ORDER BY id DESC LIMIT n`, sin OFFSET ni COUNT(*),
+    así que el coste no crece con el número de página ni con la tabla.
+    """
+
+    ordering = "-pk"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator del admin que evita el COUNT(*) exacto en tablas grandes.
+
+    - PostgreSQL, changelist sin filtros: pg_class.reltuples (estadística que
+      mantiene ANALYZE/autovacuum), si supera ESTIMATE_THRESHOLD filas.
+    - En otro caso (SQLite, filtros, tablas chicas): COUNT(*) cacheado
+      ADMIN_COUNT_CACHE_TTL segundos por consulta.
+    """
+
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        if getattr(self.object_list, "query", None) is None:
+            return super().count
+        return estimated_count(
+            self.object_list,
+            getattr(settings, "ADMIN_COUNT_CACHE_TTL", 60),
+            threshold=self.ESTIMATE_THRESHOLD,
+        )
+
+
+def estimated_count(
+    queryset, ttl, threshold=EstimatedCountPaginator.ESTIMATE_THRESHOLD
+):
+    """
+    Conteo aproximado de un queryset: reltuples en PostgreSQL sin filtros (si
+    supera threshold) o COUNT(*) cacheado ttl segundos por consulta.
+    """
+    query = queryset.query
+    if not query.where:
+        estimate = _estimate(queryset)
+        if estimate is not None and estimate > threshold:
+            return estimate
+    sql, params = query.sql_with_params()
+    raw = f"{queryset.db}:{sql}:{params!r}"
+    key = "count:" + hashlib.sha1(raw.encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, ttl)
+    return count
+
+
+def _estimate(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # -1 si la tabla nunca fue analizada
+    return int(row[0]) if row and row[0] >= 0 else None
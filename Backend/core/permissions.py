@@ -45,6 +45,18 @@ class IsTeacherOrReadOnly(BasePermission):
         return user.is_staff
 
 
+class IsTeacherOrAdmin(BasePermission):
+    """
+    Sólo profesores (role == 'teacher') o staff, para cualquier método.
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        return user.is_staff or getattr(user, "role", None) == "teacher"
+
+
 class CanDeleteUser(BasePermission):
     """
     Permiso para DELETE sobre usuarios.
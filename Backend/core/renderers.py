@@ -0,0 +1,72 @@
+# core/renderers.py
+"""
+Renderer/parser JSON rápidos para la API.
+
+Con orjson instalado (opcional, `pip install orjson`) se codifica directamente
+a bytes y datetime/date/time/UUID se serializan en C; Decimal, timedelta y lazy
+strings pasan por _default(). Sin orjson se usa el JSONRenderer/JSONParser de
+DRF, así que la salida es la misma en ambos casos.
+"""
+import datetime
+import decimal
+
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+if orjson is not None:
+    # "Z" para UTC, como el JSONEncoder de DRF
+    OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        # como el JSONEncoder de DRF (DecimalField ya entrega str si corresponde)
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):  # arrays numpy
+        return obj.tolist()
+    if hasattr(obj, "__iter__"):  # sets, generadores, querysets de values_list
+        return list(obj)
+    raise TypeError(f"{type(obj).__name__} no es serializable a JSON")
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            # indentación pedida (API navegable, ?indent=): camino de DRF
+            return super().render(data, accepted_media_type, renderer_context)
+        content = orjson.dumps(data, default=_default, option=OPTIONS)
+        # igual que DRF: U+2028/U+2029 escapados para poder incrustarlo en JS
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028")
+            content = content.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return content
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read() if stream is not None else b"")
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,239 @@
+# core/revocation.py
+"""
+Deny-list en memoria de jti revocados (refresh tokens en BlacklistedToken).
+
+Cada proceso mantiene un dict jti -> expiración, sembrado desde la BD la primera
+vez que se consulta y actualizado en cada escritura de BlacklistedToken (señales
+post_save/post_delete). Para que los demás workers se enteren de una revocación
+sin consultar la BD, cada alta se replica en un backend compartido configurable
+con settings.REVOCATION_BACKEND. Las altas y bajas se aplican tras el commit de
+la transacción que escribió en BlacklistedToken.
+
+Una respuesta negativa (ni en el dict ni en el backend) se da por buena sin ir
+a la BD:
+
+- Con un backend compartido (backend.shared), porque toda revocación posterior
+  al sembrado está en él. La caché no puede desalojar esas claves (Redis con
+  maxmemory-policy noeviction, o una caché dedicada): una clave desalojada es
+  un token que vuelve a valer. Un vaciado completo sí se detecta: el backend
+  guarda una clave centinela y, si falta, el proceso que lo nota vuelve a
+  sembrar desde la BD y a rellenar la caché.
+- Sin backend compartido, el dict se pone al día con las altas nuevas de
+  BlacklistedToken a lo sumo cada REVOCATION_SYNC_INTERVAL segundos (una query
+  por rango de id, no una por token). Es el retraso máximo con el que un worker
+  se entera de una revocación hecha en otro; con 0 se sincroniza en cada fallo.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import metrics
+
+
+class LocalBackend:
+    """
+    Sin estado compartido: los fallos del dict local se confirman con la BD.
+    """
+
+    shared = False
+
+    def add(self, jti, ttl):
+        pass
+
+    def remove(self, jti):
+        pass
+
+    def contains(self, jti):
+        return False
+
+    def filled(self):
+        return True
+
+    def fill(self, expires):
+        pass
+
+
+class CacheBackend:
+    """
+    Replica las revocaciones en una caché de Django (Redis/Memcached en producción).
+    Sobre LocMem/Dummy (por proceso) no cuenta como compartido salvo que se
+    fuerce con shared=True.
+
+    contains() devuelve None si falta la centinela que deja fill(): la caché
+    se vació y su contenido ya no cubre las revocaciones anteriores.
+    """
+
+    key_prefix = "revoked_jti:"
+    sentinel_key = "revoked_jti:__filled__"
+
+    def __init__(self, alias="default", shared=None):
+        self.cache = caches[alias]
+        if shared is None:
+            shared = not isinstance(self.cache, (LocMemCache, DummyCache))
+        self.shared = shared
+
+    def add(self, jti, ttl):
+        self.cache.set(self.key_prefix + jti, 1, max(1, int(ttl)))
+
+    def remove(self, jti):
+        self.cache.delete(self.key_prefix + jti)
+
+    def contains(self, jti):
+        key = self.key_prefix + jti
+        values = self.cache.get_many([key, self.sentinel_key])
+        if self.sentinel_key not in values:
+            return None
+        return key in values
+
+    def filled(self):
+        return self.cache.get(self.sentinel_key) is not None
+
+    def fill(self, expires):
+        """Replica el dict {jti: expiración} completo y repone la centinela."""
+        now = time.time()
+        ttl = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        self.cache.set_many(
+            {self.key_prefix + jti: 1 for jti, exp in expires.items() if exp > now},
+            int(ttl),
+        )
+        self.cache.set(self.sentinel_key, 1, None)
+
+
+class RevocationCache:
+    purge_every = 1000  # altas entre limpiezas de jti ya expirados
+    # La sincronización relee también las últimas sync_overlap filas: un id
+    # bajo puede confirmarse después que uno alto (transacciones concurrentes).
+    sync_overlap = 100
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._expires = {}  # jti -> timestamp de expiración
+        self._seeded = False
+        self._lock = threading.Lock()
+        self._adds = 0
+        self._last_id = 0  # mayor id de BlacklistedToken leído
+        self._synced_at = 0.0
+
+    def seed(self):
+        self._load(BlacklistedToken.objects.all())
+        with self._lock:
+            self._seeded = True
+        if self.backend.shared and not self.backend.filled():
+            self.backend.fill(dict(self._expires))
+
+    def sync(self):
+        """
+        Trae las revocaciones nuevas de la BD, a lo sumo cada
+        REVOCATION_SYNC_INTERVAL segundos.
+        """
+        interval = getattr(settings, "REVOCATION_SYNC_INTERVAL", 2.0)
+        if time.monotonic() - self._synced_at < interval:
+            return
+        floor = max(0, self._last_id - self.sync_overlap)
+        self._load(BlacklistedToken.objects.filter(pk__gt=floor))
+
+    def _load(self, queryset):
+        synced_at = time.monotonic()
+        rows = queryset.filter(token__expires_at__gt=timezone.now()).values_list(
+            "pk", "token__jti", "token__expires_at"
+        )
+        with self._lock:
+            for pk, jti, expires_at in rows:
+                self._expires[jti] = expires_at.timestamp()
+                self._last_id = max(self._last_id, pk)
+            self._synced_at = synced_at
+
+    def is_revoked(self, jti):
+        if not self._seeded:
+            self.seed()
+        if jti in self._expires:
+            metrics.record_cache("revocation", True)
+            return True
+        metrics.record_cache("revocation", False)
+        found = self.backend.contains(jti)
+        if found:
+            # revocado por otro worker: recordarlo localmente
+            self._expires[jti] = (
+                time.time() + api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+            )
+            return True
+        if not self.backend.shared:
+            self.sync()
+        elif found is None:
+            # la caché compartida se vació: lo revocado por otros workers
+            # desde que se sembró este proceso sólo está en la BD
+            self.seed()
+        else:
+            return False
+        return jti in self._expires
+
+    def add(self, jti, expires_at):
+        exp = expires_at.timestamp()
+        with self._lock:
+            self._expires[jti] = exp
+            self._adds += 1
+            if self._adds % self.purge_every == 0:
+                now = time.time()
+                self._expires = {j: e for j, e in self._expires.items() if e > now}
+        self.backend.add(jti, exp - time.time())
+
+    def remove(self, jti):
+        with self._lock:
+            self._expires.pop(jti, None)
+        self.backend.remove(jti)
+
+
+_cache = None
+
+
+def get_revocation_cache():
+    global _cache
+    if _cache is None:
+        backend_path = getattr(
+            settings, "REVOCATION_BACKEND", "core.revocation.LocalBackend"
+        )
+        _cache = RevocationCache(import_string(backend_path)())
+    return _cache
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    RefreshToken cuya verificación de blacklist se responde desde la deny-list
+    en memoria en lugar de consultar BlacklistedToken en cada /auth/refresh/.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if get_revocation_cache().is_revoked(jti):
+            raise TokenError(_("Token is blacklisted"))
+
+
+# write-through: toda escritura confirmada en la blacklist actualiza la deny-list
+@receiver(post_save, sender=BlacklistedToken)
+def _on_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        jti, expires_at = instance.token.jti, instance.token.expires_at
+        transaction.on_commit(lambda: get_revocation_cache().add(jti, expires_at))
+
+
+@receiver(post_delete, sender=BlacklistedToken)
+def _on_unblacklisted(sender, instance, **kwargs):
+    # En borrados masivos (prune_tokens) el token no viene cargado y son tokens
+    # expirados: salen solos de la deny-list, no vale la pena una query por fila.
+    if sender.token.is_cached(instance):
+        jti = instance.token.jti
+        transaction.on_commit(lambda: get_revocation_cache().remove(jti))
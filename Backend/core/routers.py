@@ -8,6 +8,7 @@ from .viewsets import MateriaViewSet, TareaViewSet
 # UserViewSet está en core/viewsets_users.py según tu repo
 from .viewsets_users import UserViewSet
 from .viewsets_audit import DeletionLogViewSet
+from .viewsets_classrooms import ClassroomViewSet
 
 router = DefaultRouter()
 router.register(r"materias", MateriaViewSet, basename="materia")
@@ -16,3 +17,4 @@ router.register(r"tareas", TareaViewSet, basename="tarea")
 # Registrar users y logs de auditoría
 router.register(r"users", UserViewSet, basename="user")
 router.register(r"deletion-logs", DeletionLogViewSet, basename="deletionlog")
+router.register(r"classrooms", ClassroomViewSet, basename="classroom")
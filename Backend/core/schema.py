@@ -0,0 +1,165 @@
+# core/schema.py
+"""
+Schema OpenAPI pre-generado.
+
+drf-spectacular introspecciona todos los viewsets y serializers en cada GET a
+/api/schema/. Aquí el schema se genera una sola vez por versión de código
+(manage.py build_schema, el warm-up o la primera petición), se guarda en memoria
+y en disco (settings.SCHEMA_CACHE_DIR) y se sirve con ETag y Cache-Control
+largo, de modo que los clientes que revalidan reciben un 304 sin cuerpo.
+"""
+import hashlib
+import json
+import os
+import threading
+from importlib import import_module
+from pathlib import Path
+
+import drf_spectacular
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+from . import metrics
+
+_lock = threading.Lock()
+_schemas = {}  # versión de código -> dict del schema
+_rendered = {}  # (versión, media type) -> (bytes, etag)
+_code_version = None
+
+
+def code_version():
+    """
+    Versión del código que determina si el schema sigue vigente.
+    Usa settings.SCHEMA_CODE_VERSION si está definido (p.ej. el SHA del deploy);
+    si no, un hash de los .py que alimentan el schema (apps locales, sin tests
+    ni migraciones, más el URLconf raíz y settings) y de las versiones de
+    DRF/spectacular.
+    """
+    global _code_version
+    if _code_version is None:
+        explicit = getattr(settings, "SCHEMA_CODE_VERSION", None)
+        if explicit:
+            _code_version = str(explicit)
+        else:
+            digest = hashlib.sha1()
+            digest.update(rest_framework.VERSION.encode())
+            digest.update(drf_spectacular.__version__.encode())
+            digest.update(json.dumps(spectacular_settings.VERSION).encode())
+            base = Path(settings.BASE_DIR)
+            for path in _schema_sources(base):
+                digest.update(str(path.relative_to(base)).encode())
+                digest.update(path.read_bytes())
+            _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def _schema_sources(base):
+    """
+    .py de las apps bajo BASE_DIR y módulos de URLconf/settings, ordenados.
+    """
+    # con override_settings activo settings.SETTINGS_MODULE es None
+    modules = (settings.ROOT_URLCONF, os.environ.get("DJANGO_SETTINGS_MODULE"))
+    paths = {Path(import_module(name).__file__).resolve() for name in modules if name}
+    for app in apps.get_app_configs():
+        root = Path(app.path).resolve()
+        if base.resolve() not in root.parents:
+            continue
+        for path in root.rglob("*.py"):
+            *dirs, name = path.relative_to(root).parts
+            if {"test", "tests", "migrations", "management"} & set(dirs):
+                continue
+            if name == "tests.py" or name.startswith("test_"):
+                continue
+            paths.add(path)
+    return sorted(p for p in paths if base.resolve() in p.parents)
+
+
+def _disk_path(version):
+    return Path(settings.SCHEMA_CACHE_DIR) / f"openapi-{version}.json"
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+
+
+def write_schema(schema, version=None):
+    path = _disk_path(version or code_version())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(OpenApiJsonRenderer().render(schema))
+    tmp.replace(path)
+    return path
+
+
+def get_schema():
+    """
+    Schema de la versión actual: memoria -> disco -> generación (una sola vez).
+    """
+    version = code_version()
+    schema = _schemas.get(version)
+    if schema is not None:
+        metrics.record_cache("openapi_schema", True)
+        return schema
+    with _lock:
+        schema = _schemas.get(version)
+        if schema is None:
+            metrics.record_cache("openapi_schema", False)
+            path = _disk_path(version)
+            if path.exists():
+                schema = json.loads(path.read_bytes())
+            else:
+                schema = generate_schema()
+                write_schema(schema, version)
+            _schemas.clear()  # versiones viejas ya no se sirven
+            _rendered.clear()
+            _schemas[version] = schema
+    return schema
+
+
+def get_rendered(renderer):
+    key = (code_version(), renderer.media_type)
+    cached = _rendered.get(key)
+    if cached is None:
+        content = renderer.render(get_schema(), renderer_context={})
+        cached = _rendered[key] = (content, f'"{hashlib.sha1(content).hexdigest()}"')
+    return cached
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    SpectacularAPIView que sirve el schema pre-generado con ETag.
+    Peticiones con ?lang= o ?version= se generan al vuelo como antes.
+    """
+
+    def _get_schema_response(self, request):
+        if request.GET.get("lang") or request.GET.get("version") or self.api_version:
+            return super()._get_schema_response(request)
+
+        content, etag = get_rendered(request.accepted_renderer)
+        # If-None-Match usa comparación débil: W/"x" coincide con "x"
+        if_none_match = {
+            tag.removeprefix("W/")
+            for tag in parse_etags(request.headers.get("If-None-Match", ""))
+        }
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=request.accepted_media_type)
+            response["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, None)}"'
+            )
+        response["ETag"] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=getattr(settings, "SCHEMA_CACHE_MAX_AGE", 86400),
+        )
+        return response
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+
+from .revocation import CachedRefreshToken
 
 User = get_user_model()
 model_field_names = {f.name for f in User._meta.get_fields() if hasattr(f, "name")}
@@ -34,8 +37,40 @@ class UserSerializer(serializers.ModelSerializer):
         fields = tuple(out_fields)
 
 
+class UserDirectorySerializer(UserSerializer):
+    """
+    Fila del directorio de usuarios (admin). Espera un queryset con
+    select_related("profile__classroom") para no hacer queries por fila.
+    """
+
+    classroom = serializers.IntegerField(
+        source="profile.classroom_id", read_only=True, default=None
+    )
+    classroom_nombre = serializers.CharField(
+        source="profile.classroom.nombre", read_only=True, default=None
+    )
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + (
+            "is_active",
+            "classroom",
+            "classroom_nombre",
+        )
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    /api/auth/refresh/ con la verificación de blacklist resuelta en memoria
+    (core.revocation) en lugar de una query por refresh.
+    """
+
+    token_class = CachedRefreshToken
+
+
 from rest_framework import serializers
-from .models import Materia, Tarea
+from django.utils import timezone
+from .models import Classroom, Materia, MateriaSummary, Tarea
+from .summaries import refresh_materia_summaries
 
 
 class MateriaSerializer(serializers.ModelSerializer):
@@ -45,9 +80,111 @@ class MateriaSerializer(serializers.ModelSerializer):
         read_only_fields = ["creado_por", "created_at"]
 
 
+class MateriaSummarySerializer(serializers.ModelSerializer):
+    materia_nombre = serializers.CharField(source="materia.nombre", read_only=True)
+
+    class Meta:
+        model = MateriaSummary
+        fields = [
+            "materia",
+            "materia_nombre",
+            "tareas_count",
+            "next_fecha_entrega",
+            "overdue_count",
+            "refreshed_at",
+        ]
+
+
+def _as_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MateriaField(serializers.PrimaryKeyRelatedField):
+    """
+    PK de materia. Dentro de un TareaListSerializer se resuelve contra las
+    materias precargadas (context["materias_by_pk"]) en vez de una query por ítem.
+    """
+
+    def to_internal_value(self, data):
+        materias = self.context.get("materias_by_pk")
+        if materias is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool) or _as_pk(data) is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return materias[_as_pk(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class TareaListSerializer(serializers.ListSerializer):
+    """
+    Alta/edición masiva de tareas (POST/PATCH /api/tareas/bulk/).
+    Valida todas las materias referenciadas con una sola query y escribe con
+    bulk_create/bulk_update; los errores se devuelven por ítem, en orden.
+    Para PATCH cada ítem lleva "id" y self.instance es el queryset de esas tareas.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            pks = {
+                _as_pk(item.get("materia")) for item in data if isinstance(item, dict)
+            }
+            self.context["materias_by_pk"] = Materia.objects.in_bulk(pks - {None})
+        if self.instance is not None:
+            self._by_pk = {tarea.pk: tarea for tarea in self.instance}
+            self._seen = set()
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+        pk = _as_pk(data.get("id")) if isinstance(data, dict) else None
+        if pk not in self._by_pk:
+            raise serializers.ValidationError({"id": ["Tarea inexistente."]})
+        if pk in self._seen:
+            raise serializers.ValidationError({"id": ["Tarea repetida."]})
+        self._seen.add(pk)
+        self.child.instance = self._by_pk[pk]
+        try:
+            validated = super().run_child_validation(data)
+        finally:
+            self.child.instance = None
+        return {**validated, "id": pk}
+
+    def create(self, validated_data):
+        tareas = Tarea.objects.bulk_create(Tarea(**attrs) for attrs in validated_data)
+        refresh_materia_summaries({t.materia_id for t in tareas})
+        return tareas
+
+    def update(self, instance, validated_data):
+        # bulk_update no aplica auto_now ni dispara señales
+        now = timezone.now()
+        tareas, fields = [], {"updated_at"}
+        affected = set()
+        for attrs in validated_data:
+            tarea = self._by_pk[attrs.pop("id")]
+            affected.add(tarea.materia_id)  # materia anterior, por si cambia
+            for attr, value in attrs.items():
+                setattr(tarea, attr, value)
+            tarea.updated_at = now
+            fields.update(attrs)
+            affected.add(tarea.materia_id)
+            tareas.append(tarea)
+        Tarea.objects.bulk_update(tareas, sorted(fields))
+        refresh_materia_summaries(affected)
+        return tareas
+
+
 class TareaSerializer(serializers.ModelSerializer):
+    materia = MateriaField(queryset=Materia.objects.all())
+
     class Meta:
         model = Tarea
+        list_serializer_class = TareaListSerializer
         fields = [
             "id",
             "titulo",
@@ -57,5 +194,26 @@ class TareaSerializer(serializers.ModelSerializer):
             "creado_por",
             "archivo",
             "created_at",
+            "updated_at",
         ]
-        read_only_fields = ["creado_por", "created_at"]
+        read_only_fields = ["creado_por", "created_at", "updated_at"]
+
+
+class ClassroomSerializer(serializers.ModelSerializer):
+    inactive_students_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Classroom
+        fields = [
+            "id",
+            "nombre",
+            "descripcion",
+            "created_at",
+            "students_count",
+            "active_students_count",
+            "inactive_students_count",
+        ]
+        read_only_fields = ["created_at", "students_count", "active_students_count"]
+
+    def get_inactive_students_count(self, obj) -> int:
+        return obj.students_count - obj.active_students_count
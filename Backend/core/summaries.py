@@ -0,0 +1,165 @@
+# core/summaries.py
+"""
+Mantenimiento de MateriaSummary.
+
+Cada escritura de Tarea ajusta la fila de su materia (y la de la materia
+anterior si cambió) con un UPDATE de incrementos F(), sin volver a agregar. El
+corte vencida/próxima de cada fila es su refreshed_at, igual que en el agregado.
+Sólo se re-agrega la materia cuando se quita la tarea que era su próxima
+entrega. Leer el resumen cuesta O(materias) y nunca escribe.
+
+Una fila queda vencida cuando su next_fecha_entrega pasa: eso lo corrige
+`manage.py rebuild_materia_summaries --stale`, pensado para correr programado
+(cron) cada pocos minutos, con un único agregado para todas las vencidas.
+"""
+from django.db.models import (
+    Case,
+    Count,
+    DateTimeField,
+    F,
+    Min,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Least
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Materia, MateriaSummary, Tarea
+
+SUMMARY_FIELDS = ["tareas_count", "next_fecha_entrega", "overdue_count", "refreshed_at"]
+
+
+def _aggregates(prefix, now):
+    return {
+        "tareas_count": Count(f"{prefix}pk"),
+        "next_fecha_entrega": Min(
+            f"{prefix}fecha_entrega", filter=Q(**{f"{prefix}fecha_entrega__gt": now})
+        ),
+        "overdue_count": Count(
+            f"{prefix}pk", filter=Q(**{f"{prefix}fecha_entrega__lte": now})
+        ),
+    }
+
+
+def refresh_materia_summary(materia_id, now=None):
+    now = now or timezone.now()
+    values = Tarea.objects.filter(materia_id=materia_id).aggregate(
+        **_aggregates("", now)
+    )
+    MateriaSummary.objects.update_or_create(
+        materia_id=materia_id, defaults={**values, "refreshed_at": now}
+    )
+
+
+def refresh_stale_summaries(now=None):
+    """
+    Refresca las filas cuya próxima entrega ya pasó (su overdue_count quedó viejo).
+    """
+    now = now or timezone.now()
+    stale = MateriaSummary.objects.filter(next_fecha_entrega__lte=now).values_list(
+        "materia_id", flat=True
+    )
+    return refresh_materia_summaries(list(stale), now=now)
+
+
+def _shift(materia_id, fecha, sign):
+    """
+    Suma (sign=1) o quita (sign=-1) una tarea de la fila de su materia.
+    Devuelve False si la materia no tiene fila.
+    """
+    changes = {"tareas_count": F("tareas_count") + sign}
+    if fecha is not None:
+        fecha_value = Value(fecha, output_field=DateTimeField())
+        changes["overdue_count"] = F("overdue_count") + Case(
+            When(refreshed_at__gte=fecha, then=Value(sign)), default=Value(0)
+        )
+        if sign > 0:
+            changes["next_fecha_entrega"] = Case(
+                When(
+                    refreshed_at__lt=fecha,
+                    then=Least(
+                        Coalesce("next_fecha_entrega", fecha_value), fecha_value
+                    ),
+                ),
+                default=F("next_fecha_entrega"),
+            )
+    row = MateriaSummary.objects.filter(materia_id=materia_id)
+    if not row.update(**changes):
+        return False
+    if sign < 0 and fecha is not None and row.filter(next_fecha_entrega=fecha).exists():
+        # era la próxima entrega: el nuevo mínimo sólo sale del agregado
+        refresh_materia_summary(materia_id)
+    return True
+
+
+def refresh_materia_summaries(materia_ids=None, now=None, batch_size=500):
+    """
+    Refresca varias filas con un único agregado agrupado por materia
+    (todas si materia_ids es None). Lo usan las escrituras masivas, que no
+    disparan señales, y rebuild_all().
+    """
+    now = now or timezone.now()
+    materias = Materia.objects.all()
+    if materia_ids is not None:
+        materias = materias.filter(pk__in=materia_ids)
+    rows = materias.annotate(**_aggregates("tareas__", now)).values(
+        "pk", "tareas_count", "next_fecha_entrega", "overdue_count"
+    )
+    summaries = [
+        MateriaSummary(
+            materia_id=row.pop("pk"),
+            refreshed_at=now,
+            **row,
+        )
+        for row in rows
+    ]
+    MateriaSummary.objects.bulk_create(
+        summaries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["materia"],
+        update_fields=SUMMARY_FIELDS,
+    )
+    return len(summaries)
+
+
+def rebuild_all(batch_size=500):
+    """
+    Reconstruye todas las filas.
+    """
+    return refresh_materia_summaries(batch_size=batch_size)
+
+
+@receiver(post_save, sender=Materia)
+def create_summary_for_new_materia(sender, instance, created, **kwargs):
+    if created:
+        MateriaSummary.objects.get_or_create(materia=instance)
+
+
+@receiver(post_save, sender=Tarea)
+def refresh_summary_on_tarea_save(sender, instance, created, **kwargs):
+    old_materia = getattr(instance, "_loaded_materia_id", None)
+    old_fecha = getattr(instance, "_loaded_fecha_entrega", None)
+    new_materia, new_fecha = instance.materia_id, instance.fecha_entrega
+    if created:
+        if not _shift(new_materia, new_fecha, 1):
+            refresh_materia_summary(new_materia)
+    elif old_materia is None:
+        # instancia que no salió de la BD: no se sabe qué cambió
+        refresh_materia_summary(new_materia)
+    elif (old_materia, old_fecha) != (new_materia, new_fecha):
+        _shift(old_materia, old_fecha, -1)
+        if not _shift(new_materia, new_fecha, 1):
+            refresh_materia_summary(new_materia)
+    instance._loaded_materia_id = new_materia
+    instance._loaded_fecha_entrega = new_fecha
+
+
+@receiver(post_delete, sender=Tarea)
+def refresh_summary_on_tarea_delete(sender, instance, **kwargs):
+    # al borrar la materia en cascada la fila ya no existe y _shift no hace nada
+    fecha = getattr(instance, "_loaded_fecha_entrega", instance.fecha_entrega)
+    _shift(instance.materia_id, fecha, -1)
@@ -0,0 +1,89 @@
+# core/test/query_budget.py
+"""
+Presupuesto de queries SQL para tests: falla si un bloque ejecuta más queries
+de las declaradas y muestra el SQL culpable agrupado por la pila de llamadas
+del proyecto (así un N+1 se ve como "20x desde serializers.py:NN").
+
+Uso como context manager:
+
+    with query_budget(2, label="GET /api/tareas/"):
+        self.client.get("/api/tareas/")
+
+o como decorador de un test:
+
+    @query_budget(3)
+    def test_listado(self): ...
+"""
+import os
+import traceback
+from collections import Counter, OrderedDict
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_THIS_FILE = os.path.abspath(__file__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _project_stack():
+    """
+    Frames del proyecto (dentro de BASE_DIR, fuera de site-packages y de este módulo).
+    """
+    base = str(settings.BASE_DIR)
+    frames = []
+    for frame in traceback.extract_stack()[:-2]:
+        filename = os.path.abspath(frame.filename)
+        if (
+            not filename.startswith(base)
+            or "site-packages" in filename
+            or filename == _THIS_FILE
+        ):
+            continue
+        rel = os.path.relpath(filename, base)
+        frames.append(f"{rel}:{frame.lineno} in {frame.name}")
+    return tuple(frames)
+
+
+class query_budget(ContextDecorator):
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS, label=None):
+        self.max_queries = max_queries
+        self.using = using
+        self.label = label
+        self.queries = []
+
+    def _record(self, execute, sql, params, many, context):
+        self.queries.append((sql, _project_stack()))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = connections[self.using].execute_wrapper(self._record)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._wrapper.__exit__(exc_type, exc, tb)
+        if exc_type is None and len(self.queries) > self.max_queries:
+            raise QueryBudgetExceeded(self.report())
+        return False
+
+    def report(self):
+        header = f"{len(self.queries)} queries (presupuesto {self.max_queries})"
+        if self.label:
+            header = f"{self.label}: {header}"
+        groups = OrderedDict()
+        for sql, stack in self.queries:
+            groups.setdefault(stack, Counter())[sql] += 1
+
+        lines = [header]
+        for stack, sqls in sorted(groups.items(), key=lambda kv: -sum(kv[1].values())):
+            lines.append("")
+            lines.append(f"{sum(sqls.values())}x desde:")
+            lines.extend(f"    {frame}" for frame in stack or ("<fuera del proyecto>",))
+            for sql, count in sqls.most_common():
+                lines.append(f"  [{count}x] {sql}")
+        return "\n".join(lines)
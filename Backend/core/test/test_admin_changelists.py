@@ -0,0 +1,75 @@
+# core/test/test_admin_changelists.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Classroom, DeletionLog, StudentProfile
+from core.pagination import EstimatedCountPaginator
+
+User = get_user_model()
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(
+            username="root", is_staff=True, is_superuser=True
+        )
+        self.client.force_login(self.admin)
+
+    def add_rows(self, n, start=0):
+        room = Classroom.objects.create(nombre=f"Salón {start}")
+        for i in range(start, start + n):
+            user = User.objects.create(username=f"alumno{i}")
+            StudentProfile.objects.filter(user=user).update(classroom=room)
+            DeletionLog.objects.create(deleted_user=user, deleted_by=self.admin)
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(ctx)
+
+    def test_no_query_per_row(self):
+        urls = (
+            "/admin/core/deletionlog/",
+            "/admin/core/studentprofile/",
+            "/admin/core/user/",
+        )
+        for n, url in enumerate(urls):
+            self.add_rows(2, start=n * 1000)
+            cache.clear()
+            few = self.changelist_queries(url)
+            self.add_rows(10, start=n * 1000 + 100)
+            cache.clear()
+            self.assertEqual(self.changelist_queries(url), few, url)
+
+    def test_count_is_cached(self):
+        self.add_rows(3)
+        url = "/admin/core/deletionlog/"
+        first = self.changelist_queries(url)
+        self.assertEqual(self.changelist_queries(url), first - 1)
+
+    def test_paginator_counts(self):
+        self.add_rows(3)
+        qs = DeletionLog.objects.order_by("pk")
+        self.assertEqual(EstimatedCountPaginator(qs, 2).count, 3)
+        DeletionLog.objects.all().delete()
+        # cacheado hasta ADMIN_COUNT_CACHE_TTL
+        self.assertEqual(EstimatedCountPaginator(qs, 2).count, 3)
+        self.assertEqual(EstimatedCountPaginator([1, 2], 2).count, 2)
+
+    def test_user_autocomplete(self):
+        User.objects.create(username="ana")
+        resp = self.client.get(
+            "/admin/autocomplete/",
+            {
+                "term": "an",
+                "app_label": "core",
+                "model_name": "deletionlog",
+                "field_name": "deleted_user",
+            },
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r["text"] for r in resp.json()["results"]], ["ana (student)"])
@@ -0,0 +1,145 @@
+# core/test/test_audit.py
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.audit import AuditWriter, _event
+from core.models import AuditEvent, DeletionLog, Materia, Tarea
+
+User = get_user_model()
+
+
+@override_settings(AUDIT_SYNC=True)
+class AuditEventsTest(TestCase):
+    """
+    Con AUDIT_SYNC cada evento se inserta en el acto.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_delete_keeps_deletionlog_and_audits_restore(self):
+        alumno = User.objects.create(username="alumno")
+        resp = self.client.delete(
+            f"/api/users/{alumno.pk}/", {"reason": "baja"}, format="json"
+        )
+        self.assertEqual(resp.status_code, 204)
+        self.assertTrue(DeletionLog.objects.filter(deleted_user=alumno).exists())
+        self.client.post(f"/api/users/{alumno.pk}/restore/")
+
+        events = AuditEvent.objects.filter(target_id=str(alumno.pk)).order_by("pk")
+        self.assertEqual(
+            [(e.action, e.actor_id) for e in events],
+            [("user.deleted", self.admin.pk), ("user.restored", self.admin.pk)],
+        )
+        self.assertEqual(events[0].data, {"reason": "baja"})
+
+    def test_login_and_tarea_edits(self):
+        user = User.objects.create_user(username="profe", password="secreto1")
+        resp = APIClient().post(
+            "/api/auth/login/",
+            {"username": "profe", "password": "secreto1"},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(
+            AuditEvent.objects.filter(action="auth.login", actor=user).exists()
+        )
+        APIClient().post(
+            "/api/auth/login/", {"username": "profe", "password": "mal"}, format="json"
+        )
+        self.assertEqual(AuditEvent.objects.filter(action="auth.login").count(), 1)
+
+        tarea = Tarea.objects.create(
+            titulo="t", materia=Materia.objects.create(nombre="m")
+        )
+        self.client.force_authenticate(
+            User.objects.create(username="t", role="teacher")
+        )
+        self.client.patch(f"/api/tareas/{tarea.pk}/", {"titulo": "t2"}, format="json")
+        event = AuditEvent.objects.get(action="tarea.updated")
+        self.assertEqual(event.data, {"fields": ["titulo"]})
+        self.assertEqual(event.target_type, "core.tarea")
+
+        self.client.delete(f"/api/tareas/{tarea.pk}/")
+        event = AuditEvent.objects.get(action="tarea.deleted")
+        self.assertEqual(event.target_id, str(tarea.pk))
+
+    def test_failed_delete_is_not_audited(self):
+        tarea = Tarea.objects.create(
+            titulo="t", materia=Materia.objects.create(nombre="m")
+        )
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(User.objects.create(username="t", role="teacher"))
+        with mock.patch.object(Tarea, "delete", side_effect=RuntimeError):
+            resp = client.delete(f"/api/tareas/{tarea.pk}/")
+        self.assertEqual(resp.status_code, 500)
+        self.assertFalse(AuditEvent.objects.filter(action="tarea.deleted").exists())
+
+
+class AuditWriterTest(TransactionTestCase):
+    def wait_for(self, writer, count, timeout=3.0):
+        # no consultar la BD mientras escribe el hilo: con SQLite en memoria
+        # compartida la lectura concurrente falla con "table is locked"
+        deadline = time.monotonic() + timeout
+        while writer.written < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return AuditEvent.objects.count()
+
+    def test_flushes_on_batch_size(self):
+        writer = AuditWriter(batch_size=3, flush_interval=60)
+        try:
+            for i in range(2):
+                writer.submit(_event("test", None, None, {"i": i}))
+            time.sleep(0.1)
+            self.assertEqual(writer.written, 0)
+            writer.submit(_event("test", None, None, {"i": 2}))
+            self.assertEqual(self.wait_for(writer, 3), 3)
+        finally:
+            writer.close()
+
+    def test_flushes_on_interval_and_close(self):
+        writer = AuditWriter(batch_size=100, flush_interval=0.05)
+        writer.submit(_event("test", None, None, {}))
+        self.assertEqual(self.wait_for(writer, 1), 1)
+        writer.close()
+        writer.submit(_event("test", None, None, {}))  # cerrado: escritura directa
+        self.assertEqual(AuditEvent.objects.count(), 2)
+
+    def test_database_down_requeues_batch(self):
+        writer = AuditWriter(batch_size=100, flush_interval=60, max_pending=3)
+        try:
+            for i in range(2):
+                writer.submit(_event("test", None, None, {"i": i}))
+            with mock.patch.object(
+                AuditEvent.objects, "bulk_create", side_effect=OperationalError
+            ), self.assertLogs("core.audit", "ERROR"):
+                self.assertEqual(writer.flush(), 0)
+            self.assertEqual(len(writer._pending), 2)
+            self.assertEqual(writer.flush(), 2)
+            self.assertEqual(
+                sorted(e.data["i"] for e in AuditEvent.objects.all()), [0, 1]
+            )
+        finally:
+            writer.close()
+
+    def test_invalid_event_is_dropped_alone(self):
+        writer = AuditWriter(batch_size=100, flush_interval=60)
+        try:
+            for i in range(5):
+                data = {"i": object()} if i == 3 else {"i": i}  # no serializable
+                writer.submit(_event("test", None, None, data))
+            with self.assertLogs("core.audit", "ERROR"):
+                self.assertEqual(writer.flush(), 4)
+            self.assertEqual(writer._pending, [])
+            self.assertEqual(
+                sorted(e.data["i"] for e in AuditEvent.objects.all()), [0, 1, 2, 4]
+            )
+        finally:
+            writer.close()
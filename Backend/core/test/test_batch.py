@@ -0,0 +1,134 @@
+# core/test/test_batch.py
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import batch
+from core.batch import BatchView
+from core.models import Materia
+
+User = get_user_model()
+URL = "/api/batch/"
+
+
+class BatchTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="profe", role="teacher")
+        Materia.objects.create(nombre="Mate")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.teacher)}"
+        )
+
+    def test_startup_calls_in_one_round_trip(self):
+        resp = self.client.post(
+            URL,
+            [
+                {"method": "GET", "path": "/api/auth/me/"},
+                {"method": "GET", "path": "/api/materias/"},
+                {"method": "GET", "path": "/api/tareas/upcoming/?days=3"},
+                {"method": "GET", "path": "/api/nada/"},
+            ],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r["status"] for r in resp.data], [200, 200, 200, 404])
+        self.assertEqual(resp.data[0]["body"]["username"], "profe")
+        self.assertEqual(resp.data[1]["body"][0]["nombre"], "Mate")
+
+    def test_authenticates_once(self):
+        with mock.patch(
+            "rest_framework_simplejwt.authentication.JWTAuthentication.authenticate",
+            autospec=True,
+            return_value=(self.teacher, None),
+        ) as authenticate:
+            self.client.post(
+                URL, [{"method": "GET", "path": "/api/auth/me/"}] * 3, format="json"
+            )
+        self.assertEqual(authenticate.call_count, 1)
+
+    def test_writes_run_in_order(self):
+        resp = self.client.post(
+            URL,
+            [
+                {
+                    "method": "POST",
+                    "path": "/api/materias/",
+                    "body": {"nombre": "Física"},
+                },
+                {"method": "GET", "path": "/api/materias/"},
+            ],
+            format="json",
+        )
+        self.assertEqual(resp.data[0]["status"], 201)
+        self.assertEqual(len(resp.data[1]["body"]), 2)
+
+    def test_anonymous_sub_requests_keep_their_permissions(self):
+        resp = APIClient().post(
+            URL, [{"method": "GET", "path": "/api/auth/me/"}], format="json"
+        )
+        self.assertEqual(resp.data[0]["status"], 401)
+
+    def test_sub_request_exception_returns_500_and_continues(self):
+        with mock.patch(
+            "core.views.UserSerializer.to_representation", side_effect=RuntimeError
+        ), self.assertLogs("core.batch", level="ERROR"):
+            resp = self.client.post(
+                URL,
+                [
+                    {"method": "GET", "path": "/api/auth/me/"},
+                    {"method": "GET", "path": "/api/materias/"},
+                ],
+                format="json",
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r["status"] for r in resp.data], [500, 200])
+
+    def test_sub_requests_are_recorded_per_route(self):
+        with mock.patch("core.batch.metrics.observe_request") as observe:
+            self.client.post(
+                URL, [{"method": "GET", "path": "/api/auth/me/"}], format="json"
+            )
+        routes = [c.args[:3] for c in observe.call_args_list]
+        self.assertEqual(
+            routes, [("GET", "api/auth/me/", 200), ("POST", "api/batch/", 200)]
+        )
+
+    def test_rejects_nested_oversized_and_foreign_paths(self):
+        resp = self.client.post(URL, [{"method": "GET", "path": URL}], format="json")
+        self.assertEqual(resp.data[0]["status"], 400)
+        resp = self.client.post(
+            URL, [{"method": "GET", "path": "/admin/"}], format="json"
+        )
+        self.assertEqual(resp.status_code, 400)
+        items = [{"method": "GET", "path": "/api/ping/"}] * 21
+        self.assertEqual(self.client.post(URL, items, format="json").status_code, 400)
+
+
+class BatchConcurrencyTest(TransactionTestCase):
+    def test_consecutive_reads_use_the_pool(self):
+        user = User.objects.create(username="alumno")
+        client = APIClient()
+        client.force_authenticate(user)
+        items = [{"method": "GET", "path": "/api/auth/me/"}] * 3
+        items.append({"method": "POST", "path": "/api/materias/", "body": {}})
+        with mock.patch.object(
+            BatchView, "_run_parallel", wraps=BatchView()._run_parallel
+        ) as parallel:
+            resp = client.post(URL, items, format="json")
+        self.assertEqual(parallel.call_count, 1)
+        self.assertEqual([r["status"] for r in resp.data], [200, 200, 200, 403])
+
+    def test_pool_is_shared_between_requests(self):
+        user = User.objects.create(username="alumno")
+        client = APIClient()
+        client.force_authenticate(user)
+        items = [{"method": "GET", "path": "/api/auth/me/"}] * 3
+        client.post(URL, items, format="json")
+        pool = batch.get_pool()
+        resp = client.post(URL, items, format="json")
+        self.assertIs(batch.get_pool(), pool)
+        self.assertEqual([r["status"] for r in resp.data], [200, 200, 200])
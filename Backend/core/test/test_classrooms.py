@@ -0,0 +1,93 @@
+# core/test/test_classrooms.py
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Classroom
+
+User = get_user_model()
+
+
+class ClassroomCountersTest(TestCase):
+    def setUp(self):
+        self.room_a = Classroom.objects.create(nombre="A")
+        self.room_b = Classroom.objects.create(nombre="B")
+        self.students = []
+        for i in range(4):
+            user = User.objects.create_user(username=f"cc_alumno{i}")
+            user.profile.classroom = self.room_a
+            user.profile.save()
+            self.students.append(user)
+
+    def assertCounts(self, room, total, active):
+        room.refresh_from_db()
+        self.assertEqual(
+            (room.students_count, room.active_students_count), (total, active)
+        )
+
+    def test_profile_save_moves_counts_between_classrooms(self):
+        self.assertCounts(self.room_a, 4, 4)
+        profile = User.objects.get(pk=self.students[0].pk).profile
+        profile.classroom = self.room_b
+        profile.save()
+        self.assertCounts(self.room_a, 3, 3)
+        self.assertCounts(self.room_b, 1, 1)
+
+    def test_soft_delete_and_restore_update_active_count(self):
+        admin = User.objects.create_user(
+            username="cc_admin", is_staff=True, is_superuser=True
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        client.delete(f"/api/users/{self.students[1].pk}/")
+        self.assertCounts(self.room_a, 4, 3)
+        client.post(f"/api/users/{self.students[1].pk}/restore/")
+        self.assertCounts(self.room_a, 4, 4)
+
+    def test_user_delete_decrements_counts(self):
+        self.students[2].delete()
+        self.assertCounts(self.room_a, 3, 3)
+
+    def test_recount_repairs_drift(self):
+        Classroom.objects.filter(pk=self.room_a.pk).update(students_count=99)
+        out = StringIO()
+        call_command("recount_classrooms", stdout=out)
+        self.assertCounts(self.room_a, 4, 4)
+        self.assertIn("1 de 2 salones corregidos", out.getvalue())
+
+
+class ClassroomEndpointsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.room = Classroom.objects.create(nombre="Aula 1")
+        for i in range(5):
+            user = User.objects.create_user(username=f"ce_alumno{i}", is_active=i != 0)
+            user.profile.classroom = cls.room
+            user.profile.save()
+        cls.teacher = User.objects.create_user(username="ce_profe", role="teacher")
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list_reads_denormalized_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/classrooms/")
+        row = resp.data[0]
+        self.assertEqual(row["students_count"], 5)
+        self.assertEqual(row["active_students_count"], 4)
+        self.assertEqual(row["inactive_students_count"], 1)
+
+    def test_students_roster_is_paginated_and_teacher_only(self):
+        url = f"/api/classrooms/{self.room.pk}/students/?page_size=2"
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+
+        self.client.force_authenticate(user=self.teacher)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["results"]), 2)
+        self.assertIsNotNone(resp.data["next"])
+        self.assertEqual(resp.data["results"][0]["classroom_nombre"], "Aula 1")
@@ -0,0 +1,88 @@
+# core/test/test_fast_json.py
+import datetime
+import decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import renderers
+from core.fastlist import values_plan
+from core.models import DeletionLog, Materia, Tarea
+from core.serializers import TareaSerializer
+from core.viewsets import TareaViewSet
+from core.viewsets_audit import DeletionLogViewSet
+
+User = get_user_model()
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    data = {
+        "when": datetime.datetime(
+            2026, 3, 1, 12, 30, 5, 123456, tzinfo=datetime.timezone.utc
+        ),
+        "day": datetime.date(2026, 3, 1),
+        "price": decimal.Decimal("10.50"),
+        "text": "ñandú fin",
+        "items": [1, None, True],
+    }
+
+    def test_matches_drf_output(self):
+        fast = renderers.FastJSONRenderer().render(self.data)
+        self.assertIsInstance(fast, bytes)
+        self.assertEqual(fast, JSONRenderer().render(self.data))
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            content = renderers.FastJSONRenderer().render(self.data)
+        self.assertEqual(content, JSONRenderer().render(self.data))
+
+    def test_parser_rejects_invalid_json(self):
+        resp = APIClient().post(
+            "/api/auth/register/", b"{no es json", content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("JSON parse error", resp.json()["detail"])
+
+
+class ValuesListFastPathTest(TestCase):
+    def setUp(self):
+        admin = User.objects.create(username="admin", is_staff=True)
+        materia = Materia.objects.create(nombre="Mate")
+        for i in range(3):
+            Tarea.objects.create(
+                titulo=f"t{i}",
+                materia=materia,
+                creado_por=admin if i else None,
+                fecha_entrega=timezone.now() if i else None,
+                archivo="tareas_archivos/guia.pdf" if i == 2 else None,
+            )
+        DeletionLog.objects.create(deleted_user=admin, deleted_by=None, reason="x")
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def assert_same_as_slow_path(self, viewset, url):
+        fast = self.client.get(url)
+        with mock.patch.object(viewset, "values_list_fast_path", False):
+            slow = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.json(), slow.json())
+
+    def test_tareas(self):
+        self.assert_same_as_slow_path(TareaViewSet, "/api/tareas/")
+        with self.assertNumQueries(1):
+            self.client.get("/api/tareas/")
+
+    def test_deletion_logs(self):
+        self.assert_same_as_slow_path(DeletionLogViewSet, "/api/deletion-logs/")
+
+    def test_custom_to_representation_uses_slow_path(self):
+        class Custom(TareaSerializer):
+            def to_representation(self, instance):
+                return {"titulo": instance.titulo.upper()}
+
+        self.assertIsNone(values_plan(Custom(), Tarea))
+        self.assertIsNotNone(values_plan(TareaSerializer(), Tarea))
@@ -0,0 +1,109 @@
+# core/test/test_idempotency.py
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.idempotency import _fingerprint, _keys
+from core.models import DeletionLog, Materia
+
+User = get_user_model()
+
+
+class IdempotencyKeyTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.teacher = User.objects.create(username="profe", role="teacher")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def post(self, data, key="k1", path="/api/materias/"):
+        return self.client.post(path, data, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self):
+        first = self.post({"nombre": "Mate"})
+        self.assertEqual(first.status_code, 201)
+        with self.assertNumQueries(0):
+            retry = self.post({"nombre": "Mate"})
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Materia.objects.count(), 1)
+
+        self.post({"nombre": "Mate"}, key="k2")
+        self.assertEqual(Materia.objects.count(), 2)
+
+    def test_key_reused_with_other_body(self):
+        self.post({"nombre": "Mate"})
+        resp = self.post({"nombre": "Física"})
+        self.assertEqual(resp.status_code, 422)
+
+    def test_keys_are_scoped_per_user(self):
+        self.post({"nombre": "Mate"})
+        self.client.force_authenticate(
+            User.objects.create(username="o", role="teacher")
+        )
+        resp = self.post({"nombre": "Mate"})
+        self.assertNotIn("Idempotent-Replayed", resp)
+        self.assertEqual(Materia.objects.count(), 2)
+
+    @override_settings(IDEMPOTENCY_WAIT=0.1)
+    def test_in_flight_duplicate_is_not_executed(self):
+        # simula la original aún en curso: lock tomado y sin respuesta guardada
+        _, lock_key = _keys(f"u{self.teacher.pk}", "POST", "/api/materias/", "k1")
+        caches["default"].add(lock_key, _fingerprint({"nombre": "Mate"}), 30)
+        self.assertEqual(self.post({"nombre": "Mate"}).status_code, 409)
+        self.assertEqual(self.post({"nombre": "Física"}).status_code, 422)
+        self.assertFalse(Materia.objects.exists())
+
+        caches["default"].delete(lock_key)
+        self.assertEqual(self.post({"nombre": "Mate"}).status_code, 201)
+
+    def test_result_stored_between_get_and_lock_is_replayed(self):
+        first = self.post({"nombre": "Mate"})
+        cache = caches["default"]
+        cache_key, lock_key = _keys(
+            f"u{self.teacher.pk}", "POST", "/api/materias/", "k1"
+        )
+        real_get = cache.get
+        misses = [cache_key]  # el primer get no ve la respuesta ya guardada
+
+        def get(key, *args, **kwargs):
+            if key in misses:
+                misses.remove(key)
+                return None
+            return real_get(key, *args, **kwargs)
+
+        with mock.patch.object(cache, "get", side_effect=get):
+            retry = self.post({"nombre": "Mate"})
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Materia.objects.count(), 1)
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_without_header_nothing_changes(self):
+        self.client.post("/api/materias/", {"nombre": "Mate"}, format="json")
+        self.client.post("/api/materias/", {"nombre": "Mate"}, format="json")
+        self.assertEqual(Materia.objects.count(), 2)
+
+    def test_register_and_soft_delete(self):
+        client = APIClient()
+        payload = {"username": "nuevo", "email": "n@x.com", "password": "secreto1"}
+        for _ in range(2):
+            resp = client.post(
+                "/api/auth/register/", payload, format="json", HTTP_IDEMPOTENCY_KEY="r1"
+            )
+            self.assertEqual(resp.status_code, 201)
+        self.assertEqual(User.objects.filter(username="nuevo").count(), 1)
+
+        admin = User.objects.create(username="admin", is_staff=True)
+        self.client.force_authenticate(admin)
+        target = User.objects.get(username="nuevo")
+        for _ in range(2):
+            resp = self.client.delete(
+                f"/api/users/{target.pk}/", HTTP_IDEMPOTENCY_KEY="d1"
+            )
+            self.assertEqual(resp.status_code, 204)
+        self.assertEqual(DeletionLog.objects.filter(deleted_user=target).count(), 1)
@@ -0,0 +1,98 @@
+# core/test/test_login_throttle.py
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.throttling import LoginIPThrottle, SlidingWindowThrottle
+
+User = get_user_model()
+
+LOGIN_URL = "/api/auth/login/"
+
+
+@mock.patch.object(
+    SlidingWindowThrottle,
+    "THROTTLE_RATES",
+    {"login_ip": "5/min", "login_username": "8/min"},
+)
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.victim = User.objects.create_user(username="victim", password="Secret123!")
+        self.legit = User.objects.create_user(username="legit", password="Secret123!")
+
+    def _login(self, username, password, ip):
+        return self.client.post(
+            LOGIN_URL,
+            {"username": username, "password": password},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_ip_bucket_returns_429_with_retry_after(self):
+        for _ in range(5):
+            resp = self._login("victim", "wrong", "10.0.0.66")
+            self.assertEqual(resp.status_code, 401)
+
+        resp = self._login("victim", "wrong", "10.0.0.66")
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreaterEqual(int(resp["Retry-After"]), 1)
+
+    def test_username_bucket_spans_ips(self):
+        for i in range(8):
+            self._login("Victim", "wrong", f"10.0.1.{i}")
+        resp = self._login("victim", "wrong", "10.0.1.200")
+        self.assertEqual(resp.status_code, 429)
+
+    def test_burst_does_not_reach_password_hasher(self):
+        """
+        Benchmark determinista: durante una ráfaga de credential stuffing el
+        trabajo PBKDF2 queda acotado por la capacidad del bucket, así que el
+        login legítimo (otra IP, otra cuenta) no compite por CPU.
+        """
+        original = User.check_password
+        hashes = []
+
+        def counting_check(user, raw):
+            hashes.append(user.username)
+            return original(user, raw)
+
+        with mock.patch.object(User, "check_password", counting_check):
+            statuses = [
+                self._login("victim", f"guess{i}", "10.0.2.1").status_code
+                for i in range(100)
+            ]
+            resp = self._login("legit", "Secret123!", "10.0.3.1")
+
+        self.assertEqual(statuses.count(429), 95)
+        self.assertEqual(hashes.count("victim"), 5)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("access", resp.data)
+
+    def test_blocked_ip_does_not_spend_username_quota(self):
+        for _ in range(5):
+            self._login("victim", "wrong", "10.0.4.1")
+        for _ in range(20):
+            self.assertEqual(
+                self._login("victim", "wrong", "10.0.4.1").status_code, 429
+            )
+        # 5 intentos gastados de 8: quedan 3 desde otras IPs
+        statuses = [
+            self._login("victim", "wrong", f"10.0.5.{i}").status_code for i in range(4)
+        ]
+        self.assertEqual(statuses, [401, 401, 401, 429])
+
+    def test_concurrent_workers_cannot_overspend(self):
+        # dos instancias (dos workers) que ya pasaron check() compiten por el
+        # último hueco: incr es atómico y sólo una lo obtiene
+        request = mock.Mock(META={"REMOTE_ADDR": "10.0.6.1"})
+        for _ in range(4):
+            self.assertTrue(LoginIPThrottle().allow_request(request, None))
+        a, b = LoginIPThrottle(), LoginIPThrottle()
+        self.assertTrue(a.check(request, None))
+        self.assertTrue(b.check(request, None))
+        self.assertEqual(sorted([a.consume(), b.consume()]), [False, True])
@@ -0,0 +1,123 @@
+# core/test/test_materia_summary.py
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Materia, MateriaSummary, Tarea
+
+User = get_user_model()
+
+
+class MateriaSummaryTest(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.mate = Materia.objects.create(nombre="Mate")
+        self.fisica = Materia.objects.create(nombre="Física")
+        self.t_past = Tarea.objects.create(
+            titulo="vencida",
+            materia=self.mate,
+            fecha_entrega=self.now - timedelta(days=1),
+        )
+        self.t_next = Tarea.objects.create(
+            titulo="próxima",
+            materia=self.mate,
+            fecha_entrega=self.now + timedelta(days=2),
+        )
+        Tarea.objects.create(
+            titulo="después",
+            materia=self.mate,
+            fecha_entrega=self.now + timedelta(days=9),
+        )
+        Tarea.objects.create(titulo="sin fecha", materia=self.fisica)
+
+    def summary(self, materia):
+        return MateriaSummary.objects.get(materia=materia)
+
+    def test_signals_keep_summary_in_sync(self):
+        s = self.summary(self.mate)
+        self.assertEqual((s.tareas_count, s.overdue_count), (3, 1))
+        self.assertEqual(s.next_fecha_entrega, self.t_next.fecha_entrega)
+
+        self.t_next.delete()
+        s = self.summary(self.mate)
+        self.assertEqual(s.tareas_count, 2)
+        self.assertEqual(s.next_fecha_entrega, self.now + timedelta(days=9))
+
+        tarea = Tarea.objects.get(pk=self.t_past.pk)
+        tarea.materia = self.fisica
+        tarea.save()
+        self.assertEqual(self.summary(self.mate).overdue_count, 0)
+        self.assertEqual(self.summary(self.fisica).tareas_count, 2)
+        self.assert_matches_rebuild()
+
+    def test_endpoint_reads_only_summary_rows(self):
+        client = APIClient()
+        with self.assertNumQueries(1):  # sólo las filas del resumen
+            resp = client.get("/api/materias/summary/")
+        self.assertEqual(resp.status_code, 200)
+        by_name = {row["materia_nombre"]: row for row in resp.data}
+        self.assertEqual(by_name["Mate"]["tareas_count"], 3)
+        self.assertEqual(by_name["Física"]["next_fecha_entrega"], None)
+
+    def test_stale_command_refreshes_passed_deadlines(self):
+        Tarea.objects.filter(pk=self.t_next.pk).update(
+            fecha_entrega=self.now - timedelta(hours=1)
+        )
+        MateriaSummary.objects.filter(materia=self.mate).update(
+            next_fecha_entrega=self.now - timedelta(hours=1)
+        )
+        APIClient().get("/api/materias/summary/")
+        self.assertEqual(
+            self.summary(self.mate).overdue_count, 1
+        )  # lectura sin escrituras
+        out = StringIO()
+        call_command("rebuild_materia_summaries", "--stale", stdout=out)
+        self.assertIn("1 resúmenes", out.getvalue())
+        self.assertEqual(self.summary(self.mate).overdue_count, 2)
+
+    def test_signals_use_increments_not_aggregates(self):
+        with self.assertNumQueries(2):  # INSERT de la tarea + UPDATE con F()
+            Tarea.objects.create(
+                titulo="nueva",
+                materia=self.mate,
+                fecha_entrega=self.now + timedelta(days=1),
+            )
+        s = self.summary(self.mate)
+        self.assertEqual(s.tareas_count, 4)
+        self.assertEqual(s.next_fecha_entrega, self.now + timedelta(days=1))
+
+        tarea = Tarea.objects.get(pk=self.t_past.pk)
+        tarea.fecha_entrega = self.now + timedelta(days=20)
+        tarea.save()
+        s = self.summary(self.mate)
+        self.assertEqual((s.tareas_count, s.overdue_count), (4, 0))
+        self.assertEqual(s.next_fecha_entrega, self.now + timedelta(days=1))
+        self.assert_matches_rebuild()
+
+    def assert_matches_rebuild(self):
+        incremental = list(
+            MateriaSummary.objects.order_by("pk").values_list(
+                "tareas_count", "overdue_count", "next_fecha_entrega"
+            )
+        )
+        call_command("rebuild_materia_summaries", stdout=StringIO())
+        rebuilt = list(
+            MateriaSummary.objects.order_by("pk").values_list(
+                "tareas_count", "overdue_count", "next_fecha_entrega"
+            )
+        )
+        self.assertEqual(incremental, rebuilt)
+
+    def test_rebuild_command_repairs_drift(self):
+        MateriaSummary.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_materia_summaries", stdout=out)
+        self.assertIn("2 resúmenes", out.getvalue())
+        self.assertEqual(self.summary(self.mate).tareas_count, 3)
+        call_command("rebuild_materia_summaries", stdout=StringIO())
+        self.assertEqual(MateriaSummary.objects.count(), 2)
@@ -0,0 +1,123 @@
+# core/test/test_metrics.py
+import os
+import tempfile
+import threading
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.metrics import Registry, render
+
+User = get_user_model()
+
+
+class MetricsEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_metrics_exposes_route_histograms_and_counts(self):
+        self.client.get("/api/ping/")
+        self.client.get("/api/ping/")
+
+        resp = self.client.get("/api/metrics/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+        body = resp.content.decode()
+        # keyed por la ruta del resolver, no por el path crudo
+        self.assertIn(
+            'http_requests_total{method="GET",route="api/ping/",status="200"}', body
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="api/ping/",le="+Inf"}', body
+        )
+        self.assertIn('db_queries_per_request_count{route="api/ping/"}', body)
+        self.assertIn('token_blacklist_rows{table="outstanding"} 0', body)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_metrics_requires_token_staff_or_allowed_ip(self):
+        remote = {"REMOTE_ADDR": "203.0.113.7"}
+        self.assertEqual(self.client.get("/api/metrics/", **remote).status_code, 403)
+        resp = self.client.get(
+            "/api/metrics/", HTTP_AUTHORIZATION="Bearer otro", **remote
+        )
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.get(
+            "/api/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret", **remote
+        )
+        self.assertEqual(resp.status_code, 200)
+
+        staff = User.objects.create_user(username="ops", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get("/api/metrics/", **remote).status_code, 200)
+
+    def test_table_sizes_are_cached_between_scrapes(self):
+        cache.clear()
+        self.client.get("/api/metrics/")
+        with self.assertNumQueries(0):
+            self.client.get("/api/metrics/")
+
+
+class RegistryTest(TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        reg = Registry()
+        for value in (0.001, 0.02, 0.02, 3.0):
+            reg.observe("http_request_duration_seconds", {"route": "r/"}, value)
+
+        text = render(reg.snapshot())
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="r/",le="0.005"} 1', text
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="r/",le="0.025"} 3', text
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="r/",le="+Inf"} 4', text
+        )
+        self.assertIn('http_request_duration_seconds_count{route="r/"} 4', text)
+
+    def test_dead_threads_shards_are_merged(self):
+        reg = Registry()
+        labels = {"route": "r/", "status": "200"}
+        for _ in range(50):
+            threads = [
+                threading.Thread(
+                    target=lambda: (
+                        reg.inc("http_requests_total", labels),
+                        reg.observe("http_request_duration_seconds", labels, 0.01),
+                    )
+                )
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        data = reg.snapshot()
+        self.assertLessEqual(len(reg._shards), 4)
+        key = ("http_requests_total", (("route", "r/"), ("status", "200")))
+        self.assertEqual(data["counters"][key], 200)
+        hist_key = ("http_request_duration_seconds", key[1])
+        self.assertEqual(sum(data["histograms"][hist_key][0]), 200)
+
+    def test_multiprocess_mode_merges_other_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            other = Registry()
+            other.inc("http_requests_total", {"route": "r/", "status": "200"}, 2)
+            other.flush(tmp)
+            # simula otro worker: el archivo propio se ignora al combinar
+            os.rename(
+                os.path.join(tmp, f"metrics-{os.getpid()}.json"),
+                os.path.join(tmp, "metrics-999999.json"),
+            )
+
+            local = Registry()
+            local.inc("http_requests_total", {"route": "r/", "status": "200"})
+            with override_settings(METRICS_MULTIPROC_DIR=tmp):
+                data = local.collect()
+
+        key = ("http_requests_total", (("route", "r/"), ("status", "200")))
+        self.assertEqual(data["counters"][key], 3)
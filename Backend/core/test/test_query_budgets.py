@@ -0,0 +1,93 @@
+# core/test/test_query_budgets.py
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Classroom, DeletionLog, Materia, Tarea
+from core.routers import router
+from core.test.query_budget import QueryBudgetExceeded, query_budget
+
+User = get_user_model()
+
+# basename del router -> presupuesto de queries por acción.
+# Todo viewset registrado con list/retrieve debe declarar aquí su presupuesto.
+BUDGETS = {
+    "materia": {"list": 1, "retrieve": 1},
+    "tarea": {"list": 1, "retrieve": 1},
+    "deletionlog": {"list": 1, "retrieve": 1},
+    "user": {"list": 1, "retrieve": 1},
+    "classroom": {"list": 1, "retrieve": 1},
+}
+
+ROWS = 15
+
+
+class RouterQueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin_qb", is_staff=True, is_superuser=True
+        )
+        teachers = [
+            User.objects.create_user(username=f"teacher_qb{i}", role="teacher")
+            for i in range(3)
+        ]
+        students = [
+            User.objects.create_user(username=f"student_qb{i}") for i in range(ROWS)
+        ]
+        materias = [
+            Materia.objects.create(nombre=f"Materia {i}", creado_por=teachers[i % 3])
+            for i in range(ROWS)
+        ]
+        for i in range(ROWS * 2):
+            Tarea.objects.create(
+                titulo=f"Tarea {i}",
+                materia=materias[i % ROWS],
+                creado_por=teachers[i % 3],
+            )
+        rooms = [Classroom.objects.create(nombre=f"Salon {i}") for i in range(3)]
+        for i, student in enumerate(students):
+            student.profile.classroom = rooms[i % 3]
+            student.profile.save()
+        for i, student in enumerate(students):
+            DeletionLog.objects.create(
+                deleted_user=student, deleted_by=teachers[i % 3], reason="qb"
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_every_registered_viewset_stays_within_budget(self):
+        for prefix, viewset, basename in router.registry:
+            actions = [a for a in ("list", "retrieve") if hasattr(viewset, a)]
+            if not actions:
+                continue
+            self.assertIn(basename, BUDGETS, f"falta presupuesto para '{basename}'")
+            obj = viewset.queryset.model.objects.order_by("pk").first()
+            urls = {"list": f"/api/{prefix}/", "retrieve": f"/api/{prefix}/{obj.pk}/"}
+            for action in actions:
+                url = urls[action]
+                with self.subTest(viewset=basename, action=action):
+                    with query_budget(BUDGETS[basename][action], label=f"GET {url}"):
+                        resp = self.client.get(url)
+                    self.assertEqual(resp.status_code, 200, resp.content)
+
+
+class QueryBudgetHelperTest(TestCase):
+    def test_report_groups_offending_sql_by_stack(self):
+        Materia.objects.create(nombre="a")
+        Materia.objects.create(nombre="b")
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(1, label="n+1"):
+                for m in Materia.objects.all():
+                    Tarea.objects.filter(materia=m).count()
+
+        report = str(ctx.exception)
+        self.assertIn("n+1: 3 queries (presupuesto 1)", report)
+        self.assertIn("2x desde:", report)
+        self.assertIn("core/test/test_query_budgets.py", report)
+
+    @query_budget(1)
+    def test_decorator_form(self):
+        Materia.objects.exists()
@@ -0,0 +1,69 @@
+# core/test/test_schema_cache.py
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import schema
+
+
+class CachedSchemaTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        override = override_settings(SCHEMA_CACHE_DIR=self.tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        schema._schemas.clear()
+        schema._rendered.clear()
+        self.client = APIClient()
+
+    def test_schema_generated_once_and_revalidated_with_etag(self):
+        with mock.patch.object(
+            schema, "generate_schema", wraps=schema.generate_schema
+        ) as gen:
+            first = self.client.get("/api/schema/?format=json")
+            second = self.client.get("/api/schema/?format=json")
+            self.assertEqual(gen.call_count, 1)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("/api/materias/", first.json()["paths"])
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertIn("max-age=", first["Cache-Control"])
+
+        resp = self.client.get(
+            "/api/schema/?format=json", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+    def test_schema_is_loaded_from_disk_after_restart(self):
+        self.client.get("/api/schema/")
+        schema._schemas.clear()  # simula un worker nuevo
+        schema._rendered.clear()
+        with mock.patch.object(schema, "generate_schema") as gen:
+            resp = self.client.get("/api/schema/")
+        gen.assert_not_called()
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("application/vnd.oai.openapi"))
+
+    def test_if_none_match_is_parsed_not_substring_matched(self):
+        etag = self.client.get("/api/schema/?format=json")["ETag"]
+        for header in (f'"x", {etag}', f"W/{etag}", "*"):
+            resp = self.client.get(
+                "/api/schema/?format=json", HTTP_IF_NONE_MATCH=header
+            )
+            self.assertEqual(resp.status_code, 304, header)
+        # una etiqueta que sólo contiene la nuestra como subcadena no es un acierto
+        resp = self.client.get(
+            "/api/schema/?format=json", HTTP_IF_NONE_MATCH=f'"x{etag[1:-1]}y"'
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_code_version_ignores_tests_and_migrations(self):
+        sources = [str(p) for p in schema._schema_sources(Path(settings.BASE_DIR))]
+        self.assertTrue(any(p.endswith("serializers.py") for p in sources))
+        self.assertFalse(any("migrations" in p or "/test" in p for p in sources))
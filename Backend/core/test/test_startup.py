@@ -0,0 +1,77 @@
+# core/test/test_startup.py
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, get_resolver
+
+from core import schema
+from core.management.commands.startup_profile import parse_importtime
+from core.warmup import STAGES, warm_up
+
+# Presupuesto de arranque en frío de un worker WSGI (imports + warm-up).
+# Holgado para CI; si se rompe, revisa `manage.py startup_profile`.
+STARTUP_BUDGET_SECONDS = 10.0
+
+
+class StartupBudgetTest(TestCase):
+    def test_wsgi_cold_start_within_budget(self):
+        # BD y cache de schema temporales: no toca db.sqlite3 ni .schema_cache
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DJANGO_SETTINGS_MODULE="backend_project.settings",
+                DJANGO_DB_NAME=os.path.join(tmp, "db.sqlite3"),
+                SCHEMA_CACHE_DIR=tmp,
+            )
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-c", "import backend_project.wsgi"],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            elapsed = time.perf_counter() - start
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertLess(elapsed, STARTUP_BUDGET_SECONDS)
+
+
+class StartupWarmUpTest(TestCase):
+    def test_warm_up_primes_process_caches(self):
+        clear_url_caches()
+        for model in apps.get_models():
+            model._meta._expire_cache()
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(SCHEMA_CACHE_DIR=tmp), mock.patch.dict(
+                schema._schemas, clear=True
+            ):
+                warm_up()
+                self.assertTrue(os.listdir(tmp))
+        self.assertTrue(get_resolver()._populated)
+        for model in apps.get_models():
+            self.assertIn("_relation_tree", model._meta.__dict__, model)
+
+    def test_warm_up_runs_every_stage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(SCHEMA_CACHE_DIR=tmp):
+                timings = warm_up()
+        self.assertEqual(list(timings), [name for name, _ in STAGES])
+
+    @override_settings(WARMUP_ON_STARTUP=False)
+    def test_warm_up_can_be_disabled(self):
+        self.assertEqual(warm_up(), {})
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        340 | core.models\n"
+            "otra línea\n"
+        )
+        self.assertEqual(parse_importtime(stderr), [("core.models", 120, 340)])
@@ -0,0 +1,81 @@
+# core/test/test_tareas_bulk.py
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import Materia, MateriaSummary, Tarea
+
+User = get_user_model()
+URL = "/api/tareas/bulk/"
+
+
+@override_settings(AUDIT_SYNC=True)  # el INSERT de auditoría entra en la cuenta
+class TareaBulkTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="profe", role="teacher")
+        self.mate = Materia.objects.create(nombre="Mate")
+        self.fisica = Materia.objects.create(nombre="Física")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_bulk_create_in_constant_queries(self):
+        payload = [
+            {"titulo": f"Guía {i}", "materia": self.mate.pk, "fecha_entrega": None}
+            for i in range(30)
+        ]
+        payload.append({"titulo": "Lab", "materia": self.fisica.pk})
+        # materias, savepoint, insert, agregado y upsert de resúmenes, auditoría
+        with self.assertNumQueries(7):
+            resp = self.client.post(URL, payload, format="json")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(len(resp.data), 31)
+        self.assertEqual(Tarea.objects.filter(creado_por=self.teacher).count(), 31)
+        self.assertEqual(MateriaSummary.objects.get(materia=self.mate).tareas_count, 30)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        payload = [
+            {"titulo": "ok", "materia": self.mate.pk},
+            {"titulo": "", "materia": 9999},
+            {"titulo": "ok 2", "materia": "x"},
+        ]
+        resp = self.client.post(URL, payload, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data[0], {})
+        self.assertEqual(set(resp.data[1]), {"titulo", "materia"})
+        self.assertIn("materia", resp.data[2])
+        self.assertFalse(Tarea.objects.exists())
+
+    def test_bulk_patch(self):
+        a = Tarea.objects.create(titulo="a", materia=self.mate)
+        b = Tarea.objects.create(titulo="b", materia=self.mate)
+        before = Tarea.objects.get(pk=a.pk).updated_at
+        payload = [
+            {"id": a.pk, "titulo": "a2"},
+            {"id": b.pk, "materia": self.fisica.pk},
+        ]
+        resp = self.client.patch(URL, payload, format="json")
+        self.assertEqual(resp.status_code, 200, resp.data)
+        a.refresh_from_db()
+        self.assertEqual(a.titulo, "a2")
+        self.assertGreater(a.updated_at, before)
+        self.assertEqual(Tarea.objects.get(pk=b.pk).materia, self.fisica)
+        self.assertEqual(MateriaSummary.objects.get(materia=self.mate).tareas_count, 1)
+        self.assertEqual(
+            MateriaSummary.objects.get(materia=self.fisica).tareas_count, 1
+        )
+
+    def test_patch_unknown_or_repeated_id(self):
+        a = Tarea.objects.create(titulo="a", materia=self.mate)
+        payload = [{"id": a.pk, "titulo": "x"}, {"id": a.pk}, {"id": 9999}, {}]
+        resp = self.client.patch(URL, payload, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data[0], {})
+        self.assertTrue(all("id" in err for err in resp.data[1:]))
+        self.assertEqual(Tarea.objects.get(pk=a.pk).titulo, "a")
+
+    def test_students_cannot_bulk_write(self):
+        self.client.force_authenticate(User.objects.create(username="alumno"))
+        resp = self.client.post(
+            URL, [{"titulo": "x", "materia": self.mate.pk}], format="json"
+        )
+        self.assertEqual(resp.status_code, 403)
@@ -0,0 +1,112 @@
+# core/test/test_tareas_calendar.py
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.ical import feed_token
+from core.models import Materia, Tarea
+
+User = get_user_model()
+
+
+class UpcomingTareasTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        materia = Materia.objects.create(nombre="Mate")
+        for titulo, delta in [("ayer", -1), ("mañana", 1), ("en 5", 5), ("en 20", 20)]:
+            Tarea.objects.create(
+                titulo=titulo,
+                materia=materia,
+                fecha_entrega=now + timedelta(days=delta),
+            )
+        Tarea.objects.create(titulo="sin fecha", materia=materia)
+        self.client = APIClient()
+
+    def test_returns_window_in_due_order(self):
+        resp = self.client.get("/api/tareas/upcoming/")
+        self.assertEqual([t["titulo"] for t in resp.data], ["mañana", "en 5"])
+        resp = self.client.get("/api/tareas/upcoming/?days=30")
+        self.assertEqual(len(resp.data), 3)
+
+    def test_rejects_bad_days(self):
+        for value in ("x", "0", "1000"):
+            resp = self.client.get(f"/api/tareas/upcoming/?days={value}")
+            self.assertEqual(resp.status_code, 400)
+
+
+class CalendarFeedTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="alumno")
+        self.materia = Materia.objects.create(nombre="Física")
+        Tarea.objects.create(
+            titulo="Informe; parte 1, final",
+            descripcion="línea 1\nlínea 2",
+            materia=self.materia,
+            fecha_entrega=timezone.now() + timedelta(days=3),
+        )
+        Tarea.objects.create(titulo="sin fecha", materia=self.materia)
+        self.url = f"/api/calendar/{feed_token(self.user)}.ics"
+
+    def body(self, resp):
+        return b"".join(resp.streaming_content).decode()
+
+    def test_subscription_url_requires_auth(self):
+        client = APIClient()
+        self.assertEqual(client.get("/api/tareas/calendar/").status_code, 401)
+        client.force_authenticate(self.user)
+        self.assertTrue(
+            client.get("/api/tareas/calendar/").data["url"].endswith(self.url)
+        )
+
+    def test_streams_escaped_events(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertTrue(resp["Content-Type"].startswith("text/calendar"))
+        body = self.body(resp)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 1)
+        self.assertIn("SUMMARY:Física: Informe\\; parte 1\\, final\r\n", body)
+        self.assertIn("DESCRIPTION:línea 1\\nlínea 2\r\n", body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split("\r\n")))
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.url)["ETag"]
+        # token + agregado de Tarea
+        with self.assertNumQueries(2):
+            resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        # fuera de la ventana del feed: el ETag no cambia
+        Tarea.objects.filter(titulo="sin fecha").delete()
+        Tarea.objects.create(
+            titulo="vieja",
+            materia=self.materia,
+            fecha_entrega=timezone.now() - timedelta(days=365),
+        )
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        Tarea.objects.filter(titulo__startswith="Informe").delete()
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_bad_token_or_inactive_user(self):
+        self.assertEqual(self.client.get("/api/calendar/nope.ics").status_code, 404)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_rotation_revokes_old_url_even_with_matching_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        client = APIClient()
+        client.force_authenticate(self.user)
+        new_url = client.post("/api/tareas/calendar/").data["url"]
+        self.assertFalse(new_url.endswith(self.url))
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 404)
+        path = new_url.split("testserver", 1)[1]
+        self.assertEqual(
+            self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
@@ -0,0 +1,72 @@
+# core/test/test_token_maintenance.py
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+
+class PruneTokensCommandTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="prune_user")
+        now = timezone.now()
+        for i in range(5):
+            tok = OutstandingToken.objects.create(
+                user=self.user,
+                jti=f"expired-{i}",
+                token="x",
+                expires_at=now - timedelta(days=1),
+            )
+            if i % 2 == 0:
+                BlacklistedToken.objects.create(token=tok)
+        live = OutstandingToken.objects.create(
+            user=self.user, jti="live", token="x", expires_at=now + timedelta(days=1)
+        )
+        BlacklistedToken.objects.create(token=live)
+
+    def test_prunes_expired_rows_in_batches(self):
+        out = StringIO()
+        call_command("prune_tokens", batch_size=2, stdout=out)
+
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)), ["live"]
+        )
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertIn(
+            "5 outstanding y 3 blacklisted borrados en 3 lotes", out.getvalue()
+        )
+
+    def test_max_batches_bounds_the_run(self):
+        call_command("prune_tokens", batch_size=2, max_batches=1, stdout=StringIO())
+        self.assertEqual(OutstandingToken.objects.count(), 4)
+
+
+class LogoutByJtiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="logout_user")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_logout_blacklists_by_jti(self):
+        refresh = RefreshToken.for_user(self.user)
+        resp = self.client.post("/api/auth/logout/", {"refresh": str(refresh)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(
+            BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists()
+        )
+
+    def test_logout_rejects_tampered_token(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        resp = self.client.post("/api/auth/logout/", {"refresh": refresh[:-4] + "AAAA"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(BlacklistedToken.objects.exists())
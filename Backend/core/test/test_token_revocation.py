@@ -0,0 +1,129 @@
+# core/test/test_token_revocation.py
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.revocation import (
+    CacheBackend,
+    CachedRefreshToken,
+    LocalBackend,
+    RevocationCache,
+    get_revocation_cache,
+)
+
+User = get_user_model()
+
+
+class RevocationCacheTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.user = User.objects.create_user(username="rev_user")
+        self.client = APIClient()
+
+    def test_refresh_check_answered_without_db(self):
+        refresh = RefreshToken.for_user(self.user)
+        cache = RevocationCache(CacheBackend(shared=True))
+        cache.seed()
+        with self.assertNumQueries(0):
+            self.assertFalse(cache.is_revoked(refresh["jti"]))
+
+    @override_settings(REVOCATION_SYNC_INTERVAL=60)
+    def test_local_backend_syncs_misses_with_db_per_interval(self):
+        refresh = RefreshToken.for_user(self.user)
+        worker = RevocationCache(LocalBackend())
+        worker.seed()  # sembrado antes de que otro worker revocara el token
+        refresh.blacklist()
+        with self.assertNumQueries(0):
+            self.assertFalse(worker.is_revoked("jti-que-no-existe"))
+        later = time.monotonic() + 61
+        with mock.patch("core.revocation.time.monotonic", return_value=later):
+            with self.assertNumQueries(1):
+                self.assertTrue(worker.is_revoked(refresh["jti"]))
+            with self.assertNumQueries(0):
+                self.assertTrue(worker.is_revoked(refresh["jti"]))
+                self.assertFalse(worker.is_revoked("jti-que-no-existe"))
+
+    def test_locmem_cache_backend_is_not_shared(self):
+        self.assertFalse(CacheBackend().shared)
+
+    def test_rolled_back_blacklist_is_not_revoked(self):
+        refresh = RefreshToken.for_user(self.user)
+        cache = get_revocation_cache()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    refresh.blacklist()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertNotIn(refresh["jti"], cache._expires)
+        self.assertFalse(cache.is_revoked(refresh["jti"]))
+
+    def test_rotated_token_is_rejected_from_memory(self):
+        old = str(RefreshToken.for_user(self.user))
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                "/api/auth/refresh/", {"refresh": old}, format="json"
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("refresh", resp.data)
+
+        # la rotación escribió en BlacklistedToken -> la deny-list ya lo sabe
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            CachedRefreshToken(old)
+        resp = self.client.post("/api/auth/refresh/", {"refresh": old}, format="json")
+        self.assertEqual(resp.status_code, 401)
+
+    def test_logout_of_revoked_token_skips_writes(self):
+        refresh = RefreshToken.for_user(self.user)
+        get_revocation_cache().seed()
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh.blacklist()
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(0):
+            resp = self.client.post("/api/auth/logout/", {"refresh": str(refresh)})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_logout_with_expired_refresh_is_already_logged_out(self):
+        refresh = RefreshToken.for_user(self.user)
+        refresh.set_exp(lifetime=-timedelta(seconds=1))
+        self.client.force_authenticate(user=self.user)
+        resp = self.client.post("/api/auth/logout/", {"refresh": str(refresh)})
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.post("/api/auth/logout/", {"refresh": "no-es-un-jwt"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_shared_backend_propagates_to_other_workers(self):
+        refresh = RefreshToken.for_user(self.user)
+        other_worker = RevocationCache(CacheBackend(shared=True))
+        other_worker.seed()  # arrancó antes de la revocación
+
+        worker = RevocationCache(CacheBackend(shared=True))
+        worker.seed()
+        token = refresh.blacklist()[0].token
+        worker.add(token.jti, token.expires_at)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(other_worker.is_revoked(refresh["jti"]))
+            self.assertFalse(other_worker.is_revoked("jti-que-no-existe"))
+
+    def test_flushed_shared_cache_is_reseeded_from_db(self):
+        refresh = RefreshToken.for_user(self.user)
+        worker = RevocationCache(CacheBackend(shared=True))
+        worker.seed()
+        refresh.blacklist()  # revocado por otro worker: sólo en BD y en su caché
+        caches["default"].clear()
+
+        self.assertTrue(worker.is_revoked(refresh["jti"]))
+        other_worker = RevocationCache(CacheBackend(shared=True))
+        other_worker._seeded = True
+        with self.assertNumQueries(0):
+            self.assertTrue(other_worker.is_revoked(refresh["jti"]))
@@ -0,0 +1,74 @@
+# core/test/test_user_directory.py
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Classroom
+
+User = get_user_model()
+
+
+class UserDirectoryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin_dir", is_staff=True, is_superuser=True
+        )
+        cls.room_a = Classroom.objects.create(nombre="A")
+        cls.room_b = Classroom.objects.create(nombre="B")
+        for i in range(6):
+            user = User.objects.create_user(
+                username=f"alumno{i}",
+                email=f"alumno{i}@campus.mx",
+                is_active=i != 5,
+            )
+            user.profile.classroom = cls.room_a if i % 2 == 0 else cls.room_b
+            user.profile.save()
+        User.objects.create_user(username="profe", role="teacher")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _usernames(self, resp):
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return sorted(row["username"] for row in resp.data["results"])
+
+    def test_filter_by_classroom_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get(f"/api/users/?classroom={self.room_a.pk}")
+        self.assertEqual(self._usernames(resp), ["alumno0", "alumno2", "alumno4"])
+        self.assertEqual(resp.data["results"][0]["classroom_nombre"], "A")
+
+    def test_filters_role_active_and_prefix(self):
+        resp = self.client.get("/api/users/?role=teacher")
+        self.assertEqual(self._usernames(resp), ["profe"])
+
+        resp = self.client.get("/api/users/?is_active=false")
+        self.assertEqual(self._usernames(resp), ["alumno5"])
+
+        resp = self.client.get("/api/users/?q=alumno1")
+        self.assertEqual(self._usernames(resp), ["alumno1"])
+
+    def test_keyset_pagination(self):
+        resp = self.client.get("/api/users/?page_size=3")
+        self.assertEqual(len(resp.data["results"]), 3)
+        self.assertIn("cursor=", resp.data["next"])
+        self.assertNotIn("count", resp.data)
+
+        seen = [row["id"] for row in resp.data["results"]]
+        resp = self.client.get(resp.data["next"])
+        seen += [row["id"] for row in resp.data["results"]]
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 6)
+
+    def test_retrieve_includes_directory_fields(self):
+        user = User.objects.get(username="alumno1")
+        resp = self.client.get(f"/api/users/{user.pk}/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["classroom"], self.room_b.pk)
+        self.assertTrue(resp.data["is_active"])
+
+    def test_directory_is_admin_only(self):
+        self.client.force_authenticate(user=User.objects.get(username="profe"))
+        self.assertEqual(self.client.get("/api/users/").status_code, 403)
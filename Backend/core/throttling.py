@@ -0,0 +1,149 @@
+# core/throttling.py
+"""
+Throttles de ventana deslizante para las vistas de autenticación.
+
+Login y registro ejecutan un hash PBKDF2 completo por intento; estos throttles
+se evalúan en APIView.initial(), es decir, antes de validar el serializer y por
+tanto antes de tocar el hasher. Los contadores viven en la caché compartida
+(settings.CACHES) y sólo se modifican con add/incr/decr, que son atómicos en
+Redis y memcached: dos workers no pueden gastar el mismo hueco.
+
+AllThrottlesMixin comprueba todos los throttles de la vista antes de consumir
+cupo en alguno, así que un intento rechazado por IP no gasta el cupo del
+username (ni al revés).
+"""
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Hasta N peticiones por periodo ("10/min"). Se cuentan las peticiones de la
+    ventana actual más la fracción de la anterior que todavía se solapa con el
+    último periodo (sin ráfagas de 2N en el borde de dos ventanas).
+    Las tasas se leen de REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][scope].
+    """
+
+    cache_format = "throttle_sw_%(scope)s_%(ident)s"
+
+    def allow_request(self, request, view):
+        return self.check(request, view) and self.consume()
+
+    def check(self, request, view):
+        """True si queda cupo; no consume nada."""
+        self._wait = None
+        self.key = None if self.rate is None else self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self._current_key = f"{self.key}_{window}"
+        self._previous_key = f"{self.key}_{window - 1}"
+        counts = self.cache.get_many([self._current_key, self._previous_key])
+        return self._admit(
+            counts.get(self._current_key, 0) + 1, counts.get(self._previous_key, 0)
+        )
+
+    def consume(self):
+        """Ocupa un hueco de forma atómica; False si otro worker lo ganó antes."""
+        if self.key is None:
+            return True
+        ttl = int(self.duration * 2)
+        if self.cache.add(self._current_key, 1, ttl):
+            current = 1
+        else:
+            try:
+                current = self.cache.incr(self._current_key)
+            except ValueError:  # expiró entre add e incr
+                self.cache.add(self._current_key, 1, ttl)
+                current = 1
+        if self._admit(current, self.cache.get(self._previous_key, 0)):
+            return True
+        self.release()
+        return False
+
+    def release(self):
+        """Devuelve el hueco tomado por consume()."""
+        if self.key is None:
+            return
+        try:
+            self.cache.decr(self._current_key)
+        except ValueError:
+            pass
+
+    def _admit(self, current, previous):
+        """
+        current incluye la petición en curso. Si no entra, deja en _wait los
+        segundos hasta que la fracción solapada de la ventana anterior baje lo
+        suficiente (o hasta la ventana siguiente si la actual ya está llena).
+        """
+        elapsed = self.now % self.duration
+        overlap = previous * (1 - elapsed / self.duration)
+        if current + overlap <= self.num_requests:
+            return True
+        room = self.num_requests - current
+        if room >= 0 and previous:
+            self._wait = (1 - room / previous) * self.duration - elapsed
+        else:
+            self._wait = self.duration - elapsed
+        self._wait = max(self._wait, 0.0)
+        return False
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class AllThrottlesMixin:
+    """
+    Para APIViews cuyos throttles son todos SlidingWindowThrottle: primero
+    comprueba todos y sólo si ninguno bloquea consume cupo en cada uno.
+    """
+
+    def check_throttles(self, request):
+        throttles = self.get_throttles()
+        waits = [t.wait() for t in throttles if not t.check(request, self)]
+        if not waits:
+            consumed = []
+            for throttle in throttles:
+                if not throttle.consume():
+                    waits.append(throttle.wait())
+                    for done in consumed:
+                        done.release()
+                    break
+                consumed.append(throttle)
+        if waits:
+            self.throttled(
+                request, max((w for w in waits if w is not None), default=None)
+            )
+
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class LoginUsernameThrottle(SlidingWindowThrottle):
+    """
+    Limita intentos contra una misma cuenta aunque lleguen desde muchas IPs.
+    """
+
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        data = getattr(request, "data", None)
+        username = data.get("username") if hasattr(data, "get") else None
+        if not username or not isinstance(username, str):
+            return None
+        # hash: el username puede traer caracteres no válidos para memcached
+        ident = hashlib.sha1(username.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class RegisterIPThrottle(LoginIPThrottle):
+    scope = "register_ip"
@@ -1,13 +1,18 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from . import views
+from rest_framework_simplejwt.views import TokenRefreshView
+from . import ical, views
+from .auth_views import LoginView
+from .batch import BatchView
 
 urlpatterns = [
     path("ping/", views.ping, name="ping"),
+    path("metrics/", views.metrics, name="metrics"),
     path("auth/register/", views.RegisterView.as_view(), name="auth-register"),
-    path("auth/login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("auth/login/", LoginView.as_view(), name="token_obtain_pair"),
     path("auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("protected/", views.protected_view, name="protected"),
+    path("calendar/<str:token>.ics", ical.tareas_feed, name="tareas-ics"),
+    path("batch/", BatchView.as_view(), name="batch"),
 ]
 
 from .auth_views import LogoutView
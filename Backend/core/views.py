@@ -1,4 +1,6 @@
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.utils.crypto import constant_time_compare
 from django.views.decorators.http import require_GET
 
 from rest_framework import status, generics
@@ -8,7 +10,10 @@ from rest_framework.response import Response
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from . import metrics as app_metrics
+from .idempotency import IdempotencyMixin
 from .serializers import RegisterSerializer, UserSerializer
+from .throttling import AllThrottlesMixin, RegisterIPThrottle
 
 
 @require_GET
@@ -21,14 +26,41 @@ def ping(request):
     return JsonResponse({"pong": True, "message": "Core app OK"})
 
 
+def _metrics_allowed(request):
+    token = getattr(settings, "METRICS_TOKEN", None)
+    header = request.headers.get("Authorization", "")
+    if token and header.startswith("Bearer "):
+        return constant_time_compare(header[len("Bearer ") :], token)
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    return request.META.get("REMOTE_ADDR") in getattr(
+        settings, "METRICS_ALLOWED_IPS", ()
+    )
+
+
+@require_GET
+def metrics(request):
+    """
+    Métricas del proceso (o de todos los workers en modo multiproceso)
+    en formato de texto de Prometheus.
+    GET /api/metrics/  (Bearer METRICS_TOKEN, sesión de staff o IP permitida)
+    """
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        app_metrics.render_metrics(), content_type=app_metrics.CONTENT_TYPE
+    )
+
+
 # Usamos Generic CreateAPIView para que drf-spectacular infiera el serializer sin advertencias.
 @extend_schema(
     request=RegisterSerializer,
     responses={201: UserSerializer, 400: OpenApiResponse(description="Bad request")},
 )
-class RegisterView(generics.CreateAPIView):
+class RegisterView(AllThrottlesMixin, IdempotencyMixin, generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (RegisterIPThrottle,)
 
 
 @extend_schema(
@@ -45,12 +77,6 @@ def protected_view(request):
 # -------------------------
 # Endpoint para /api/auth/me/
 # -------------------------
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-from .serializers import UserSerializer
-
-
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def me_view(request):
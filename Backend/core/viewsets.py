@@ -1,10 +1,24 @@
-from rest_framework import viewsets
-from .models import Materia, Tarea
-from .serializers import MateriaSerializer, TareaSerializer
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from . import audit
+from .fastlist import ValuesListMixin
+from .ical import feed_token
+from .idempotency import IdempotencyMixin
+from .models import Materia, MateriaSummary, Tarea
+from .serializers import MateriaSerializer, MateriaSummarySerializer, TareaSerializer
 from .permissions import IsTeacherOrReadOnly
 
 
-class MateriaViewSet(viewsets.ModelViewSet):
+class MateriaViewSet(IdempotencyMixin, viewsets.ModelViewSet):
     """
     CRUD para Materia.
     Lectura abierta (GET) por defecto; creación/edición/eliminación solo para profesores/admin.
@@ -17,8 +31,21 @@ class MateriaViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(creado_por=self.request.user)
 
+    @action(detail=False, methods=["get"], serializer_class=MateriaSummarySerializer)
+    def summary(self, request):
+        """
+        Resumen por materia para dashboards: tareas, próxima entrega y vencidas.
+        GET /api/materias/summary/
+        Lee sólo MateriaSummary (una fila por materia), nunca recorre Tarea ni
+        escribe: las filas vencidas las refresca rebuild_materia_summaries --stale.
+        """
+        qs = MateriaSummary.objects.select_related("materia").order_by(
+            "materia__nombre"
+        )
+        return Response(self.get_serializer(qs, many=True).data)
+
 
-class TareaViewSet(viewsets.ModelViewSet):
+class TareaViewSet(IdempotencyMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     CRUD para Tarea.
     Lectura pública/autenticada según tu permiso; creación solo por profesores/admin.
@@ -27,6 +54,108 @@ class TareaViewSet(viewsets.ModelViewSet):
     queryset = Tarea.objects.all().order_by("-created_at")
     serializer_class = TareaSerializer
     permission_classes = [IsTeacherOrReadOnly]
+    UPCOMING_MAX_DAYS = 90
+    BULK_MAX_ITEMS = 500
 
     def perform_create(self, serializer):
-        serializer.save(creado_por=self.request.user)
+        tarea = serializer.save(creado_por=self.request.user)
+        audit.record("tarea.created", actor=self.request.user, target=tarea)
+
+    def perform_update(self, serializer):
+        tarea = serializer.save()
+        audit.record(
+            "tarea.updated",
+            actor=self.request.user,
+            target=tarea,
+            fields=sorted(serializer.validated_data),
+        )
+
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        instance.delete()
+        # sólo si el borrado no falló; delete() deja pk en None
+        instance.pk = pk
+        audit.record(
+            "tarea.deleted",
+            actor=self.request.user,
+            target=instance,
+            titulo=instance.titulo,
+        )
+
+    @action(detail=False, methods=["get"])
+    def upcoming(self, request):
+        """
+        Próximas entregas: tareas con fecha_entrega en los próximos N días.
+        GET /api/tareas/upcoming/?days=7  (máx. UPCOMING_MAX_DAYS)
+        """
+        try:
+            days = int(request.query_params.get("days", 7))
+        except ValueError:
+            raise ValidationError({"days": "Debe ser un entero."})
+        if not 1 <= days <= self.UPCOMING_MAX_DAYS:
+            raise ValidationError(
+                {"days": f"Debe estar entre 1 y {self.UPCOMING_MAX_DAYS}."}
+            )
+        now = timezone.now()
+        qs = Tarea.objects.filter(
+            fecha_entrega__gte=now, fecha_entrega__lte=now + timedelta(days=days)
+        ).order_by("fecha_entrega", "id")
+        return Response(self.get_serializer(qs, many=True).data)
+
+    @action(detail=False, methods=["get", "post"], permission_classes=[IsAuthenticated])
+    def calendar(self, request):
+        """
+        URL de suscripción .ics del usuario (para Google Calendar, Outlook, etc).
+        GET  /api/tareas/calendar/
+        POST /api/tareas/calendar/  rota el token: las URLs anteriores dejan de valer
+        """
+        user = request.user
+        if request.method == "POST":
+            type(user).objects.filter(pk=user.pk).update(
+                calendar_token_version=F("calendar_token_version") + 1
+            )
+            user.refresh_from_db(fields=["calendar_token_version"])
+        path = reverse("tareas-ics", args=[feed_token(user)])
+        return Response({"url": request.build_absolute_uri(path)})
+
+    @action(detail=False, methods=["post", "patch"])
+    def bulk(self, request):
+        """
+        Alta o edición masiva en una sola transacción (todo o nada).
+        POST  /api/tareas/bulk/  [{"titulo": ..., "materia": 1, ...}, ...]
+        PATCH /api/tareas/bulk/  [{"id": 7, "fecha_entrega": ...}, ...]
+        Si algún ítem es inválido responde 400 con una lista de errores
+        alineada con el payload ({} para los ítems válidos).
+        """
+        options = {"many": True, "max_length": self.BULK_MAX_ITEMS}
+        if request.method == "POST":
+            serializer = self.get_serializer(data=request.data, **options)
+            extra = {"creado_por": request.user}
+        else:
+            items = request.data if isinstance(request.data, list) else []
+            pks = [item.get("id") for item in items if isinstance(item, dict)]
+            pks = [pk for pk in pks if isinstance(pk, int) or str(pk).isdigit()]
+            tareas = list(Tarea.objects.filter(pk__in=pks))
+            for tarea in tareas:
+                self.check_object_permissions(request, tarea)
+            serializer = self.get_serializer(
+                tareas, data=request.data, partial=True, **options
+            )
+            extra = {}
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            tareas = serializer.save(**extra)
+            action_name = (
+                "tarea.created" if request.method == "POST" else "tarea.updated"
+            )
+            audit.record_many(
+                action_name, actor=request.user, targets=tareas, bulk=True
+            )
+        return Response(
+            serializer.data,
+            status=(
+                status.HTTP_201_CREATED
+                if request.method == "POST"
+                else status.HTTP_200_OK
+            ),
+        )
@@ -2,6 +2,7 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser
 from rest_framework.serializers import ModelSerializer
+from .fastlist import ValuesListMixin
 from .models import DeletionLog
 
 
@@ -11,12 +12,14 @@ class DeletionLogSerializer(ModelSerializer):
         fields = ["id", "deleted_user", "deleted_by", "reason", "created_at"]
 
 
-class DeletionLogViewSet(viewsets.ReadOnlyModelViewSet):
+class DeletionLogViewSet(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """
     Solo lectura (admin). Lista los logs de eliminación (auditoría).
     GET /api/deletion-logs/
     """
 
+    # list() lee columnas con values_list (ValuesListMixin); el select_related
+    # sólo lo usa retrieve
     queryset = (
         DeletionLog.objects.select_related("deleted_user", "deleted_by")
         .all()
@@ -0,0 +1,41 @@
+# core/viewsets_classrooms.py
+from django.contrib.auth import get_user_model
+from rest_framework import viewsets
+from rest_framework.decorators import action
+
+from .models import Classroom
+from .pagination import KeysetPagination
+from .permissions import IsTeacherOrAdmin, IsTeacherOrReadOnly
+from .serializers import ClassroomSerializer, UserDirectorySerializer
+
+User = get_user_model()
+
+
+class ClassroomViewSet(viewsets.ModelViewSet):
+    """
+    CRUD de salones con sus estadísticas.
+    Los conteos salen de columnas desnormalizadas en Classroom (mantenidas por
+    señales), así que el listado es una sola query sin COUNT(*) por salón.
+
+    GET /api/classrooms/{id}/students/  -> alumnos del salón, paginado por cursor
+    """
+
+    queryset = Classroom.objects.all().order_by("nombre")
+    serializer_class = ClassroomSerializer
+    permission_classes = [IsTeacherOrReadOnly]
+
+    @action(
+        detail=True,
+        methods=["get"],
+        permission_classes=[IsTeacherOrAdmin],
+        serializer_class=UserDirectorySerializer,
+        pagination_class=KeysetPagination,
+    )
+    def students(self, request, pk=None):
+        classroom = self.get_object()
+        qs = User.objects.filter(profile__classroom=classroom).select_related(
+            "profile__classroom"
+        )
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
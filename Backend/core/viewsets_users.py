@@ -1,7 +1,11 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
-from .serializers import UserSerializer
+from django.db.models import Q
+from . import audit
+from .idempotency import IdempotencyMixin
+from .pagination import KeysetPagination
+from .serializers import UserSerializer, UserDirectorySerializer
 from .permissions import CanDeleteUser
 from rest_framework.permissions import IsAuthenticated
 from .models import DeletionLog
@@ -10,11 +14,66 @@ from rest_framework.permissions import IsAdminUser
 
 User = get_user_model()
 
+TRUE_VALUES = ("1", "true", "yes")
+FALSE_VALUES = ("0", "false", "no")
 
-class UserViewSet(viewsets.GenericViewSet):
-    queryset = User.objects.all()
+
+class UserViewSet(
+    IdempotencyMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Directorio de usuarios (admin) + soft delete / restore.
+
+    GET /api/users/?role=student&is_active=true&classroom=3&q=ana
+      - role, is_active, classroom (via profile__classroom): filtros exactos
+      - q: prefijo de username o email
+    Paginado por cursor (keyset) sobre el id; cada página es una sola query.
+    """
+
+    queryset = User.objects.select_related("profile__classroom")
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, CanDeleteUser]  # Para destroy
+    idempotent_methods = ("DELETE",)  # reintentos del soft delete
+    pagination_class = KeysetPagination
+
+    def get_permissions(self):
+        if self.action in ("list", "retrieve"):
+            return [IsAdminUser()]
+        return super().get_permissions()
+
+    def get_serializer_class(self):
+        if self.action in ("list", "retrieve"):
+            return UserDirectorySerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action != "list":
+            return qs
+        params = self.request.query_params
+
+        role = params.get("role")
+        if role:
+            qs = qs.filter(role=role)
+
+        is_active = params.get("is_active", "").lower()
+        if is_active in TRUE_VALUES:
+            qs = qs.filter(is_active=True)
+        elif is_active in FALSE_VALUES:
+            qs = qs.filter(is_active=False)
+
+        classroom = params.get("classroom")
+        if classroom and classroom.isdigit():
+            qs = qs.filter(profile__classroom_id=int(classroom))
+
+        prefix = params.get("q", "").strip()
+        if prefix:
+            # startswith (no icontains) para que use los índices de prefijo
+            qs = qs.filter(Q(username__startswith=prefix) | Q(email__startswith=prefix))
+        return qs
 
     def destroy(self, request, pk=None):
         try:
@@ -37,6 +96,7 @@ class UserViewSet(viewsets.GenericViewSet):
         DeletionLog.objects.create(
             deleted_user=user, deleted_by=request.user, reason=reason
         )
+        audit.record("user.deleted", actor=request.user, target=user, reason=reason)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -60,5 +120,6 @@ class UserViewSet(viewsets.GenericViewSet):
 
         user.is_active = True
         user.save()
+        audit.record("user.restored", actor=request.user, target=user)
 
         return Response({"detail": "User restored."}, status=status.HTTP_200_OK)
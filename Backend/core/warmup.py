@@ -0,0 +1,84 @@
+# core/warmup.py
+"""
+Warm-up del worker antes de aceptar tráfico (llamado desde wsgi.py / asgi.py).
+
+Sin esto, la primera petición de cada worker paga la construcción del URL
+resolver, del _meta de los modelos, del schema OpenAPI y la
+apertura de la conexión a la BD. Cada etapa es independiente: si una falla
+(p.ej. la BD aún no está disponible) se registra y el arranque continúa.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve_urlconf():
+    resolver = get_resolver()
+    resolver.reverse_dict  # fuerza _populate() de todo el árbol de includes
+    resolver.resolve("/api/ping/")
+
+
+def _populate_model_meta():
+    # Los field maps de DRF se rehacen en cada instancia de serializer; lo que
+    # sí queda cacheado por proceso es el _meta de cada modelo (relation tree y
+    # get_fields()), que es lo que recorren al construirse.
+    from django.apps import apps
+
+    for model in apps.get_models():
+        model._meta.get_fields()
+
+
+def _load_schema():
+    from .schema import get_schema
+
+    get_schema()
+
+
+def _seed_revocation_cache():
+    from .revocation import get_revocation_cache
+
+    get_revocation_cache().seed()
+
+
+def _open_db_connections():
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+STAGES = (
+    ("urlconf", _resolve_urlconf),
+    ("models", _populate_model_meta),
+    ("schema", _load_schema),
+    ("revocation", _seed_revocation_cache),
+    ("db", _open_db_connections),
+)
+
+
+def warm_up(connect_db=True):
+    """
+    Ejecuta las etapas de warm-up y devuelve {etapa: segundos}.
+    Con ASGI conviene connect_db=False: las conexiones de Django son por hilo y
+    la abierta aquí no sería la que usan las vistas.
+    """
+    if not getattr(settings, "WARMUP_ON_STARTUP", True):
+        return {}
+    timings = {}
+    for name, stage in STAGES:
+        if name == "db" and not connect_db:
+            continue
+        start = time.perf_counter()
+        try:
+            stage()
+        except Exception:
+            logger.warning("warm-up: la etapa '%s' falló", name, exc_info=True)
+        timings[name] = time.perf_counter() - start
+    logger.info(
+        "warm-up: %s",
+        ", ".join(f"{name}={secs * 1000:.0f}ms" for name, secs in timings.items()),
+    )
+    return timings
@@ -5,9 +5,24 @@
 
 import os
 import re
+import sys
+import json
+import signal
+import threading
 import csv
 import math
+import time
+import pickle
+import hashlib
+import inspect
+import tempfile
 import argparse
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from dataclasses import dataclass, field
 import numpy as np
 import matplotlib.pyplot as plt
 from sympy import (
@@ -27,6 +42,113 @@ def to_float_safe(v):
     except Exception:
         return None
 
+# ---------------- funciones compiladas ----------------
+# Registro LRU de funciones lambdify (numpy) por forma canónica (srepr) de la
+# expresión y orden de derivada: cada expresión se compila una vez por proceso.
+# Con configurar_cache_compiladas(dir) el código generado se guarda en disco y
+# las siguientes ejecuciones lo cargan sin pasar por el printer de sympy.
+COMPILADAS_MAX = 256
+_compiladas = OrderedDict()
+_dir_fuentes = None
+_espacio_numpy = None
+
+def _dir_privado(directorio):
+    """Crea la carpeta de caché con permisos 0700 y la rechaza (devuelve None)
+    si es de otro usuario o la pueden escribir otros: su contenido se ejecuta
+    (.py) o se deserializa con pickle, así que debe ser de confianza."""
+    if not directorio:
+        return None
+    os.makedirs(directorio, mode=0o700, exist_ok=True)
+    if hasattr(os, 'getuid'):
+        st = os.stat(directorio)
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            print(f"Aviso: caché {directorio} ignorada: debe ser del usuario y no escribible por otros (chmod 700)",
+                  file=sys.stderr)
+            return None
+    return directorio
+
+def configurar_cache_compiladas(directorio=None, maximo=None):
+    global _dir_fuentes, COMPILADAS_MAX
+    _dir_fuentes = _dir_privado(directorio)
+    if maximo is not None:
+        COMPILADAS_MAX = maximo
+
+def _ruta_fuente(clave):
+    h = hashlib.sha256(f"{sp.__version__}|{clave}".encode()).hexdigest()
+    return os.path.join(_dir_fuentes, h[:40] + ".py")
+
+def _espacio_base():
+    """Espacio de nombres común de lambdify con numpy (sin los nombres que
+    agrega para cada expresión)."""
+    global _espacio_numpy
+    if _espacio_numpy is None:
+        _espacio_numpy = lambdify(symbols('x'), symbols('x'), 'numpy').__globals__
+    return _espacio_numpy
+
+def _importaciones(f):
+    """Líneas `from m import n` para los nombres que lambdify agregó a esta
+    función (gamma/erf de math, reduce de functools, ...); None si alguno no se
+    puede reimportar por nombre y la función no debe guardarse."""
+    base, lineas = _espacio_base(), []
+    for nombre, valor in sorted(f.__globals__.items()):
+        if nombre.startswith('__') or (nombre in base and base[nombre] is valor):
+            continue
+        modulo = getattr(valor, '__module__', None)
+        try:
+            if modulo is None or getattr(__import__(modulo, fromlist=[nombre]), nombre) is not valor:
+                return None
+        except (ImportError, AttributeError):
+            return None
+        lineas.append(f"from {modulo} import {nombre}\n")
+    return "".join(lineas)
+
+def _cargar_fuente(ruta):
+    """Reconstruye la función a partir del código guardado (con sus
+    importaciones), en el mismo espacio de nombres que usa lambdify con numpy."""
+    try:
+        with open(ruta, encoding='utf-8') as fh:
+            src = fh.read()
+    except OSError:
+        return None
+    ns = dict(_espacio_base())
+    try:
+        exec(compile(src, ruta, 'exec'), ns)
+        return ns['_lambdifygenerated']
+    except Exception:
+        return None
+
+def _guardar_fuente(ruta, f):
+    try:
+        imports = _importaciones(f)
+        if imports is None:
+            return
+        src = imports + inspect.getsource(f)
+        tmp = f"{ruta}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            fh.write(src)
+        os.replace(tmp, ruta)
+    except (OSError, TypeError):
+        pass
+
+def compilar(expr, x, orden=0):
+    """lambdify(x, d^orden expr/dx^orden, 'numpy') memorizado."""
+    clave = f"{sp.srepr(x)}|{sp.srepr(expr)}|{orden}"
+    f = _compiladas.get(clave)
+    if f is not None:
+        _compiladas.move_to_end(clave)
+        return f
+    ruta = _ruta_fuente(clave) if _dir_fuentes else None
+    if ruta and os.path.exists(ruta):
+        f = _cargar_fuente(ruta)
+    if f is None:
+        f = lambdify(x, diff(expr, x, orden) if orden else expr, 'numpy')
+        if ruta:
+            _guardar_fuente(ruta, f)
+    _compiladas[clave] = f
+    while len(_compiladas) > COMPILADAS_MAX:
+        _compiladas.popitem(last=False)
+    return f
+
 # ---------------- análisis simbólico ----------------
 def encontrar_ceros_simbólicos(funcion, x):
     try:
@@ -35,58 +157,82 @@ def encontrar_ceros_simbólicos(funcion, x):
     except Exception:
         return []
 
+def fusionar_raices(rs, eps=1e-5):
+    """Ordena y elimina duplicados a menos de eps (por orden, sin comparar todos
+    contra todos)."""
+    rs = np.sort(np.asarray([r for r in rs if r is not None], dtype=float))
+    if rs.size > 1:
+        rs = rs[np.concatenate(([True], np.diff(rs) > eps))]
+    return [float(r) for r in rs]
+
+def refinar_raices(f, a, b, fa, fb, tol=1e-8, max_iter=100, df=None):
+    """Refina todos los corchetes [a, b] (fa*fb < 0) a la vez con regula falsi
+    (variante Illinois) y, si hay derivada, un paso de Newton final que sólo se
+    acepta si queda dentro del corchete y mejora |f|. Devuelve un array con la
+    raíz de cada corchete o NaN si no converge a un cero (polos, NaN)."""
+    a, b, fa, fb = (np.array(v, dtype=float) for v in (a, b, fa, fb))
+    fa0, fb0 = np.abs(fa), np.abs(fb)
+    c, fc = 0.5 * (a + b), np.full(a.shape, np.nan)
+    lado = np.zeros(a.shape, dtype=np.int8)  # extremo que se movió la última vez
+    act = np.ones(a.shape, dtype=bool)
+    for _ in range(max_iter):
+        if not act.any():
+            break
+        ia = np.flatnonzero(act)
+        A, B, FA, FB = a[ia], b[ia], fa[ia], fb[ia]
+        with np.errstate(all='ignore'):
+            C = (A * FB - B * FA) / (FB - FA)
+        malo = ~np.isfinite(C) | (C <= A) | (C >= B)
+        C[malo] = 0.5 * (A[malo] + B[malo])
+        FC = evaluar(f, C)
+        c[ia], fc[ia] = C, FC
+        # NaN dentro del corchete: se descarta
+        act[ia[~np.isfinite(FC)]] = False
+        izq = np.isfinite(FC) & (np.sign(FC) == np.sign(FA))
+        der = np.isfinite(FC) & ~izq
+        # Illinois: si el mismo extremo se mueve dos veces seguidas, se divide
+        # a la mitad el valor del que quedó fijo
+        l = lado[ia]
+        fb[ia[izq & (l == -1)]] *= 0.5
+        fa[ia[der & (l == 1)]] *= 0.5
+        a[ia[izq]], fa[ia[izq]] = C[izq], FC[izq]
+        b[ia[der]], fb[ia[der]] = C[der], FC[der]
+        lado[ia[izq]], lado[ia[der]] = -1, 1
+        hecho = (FC == 0) | ((b[ia] - a[ia]) <= tol * np.maximum(1.0, np.abs(C)))
+        act[ia[hecho]] = False
+    if df is not None:
+        with np.errstate(all='ignore'):
+            n = c - fc / evaluar(df, c)
+        ok = np.isfinite(n) & (n >= a) & (n <= b)
+        if ok.any():
+            fn = np.full(c.shape, np.nan)
+            fn[ok] = evaluar(f, n[ok])
+            mejor = ok & (np.abs(fn) < np.abs(fc))
+            c[mejor], fc[mejor] = n[mejor], fn[mejor]
+    # en un polo |f| crece al cerrar el corchete en lugar de tender a cero
+    cero = np.isfinite(fc) & (np.abs(fc) < np.minimum(fa0, fb0))
+    return np.where(cero, c, np.nan)
+
 def encontrar_ceros_numéricos_por_muestreo(expr, x, xmin, xmax, n_intervals=400, tol=1e-8):
-    """Busca ceros numéricos escaneando intervalos y usando nsolve/bisección como fallback."""
-    f_np = lambdify(x, expr, 'numpy')
+    """Busca ceros numéricos: una sola evaluación de la malla localiza todos los
+    cambios de signo y se refinan juntos (refinar_raices)."""
+    f_np = compilar(expr, x)
+    try:
+        df_np = compilar(expr, x, 1)
+    except Exception:
+        df_np = None
     xs = np.linspace(xmin, xmax, n_intervals+1)
-    roots = []
-    for i in range(n_intervals):
-        a, b = xs[i], xs[i+1]
-        try:
-            fa = f_np(a); fb = f_np(b)
-        except Exception:
-            continue
-        if not (np.isfinite(fa) and np.isfinite(fb)):
-            continue
-        # exact zero at endpoint
-        if abs(fa) < tol:
-            roots.append(a)
-        if fa * fb < 0:
-            # sign change -> try nsolve near midpoint
-            mid = 0.5*(a+b)
-            try:
-                r = sp.nsolve(expr, x, mid, tol=tol, maxsteps=50)
-                rv = to_float_safe(r)
-                if rv is not None and xmin - 1e-9 <= rv <= xmax + 1e-9:
-                    roots.append(rv)
-                    continue
-            except Exception:
-                # fallback bisection
-                ra, rb = a, b
-                fa_, fb_ = fa, fb
-                for _ in range(50):
-                    m = 0.5*(ra+rb)
-                    try:
-                        fm = f_np(m)
-                    except Exception:
-                        break
-                    if not np.isfinite(fm):
-                        break
-                    if abs(fm) < tol:
-                        roots.append(m); break
-                    if fa_ * fm < 0:
-                        rb = m; fb_ = fm
-                    else:
-                        ra = m; fa_ = fm
-                else:
-                    roots.append(0.5*(a+b))
-    uniq = []
-    for r in roots:
-        if r is None: continue
-        if all(abs(r - u) > 1e-5 for u in uniq):
-            uniq.append(r)
-    uniq.sort()
-    return uniq
+    fs = evaluar(f_np, xs)
+    fin = np.isfinite(fs)
+    # ceros exactos en la malla
+    roots = [xs[fin & (np.abs(fs) < tol)]]
+    k = np.flatnonzero(fin[:-1] & fin[1:] & (fs[:-1] * fs[1:] < 0))
+    if k.size:
+        rs = refinar_raices(f_np, xs[k], xs[k+1], fs[k], fs[k+1], tol=tol, df=df_np)
+        roots.append(rs[np.isfinite(rs)])
+    roots = np.concatenate(roots)
+    roots = roots[(roots >= xmin - 1e-9) & (roots <= xmax + 1e-9)]
+    return fusionar_raices(roots)
 
 def dominio_discontinuidades(expr, x):
     """Detecta puntos simbólicos donde denominador = 0."""
@@ -152,33 +298,564 @@ def puntos_criticos_simb(expr, x):
         return {"f1": None, "f2": None, "extrema": [], "inflexion": []}
 
 # ---------------- muestreo y detección ----------------
-def muestrear_funcion(expr, x, xmin, xmax, npoints=1600):
-    f = lambdify(x, expr, modules=["numpy"])
-    xs = np.linspace(xmin, xmax, npoints)
+def _float_o_nan(v):
+    try:
+        c = complex(v)
+    except Exception:
+        return np.nan
+    return c.real if abs(c.imag) <= 1e-12 * max(1.0, abs(c.real)) else np.nan
+
+def valores_reales(ys, shape, dtype=np.float64):
+    """Normaliza la salida de lambdify a un array real de forma `shape`:
+    escalares (expresión constante) se expanden por broadcasting, valores
+    complejos con parte imaginaria no nula y no finitos quedan en NaN."""
+    ys = np.asarray(ys)
+    if ys.dtype == object:
+        # tipos mezclados (sympy Float, zoo, ...): camino lento, poco común
+        ys = np.frompyfunc(_float_o_nan, 1, 1)(ys).astype(np.float64)
+    elif np.iscomplexobj(ys):
+        re_ = ys.real
+        no_real = np.abs(ys.imag) > 1e-12 * np.maximum(1.0, np.abs(re_))
+        ys = np.where(no_real, np.nan, re_)
+    out = np.array(np.broadcast_to(ys, shape), dtype=dtype)
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+def _llamar(f, v):
+    try:
+        return f(v)
+    except Exception:
+        return np.nan
+
+def evaluar(f, xs, dtype=np.float64):
+    """Evalúa f (lambdify numpy) sobre xs de una vez; si la función no acepta
+    arrays cae a evaluación punto a punto."""
     with np.errstate(all='ignore'):
-        ys = f(xs)
-    ys_out = np.empty_like(xs, dtype=float)
-    for i, v in enumerate(ys):
         try:
-            if np.isfinite(v):
-                ys_out[i] = float(v)
-            else:
-                ys_out[i] = np.nan
+            ys = f(xs)
         except Exception:
-            ys_out[i] = np.nan
-    return xs, ys_out
+            ys = np.frompyfunc(lambda v: _float_o_nan(_llamar(f, v)), 1, 1)(xs)
+    return valores_reales(ys, np.shape(xs), dtype)
+
+def muestrear_funcion(expr, x, xmin, xmax, npoints=1600, dtype=np.float64):
+    f = compilar(expr, x)
+    xs = np.linspace(xmin, xmax, npoints)
+    ys = evaluar(f, xs, dtype)
+    return xs.astype(dtype, copy=False), ys
+
+def muestrear_adaptativo(expr, x, xmin, xmax, max_puntos=1600, n_inicial=65, tol=2e-3,
+                         dtype=np.float64, max_niveles=40):
+    """Muestreo adaptativo: parte de una malla gruesa y subdivide sólo los
+    intervalos donde el punto medio se aparta de la interpolación lineal
+    (relativo a la escala de la gráfica), donde la pendiente gira bruscamente o
+    donde la función entra/sale del dominio (NaN). Cada nivel evalúa todos los
+    puntos medios de una vez. Devuelve (xs, ys) con xs creciente y no uniforme,
+    con a lo sumo max_puntos evaluaciones."""
+    f = compilar(expr, x)
+    xs = np.linspace(xmin, xmax, max(3, min(n_inicial, max_puntos)))
+    ys = evaluar(f, xs)
+    fin = ys[np.isfinite(ys)]
+    if fin.size:
+        lo, hi = np.percentile(fin, [2, 98])
+        escala_y = max(hi - lo, 1e-12 * max(1.0, abs(hi)))
+    else:
+        lo, hi, escala_y = -1.0, 1.0, 1.0
+    # fuera de esta franja el tramo no se ve: no vale la pena refinarlo
+    techo, piso = hi + 0.5 * escala_y, lo - 0.5 * escala_y
+    escala_x = (xmax - xmin) or 1.0
+    min_ancho = escala_x * 1e-6
+
+    cand = np.arange(len(xs) - 1)
+    prio = np.ones(len(cand))
+    for _ in range(max_niveles):
+        restante = max_puntos - len(xs)
+        if restante <= 0 or cand.size == 0:
+            break
+        ok = (xs[cand + 1] - xs[cand]) > min_ancho
+        cand, prio = cand[ok], prio[ok]
+        if cand.size > restante:
+            # presupuesto: primero los intervalos con mayor error estimado
+            top = np.sort(np.argpartition(-prio, restante - 1)[:restante])
+            cand, prio = cand[top], prio[top]
+        if cand.size == 0:
+            break
+        a, b = xs[cand], xs[cand + 1]
+        ya, yb = ys[cand], ys[cand + 1]
+        m = 0.5 * (a + b)
+        ym = evaluar(f, m)
+
+        with np.errstate(all='ignore'):
+            err = np.abs(ym - 0.5 * (ya + yb)) / escala_y
+            # giro de pendiente en coordenadas normalizadas de la gráfica
+            h = (m - a) / escala_x
+            giro = np.abs(np.arctan((ym - ya) / escala_y / h) - np.arctan((yb - ym) / escala_y / h))
+            # un quiebre sólo se nota si el tramo mide más de ~1% de la gráfica
+            giro = np.where(np.hypot(2 * h, (yb - ya) / escala_y) > 1e-2, giro, 0.0)
+        fa, fb, fm = np.isfinite(ya), np.isfinite(yb), np.isfinite(ym)
+        borde = (fa | fb | fm) & ~(fa & fb & fm)
+        with np.errstate(invalid='ignore'):
+            oculto = ((ya > techo) & (yb > techo) & (ym > techo)) | ((ya < piso) & (yb < piso) & (ym < piso))
+        refinar = borde | (~oculto & ((err > tol) | (giro > 0.1)))
+        err = np.where(np.isfinite(err), err, 1.0)
+
+        pos = cand + 1 + np.arange(cand.size)  # índice de cada punto medio insertado
+        xs = np.insert(xs, cand + 1, m)
+        ys = np.insert(ys, cand + 1, ym)
+        sel = pos[refinar]
+        cand = np.concatenate([sel - 1, sel])
+        prio = np.concatenate([err[refinar], err[refinar]])
+        orden = np.argsort(cand, kind='stable')
+        cand, prio = cand[orden], prio[orden]
+    return xs.astype(dtype, copy=False), ys.astype(dtype, copy=False)
 
 def detectar_asintotas_verticales_por_muestreo(xs, ys):
-    vlines = set()
-    for i in range(1, len(xs)):
-        if (np.isnan(ys[i]) and np.isfinite(ys[i-1])) or (np.isnan(ys[i-1]) and np.isfinite(ys[i])):
-            vlines.add(0.5*(xs[i-1] + xs[i]))
+    """Candidatas a asíntota vertical entre muestras consecutivas (la malla
+    puede ser no uniforme): entrada/salida del dominio, saltos grandes y cambios
+    de signo con ambos lados muy por encima de la escala típica (tan, 1/x).
+    Candidatas casi coincidentes (malla adaptativa) se funden en una."""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if len(xs) < 2:
+        return []
+    y0, y1 = ys[:-1], ys[1:]
+    f0, f1 = np.isfinite(y0), np.isfinite(y1)
+    fin = ys[np.isfinite(ys)]
+    escala = np.subtract(*np.percentile(fin, [98, 2])) if fin.size else 1.0
+    with np.errstate(invalid='ignore'):
+        salto = np.abs(y1 - y0) > np.maximum(1e3, 10 * np.abs(y0) + 1)
+        polo = (y0 * y1 < 0) & (np.minimum(np.abs(y0), np.abs(y1)) > 2 * max(escala, 1e-12))
+    hit = (f0 ^ f1) | (f0 & f1 & (salto | polo))
+    vs = 0.5 * (xs[:-1] + xs[1:])[hit]
+    if vs.size > 1:
+        # por grupo de candidatas a menos de 0.1% del rango, la del intervalo más fino
+        ancho = np.diff(xs)[hit]
+        grupo = np.concatenate(([0], np.cumsum(np.diff(vs) > (xs[-1] - xs[0]) * 1e-3)))
+        orden = np.lexsort((ancho, grupo))
+        primero = np.concatenate(([True], np.diff(grupo[orden]) > 0))
+        vs = vs[orden][primero]
+    return [float(v) for v in vs]
+
+# ---------------- caché de resultados simbólicos ----------------
+# Resultados de las etapas simbólicas (simplify, solveset, limit, diff...) en
+# disco, direccionados por contenido: sha256 de la operación, los argumentos en
+# forma canónica (srepr) y la versión de sympy. No dependen de --xmin/--xmax,
+# así que repetir un análisis no vuelve a hacer trabajo simbólico. Escritura
+# atómica (archivo temporal + os.replace), así que varios procesos pueden
+# compartir la carpeta; el tamaño se acota borrando los menos usados (mtime).
+# La clave incluye ESQUEMA_CACHE y un hash de este archivo: si cambia el código
+# del análisis, las entradas viejas dejan de usarse (y se van por LRU).
+_dir_simbolico = None
+SIMBOLICO_MAX_BYTES = 64 * 2**20
+ESQUEMA_CACHE = 1
+PODA_CADA = 256  # escrituras entre recuentos completos de la carpeta
+_tam_estimado = None  # bytes en la carpeta según este proceso
+_escrituras = 0
+_hash_codigo = None
+
+def _version_codigo():
+    global _hash_codigo
+    if _hash_codigo is None:
+        try:
+            with open(__file__, 'rb') as fh:
+                _hash_codigo = hashlib.sha256(fh.read()).hexdigest()[:16]
+        except OSError:
+            _hash_codigo = "?"
+    return _hash_codigo
+
+def configurar_cache_simbolica(directorio=None, max_bytes=None):
+    global _dir_simbolico, SIMBOLICO_MAX_BYTES
+    _dir_simbolico = _dir_privado(directorio)
+    if max_bytes is not None:
+        SIMBOLICO_MAX_BYTES = max_bytes
+    _reiniciar_estimacion()
+
+def _reiniciar_estimacion():
+    global _tam_estimado, _escrituras
+    _tam_estimado, _escrituras = None, 0
+
+def clave_simbolica(fn, args):
+    partes = [str(ESQUEMA_CACHE), _version_codigo(), sp.__version__, fn.__qualname__]
+    partes += [sp.srepr(a) if isinstance(a, sp.Basic) else repr(a) for a in args]
+    return hashlib.sha256("|".join(partes).encode()).hexdigest()
+
+def leer_cache_simbolica(clave):
+    """(True, valor) si está en la caché, (False, None) si no."""
+    if not _dir_simbolico:
+        return False, None
+    ruta = os.path.join(_dir_simbolico, clave + ".pkl")
+    try:
+        with open(ruta, 'rb') as fh:
+            valor = pickle.load(fh)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        # corrupto o de otra versión: se descarta
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+        return False, None
+    try:
+        os.utime(ruta)  # LRU: marca de uso
+    except OSError:
+        pass
+    return True, valor
+
+def guardar_cache_simbolica(clave, valor):
+    global _tam_estimado, _escrituras
+    if not _dir_simbolico:
+        return
+    try:
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return
+    try:
+        fd, tmp = tempfile.mkstemp(dir=_dir_simbolico, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(datos)
+        os.replace(tmp, os.path.join(_dir_simbolico, clave + ".pkl"))
+    except OSError:
+        return
+    # la carpeta sólo se recorre al pasar del límite estimado o cada PODA_CADA
+    # escrituras (para ver lo que escribieron otros procesos), no en cada una
+    _escrituras += 1
+    if _tam_estimado is None or _escrituras % PODA_CADA == 0:
+        _tam_estimado = _podar_cache_simbolica()
+    else:
+        _tam_estimado += len(datos)
+        if _tam_estimado > SIMBOLICO_MAX_BYTES:
+            _tam_estimado = _podar_cache_simbolica()
+
+def _podar_cache_simbolica():
+    """Borra los menos usados hasta quedar en el 90% del límite (para no podar
+    en cada escritura siguiente). Devuelve el tamaño resultante."""
+    archivos, total = [], 0
+    with os.scandir(_dir_simbolico) as it:
+        for e in it:
+            if not e.name.endswith(".pkl"):
+                continue
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            archivos.append((st.st_mtime, st.st_size, e.path))
+            total += st.st_size
+    if total <= SIMBOLICO_MAX_BYTES:
+        return total
+    objetivo = int(SIMBOLICO_MAX_BYTES * 0.9)
+    for _, tam, ruta in sorted(archivos):
+        try:
+            os.remove(ruta)
+        except OSError:
+            continue
+        total -= tam
+        if total <= objetivo:
+            break
+    return total
+
+# ---------------- ejecución con límite de tiempo ----------------
+# solveset/limit/simplify pueden tardar minutos o no terminar con entradas
+# trascendentes: cada etapa simbólica va a un proceso aparte y se abandona al
+# vencer su plazo (los procesos se terminan al final).
+TIMEOUT_ETAPA = 30.0
+
+def ejecutar_con_limite(tareas, timeout=TIMEOUT_ETAPA, timeouts=None, mientras=None, procesos=None):
+    """tareas: {nombre: (función, args)}. Las lanza todas a la vez en un Pool y
+    espera cada una hasta su plazo (timeouts[nombre] o timeout, en segundos
+    desde el envío), así que el tiempo total es el de la etapa más lenta
+    permitida. `mientras` se ejecuta en este proceso durante la espera.
+    Devuelve ({nombre: resultado}, {nombre: motivo}) con motivo 'tiempo
+    agotado' o 'error'.
+
+    Con timeout 0 corre todo aquí, en serie y sin límite. Con procesos=0
+    también corre aquí en serie, pero con el plazo por SIGALRM (para workers
+    que no pueden abrir su propio Pool).
+
+    Con la caché simbólica activa, lo ya calculado no se vuelve a lanzar y lo
+    nuevo se guarda."""
+    resultados, claves = {}, {}
+    if _dir_simbolico:
+        for n, (fn, a) in list(tareas.items()):
+            claves[n] = clave_simbolica(fn, a)
+            hay, valor = leer_cache_simbolica(claves[n])
+            if hay:
+                resultados[n] = valor
+        tareas = {n: t for n, t in tareas.items() if n not in resultados}
+    hechos, fallos = _ejecutar(tareas, timeout, timeouts, mientras, procesos)
+    for n, v in hechos.items():
+        resultados[n] = v
+        if n in claves:
+            guardar_cache_simbolica(claves[n], v)
+    return resultados, fallos
+
+def _plazo(nombre, timeout, timeouts):
+    """Plazo de una tarea: timeouts[nombre], o el de su etapa para nombres
+    'etapa:f1', o el general."""
+    timeouts = timeouts or {}
+    return timeouts.get(nombre, timeouts.get(nombre.partition(':')[0], timeout))
+
+class _TiempoAgotado(BaseException):
+    # BaseException: que no la atrapen los `except Exception` de sympy ni los
+    # de este módulo
+    pass
+
+def _alarma(signum, frame):
+    raise _TiempoAgotado()
+
+def _puede_alarmar():
+    return hasattr(signal, 'SIGALRM') and threading.current_thread() is threading.main_thread()
+
+def _serial_con_alarma(tareas, timeout, timeouts):
+    resultados, fallos = {}, {}
+    previo = signal.signal(signal.SIGALRM, _alarma)
+    try:
+        for n, (fn, a) in tareas.items():
+            try:
+                signal.setitimer(signal.ITIMER_REAL, _plazo(n, timeout, timeouts))
+                try:
+                    resultados[n] = fn(*a)
+                finally:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            except _TiempoAgotado:
+                fallos[n] = 'tiempo agotado'
+            except Exception:
+                fallos[n] = 'error'
+    finally:
+        signal.signal(signal.SIGALRM, previo)
+    return resultados, fallos
+
+def _ejecutar(tareas, timeout, timeouts, mientras, procesos):
+    resultados, fallos = {}, {}
+    if not tareas or not timeout or procesos == 0:
+        if mientras:
+            mientras()
+        if tareas and timeout and _puede_alarmar():
+            return _serial_con_alarma(tareas, timeout, timeouts)
+        for n, (fn, a) in tareas.items():
+            try:
+                resultados[n] = fn(*a)
+            except Exception:
+                fallos[n] = 'error'
+        return resultados, fallos
+    pool = multiprocessing.Pool(procesos or len(tareas))
+    try:
+        t0 = time.monotonic()
+        pendientes = {n: pool.apply_async(fn, a) for n, (fn, a) in tareas.items()}
+        if mientras:
+            mientras()
+        for n, ar in pendientes.items():
+            plazo = _plazo(n, timeout, timeouts)
+            try:
+                resultados[n] = ar.get(max(0.0, t0 + plazo - time.monotonic()))
+            except multiprocessing.TimeoutError:
+                fallos[n] = 'tiempo agotado'
+            except Exception:
+                fallos[n] = 'error'
+    finally:
+        pool.terminate()
+        pool.join()
+    return resultados, fallos
+
+# ---------------- resultado del análisis ----------------
+_PENDIENTE = object()
+
+def _perezoso(nombre, calcular):
+    """Propiedad que calcula el valor la primera vez y lo guarda en el slot
+    `_nombre`."""
+    slot = '_' + nombre
+    def get(self):
+        v = getattr(self, slot)
+        if v is _PENDIENTE:
+            v = calcular(self)
+            setattr(self, slot, v)
+        return v
+    get.__name__ = nombre
+    return property(get)
+
+def _calc_paridad(r):
+    x, e = r.x, r.expr
+    try:
+        neg = simplify(e.subs(x, -x))
+        if simplify(neg - e) == 0:
+            return "PAR"
+        if simplify(neg + e) == 0:
+            return "IMPAR"
+        return "NINGUNA"
+    except Exception:
+        return None
+
+def _calc_raices(r):
+    """Ceros simbólicos (como float) y numéricos, sin duplicados, en el rango."""
+    rs = []
+    for c in r.ceros_sym:
+        cf = to_float_safe(c)
+        if cf is None:
+            try:
+                cf = float(c.evalf())
+            except Exception:
+                continue
+        rs.append(cf)
+    return [v for v in fusionar_raices(rs + list(r.ceros_num)) if r.xmin <= v <= r.xmax]
+
+def _calc_muestras(r):
+    if r.adaptativo:
+        return muestrear_adaptativo(r.expr, r.x, r.xmin, r.xmax, max_puntos=r.npoints, tol=r.tol, dtype=r.dtype)
+    return muestrear_funcion(r.expr, r.x, r.xmin, r.xmax, npoints=r.npoints, dtype=r.dtype)
+
+def _paridad_numerica(r):
+    L = max(abs(r.xmin), abs(r.xmax)) or 1.0
+    xs = np.linspace(L / 401, L, 400)
+    f = compilar(r.expr, r.x)
+    a, b = evaluar(f, xs), evaluar(f, -xs)
+    ok = np.isfinite(a) & np.isfinite(b)
+    if not ok.any():
+        return None
+    a, b = a[ok], b[ok]
+    tol = 1e-9 * max(1.0, np.max(np.abs(a)))
+    if np.all(np.abs(a - b) <= tol):
+        return "PAR"
+    if np.all(np.abs(a + b) <= tol):
+        return "IMPAR"
+    return "NINGUNA"
+
+def _criticos_numericos(r):
+    f1, f2 = diff(r.expr, r.x), diff(r.expr, r.x, 2)
+    d2 = compilar(r.expr, r.x, 2)
+    extrema = []
+    for p in encontrar_ceros_numéricos_por_muestreo(f1, r.x, r.xmin, r.xmax, n_intervals=r.n_intervals):
+        v = float(evaluar(d2, np.array([p]))[0])
+        extrema.append((p, "minimo" if v > 0 else "maximo" if v < 0 else "indeterminado"))
+    inflex = encontrar_ceros_numéricos_por_muestreo(f2, r.x, r.xmin, r.xmax, n_intervals=r.n_intervals)
+    return {"f1": f1, "f2": f2, "extrema": extrema, "inflexion": inflex}
+
+# respaldo numérico de cada etapa simbólica si se agota su plazo
+RESPALDO_NUMERICO = {
+    'paridad': _paridad_numerica,
+    'ceros_sym': lambda r: [],
+    'discontinuidades': lambda r: list(r.asintotas_verticales),
+    'limites': lambda r: (None, None, None),
+    'criticos': _criticos_numericos,
+}
+
+def _etapa(nombre, expr, x):
+    """Calcula una etapa simbólica en un proceso del pool."""
+    return getattr(AnalysisResult(expr, x), nombre)
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Análisis de una función en [xmin, xmax], compartido por la salida por
+    consola, el CSV y la gráfica. Cada parte se calcula la primera vez que se
+    pide, así que lo que no se muestra no se calcula."""
+    expr: object
+    x: object
+    xmin: float = -10.0
+    xmax: float = 10.0
+    npoints: int = 1600
+    dtype: object = np.float64
+    adaptativo: bool = False
+    tol: float = 2e-3
+    n_intervals: int = 800
+    _paridad: object = field(default=_PENDIENTE, repr=False)
+    _ceros_sym: object = field(default=_PENDIENTE, repr=False)
+    _ceros_num: object = field(default=_PENDIENTE, repr=False)
+    _raices: object = field(default=_PENDIENTE, repr=False)
+    _discontinuidades: object = field(default=_PENDIENTE, repr=False)
+    _limites: object = field(default=_PENDIENTE, repr=False)
+    _criticos: object = field(default=_PENDIENTE, repr=False)
+    _muestras: object = field(default=_PENDIENTE, repr=False)
+    _asintotas_verticales: object = field(default=_PENDIENTE, repr=False)
+    # etapas simbólicas reemplazadas por su respaldo numérico: {nombre: motivo}
+    fallos: dict = field(default_factory=dict, repr=False)
+
+    paridad = _perezoso('paridad', _calc_paridad)
+    ceros_sym = _perezoso('ceros_sym', lambda r: encontrar_ceros_simbólicos(r.expr, r.x))
+    ceros_num = _perezoso('ceros_num', lambda r: encontrar_ceros_numéricos_por_muestreo(r.expr, r.x, r.xmin, r.xmax, n_intervals=r.n_intervals))
+    raices = _perezoso('raices', _calc_raices)
+    discontinuidades = _perezoso('discontinuidades', lambda r: dominio_discontinuidades(r.expr, r.x))
+    # (límite en +inf, límite en -inf, asíntota oblicua)
+    limites = _perezoso('limites', lambda r: asiintotas_horizontales_slant(r.expr, r.x))
+    criticos = _perezoso('criticos', lambda r: puntos_criticos_simb(r.expr, r.x))
+    # (xs, ys)
+    muestras = _perezoso('muestras', _calc_muestras)
+    asintotas_verticales = _perezoso('asintotas_verticales', lambda r: detectar_asintotas_verticales_por_muestreo(*r.muestras))
+
+    def precalcular(self, etapas, timeout=TIMEOUT_ETAPA, timeouts=None, procesos=None):
+        """Calcula en paralelo las etapas simbólicas pendientes, cada una con su
+        plazo; mientras tanto se hace aquí el muestreo y los ceros numéricos."""
+        tareas = {n: (_etapa, (n, self.expr, self.x)) for n in etapas
+                  if getattr(self, '_' + n) is _PENDIENTE}
+        hechos, fallos = ejecutar_con_limite(tareas, timeout, timeouts, procesos=procesos,
+                                             mientras=lambda: (self.muestras, self.ceros_num))
+        for n, v in hechos.items():
+            setattr(self, '_' + n, v)
+        for n, motivo in fallos.items():
+            setattr(self, '_' + n, RESPALDO_NUMERICO[n](self))
+            self.fallos[n] = motivo
+        return self
+
+def analizar(expr, x, args):
+    """AnalysisResult con las opciones de la línea de comandos."""
+    return AnalysisResult(expr, x, args.xmin, args.xmax, npoints=args.npoints, dtype=args.dtype,
+                          adaptativo=args.adaptive, tol=args.tol)
+
+def _nota(r, nombre):
+    motivo = r.fallos.get(nombre)
+    return f" [{motivo}: resultado numérico]" if motivo else ""
+
+def imprimir_analisis(r, detallado=False):
+    print((f"Paridad: {r.paridad}" if r.paridad else "Paridad: no se pudo determinar") + _nota(r, 'paridad'))
+
+    # ceros simbólicos y numéricos
+    print(f"Ceros simbólicos (si aplica): {r.ceros_sym}{_nota(r, 'ceros_sym')}")
+    print("Ceros numéricos (aprox):", r.ceros_num)
+
+    # f(0)
+    try:
+        print("f(0) =", r.expr.subs(r.x, 0))
+    except Exception:
+        pass
+
+    # discontinuidades / asíntotas
+    if 'discontinuidades' in r.fallos:
+        print(f"Discontinuidades (por muestreo): {r.discontinuidades}{_nota(r, 'discontinuidades')}")
+    elif r.discontinuidades:
+        print("Discontinuidades simbólicas (denominador=0):", r.discontinuidades)
+    lim_pos, lim_neg, slant = r.limites
+    if 'limites' in r.fallos:
+        print(f"Límites en ±inf y asíntota oblicua: no disponibles{_nota(r, 'limites')}")
+    if lim_pos is not None:
+        print("Límite x->+inf:", lim_pos)
+    if lim_neg is not None:
+        print("Límite x->-inf:", lim_neg)
+    if slant:
+        print("Posible asíntota oblicua (q):", slant)
+
+    # derivadas y extremos (opcional)
+    if detallado:
+        det = r.criticos
+        print("\nDerivada f'(x):", det.get('f1'))
+        print("Derivada f''(x):", det.get('f2'))
+        print(f"Extremos simbólicos y clasificación: {det.get('extrema')}{_nota(r, 'criticos')}")
+        print(f"Puntos de inflexión simbólicos: {det.get('inflexion')}{_nota(r, 'criticos')}")
+
+    # tabla reducida
+    xs, ys = r.muestras
+    print("\nTabla de valores (muestra ~10 puntos):")
+    step = max(1, len(xs)//10)
+    print(f"{'x':>12} | {'f(x)':>20}")
+    print("-"*36)
+    for i in range(0, len(xs), step):
+        v = ys[i]
+        if np.isfinite(v):
+            print(f"{xs[i]:12.6g} | {v:20.12g}")
         else:
-            if np.isfinite(ys[i]) and np.isfinite(ys[i-1]):
-                if abs(ys[i] - ys[i-1]) > max(1e3, 10 * abs(ys[i-1]) + 1):
-                    vlines.add(0.5*(xs[i-1] + xs[i]))
-    vlist = sorted(list(vlines))
-    return vlist
+            print(f"{xs[i]:12.6g} | {'NaN':>20}")
+
+    # monotonicidad aproximada (simple)
+    dy = np.diff(ys)
+    if np.any(np.isfinite(dy)):
+        sign_changes = np.sum(np.abs(np.sign(dy[:-1]) - np.sign(dy[1:])) > 0)
+        print("\nAproximación: cambios de tendencia detectados (num):", int(sign_changes))
 
 # ---------------- CSV ----------------
 def export_csv(xs, ys, filename):
@@ -193,7 +870,10 @@ def export_csv(xs, ys, filename):
     print(f"Tabla exportada a: {filename}")
 
 # ---------------- plotting ----------------
-def plot_like_geogebra(expr, x, xs, ys, xmin, xmax, guardar=None, show=True, label=None):
+def plot_like_geogebra(r, guardar=None, show=True, label=None):
+    """Grafica un AnalysisResult; reutiliza lo ya calculado para la consola."""
+    expr, x, xmin, xmax = r.expr, r.x, r.xmin, r.xmax
+    xs, ys = r.muestras
     plt.figure(figsize=(10,6))
     mask = np.isfinite(ys)
     if np.any(mask):
@@ -202,46 +882,28 @@ def plot_like_geogebra(expr, x, xs, ys, xmin, xmax, guardar=None, show=True, lab
     plt.axvline(0, color='k', linewidth=0.8)
 
     # raíces simbólicas y numéricas
-    roots_sym = encontrar_ceros_simbólicos(expr, x)
-    roots_num = encontrar_ceros_numéricos_por_muestreo(expr, x, xmin, xmax, n_intervals=800)
-    roots = []
-    for r in roots_sym:
-        rf = to_float_safe(r)
-        if rf is not None:
-            roots.append(rf)
-        else:
-            try:
-                roots.append(float(r.evalf()))
-            except Exception:
-                pass
-    for r in roots_num:
-        if all(abs(r - rr) > 1e-5 for rr in roots):
-            roots.append(r)
-    roots = sorted(roots)
-    for r in roots:
-        if xmin <= r <= xmax:
-            try:
-                val = lambdify(x, expr, 'numpy')(r)
-                if np.isfinite(val):
-                    plt.scatter([r], [val], c='C1', zorder=6)
-                    plt.annotate(f"({r:.4g}, {val:.4g})", (r, val), textcoords="offset points", xytext=(6,6), fontsize=8)
-            except Exception:
-                pass
+    f_np = compilar(expr, x)
+    for rz in r.raices:
+        try:
+            val = f_np(rz)
+            if np.isfinite(val):
+                plt.scatter([rz], [val], c='C1', zorder=6)
+                plt.annotate(f"({rz:.4g}, {val:.4g})", (rz, val), textcoords="offset points", xytext=(6,6), fontsize=8)
+        except Exception:
+            pass
 
     # discontinuidades simbólicas y por muestreo
-    discos = dominio_discontinuidades(expr, x)
-    for d in discos:
+    for d in r.discontinuidades:
         df = to_float_safe(d)
         if df is not None and xmin <= df <= xmax:
             plt.axvline(df, color='gray', linestyle='--', linewidth=1)
             plt.annotate("discont.", (df, 0), textcoords="offset points", xytext=(6,6), fontsize=8)
-    vlines = detectar_asintotas_verticales_por_muestreo(xs, ys)
-    for v in vlines:
+    for v in r.asintotas_verticales:
         if xmin <= v <= xmax:
             plt.axvline(v, color='gray', linestyle='--', linewidth=1)
 
     # horizontales / oblicuas
-    lim_pos, lim_neg, slant = asiintotas_horizontales_slant(expr, x)
+    lim_pos, lim_neg, slant = r.limites
     for L in (lim_pos, lim_neg):
         if L is not None:
             Lf = to_float_safe(L)
@@ -250,7 +912,7 @@ def plot_like_geogebra(expr, x, xs, ys, xmin, xmax, guardar=None, show=True, lab
                 plt.annotate(f"y={Lf:.4g}", (xmin, Lf), textcoords="offset points", xytext=(6,-12), fontsize=8)
     if slant:
         try:
-            q = lambdify(x, slant, 'numpy')
+            q = compilar(slant, x)
             xs_lin = np.array([xmin, xmax])
             ys_lin = q(xs_lin)
             plt.plot(xs_lin, ys_lin, color='C3', linestyle=':', linewidth=1)
@@ -273,17 +935,212 @@ def plot_like_geogebra(expr, x, xs, ys, xmin, xmax, guardar=None, show=True, lab
         plt.show()
     plt.close()
 
+# ---------------- lote ----------------
+# --batch: un análisis por línea (expresión sola o JSON con "expr" y, opcional,
+# "id", "xmin", "xmax", "npoints"), repartidos en un ProcessPoolExecutor. Cada
+# resultado se escribe como una línea JSON en cuanto termina (en el orden en que
+# terminan; "indice" es la línea de entrada). La entrada se lee a medida que
+# hay lugar y hay a lo sumo EN_VUELO_POR_WORKER tareas por worker pendientes,
+# así que la memoria no crece con el tamaño del lote.
+EN_VUELO_POR_WORKER = 4
+ETAPAS_LOTE = ['ceros_sym', 'discontinuidades', 'limites', 'criticos']
+
+def _leer_lote(fh):
+    for indice, linea in enumerate(fh, 1):
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            continue
+        if linea.startswith('{'):
+            try:
+                item = json.loads(linea)
+            except ValueError as e:
+                yield indice, {"error": f"JSON inválido: {e}"}
+                continue
+            if not isinstance(item, dict) or not isinstance(item.get("expr"), str):
+                yield indice, {"error": 'falta "expr"'}
+                continue
+            yield indice, item
+        else:
+            yield indice, {"expr": linea}
+
+def _valor(v):
+    """Número finito -> float; infinito/NaN -> None; el resto (oo, conjuntos,
+    expresiones con parámetros) -> str."""
+    if v is None:
+        return None
+    try:
+        f = float(v)
+    except Exception:
+        return str(v)
+    return f if math.isfinite(f) else (None if isinstance(v, (float, np.floating)) else str(v))
+
+def analizar_item(indice, item, opciones):
+    """Analiza un ítem del lote dentro de un worker; devuelve un dict para JSON
+    (con "error" si no se pudo)."""
+    salida = {"indice": indice}
+    if "id" in item:
+        salida["id"] = item["id"]
+    try:
+        x = symbols('x')
+        expr = sympify(item["expr"])
+        xmin = float(item.get("xmin", opciones["xmin"]))
+        xmax = float(item.get("xmax", opciones["xmax"]))
+        npoints = int(item.get("npoints", opciones["npoints"]))
+        timeout, timeouts = opciones["timeout"], opciones["timeouts"]
+        hecho, fallo = ejecutar_con_limite({'simplificar': (simplify, (expr,))}, timeout, timeouts, procesos=0)
+        r = AnalysisResult(hecho.get('simplificar', expr), x, xmin, xmax, npoints=npoints, dtype=opciones["dtype"],
+                           adaptativo=opciones["adaptive"], tol=opciones["tol"])
+        r.fallos.update(fallo)
+        r.precalcular(ETAPAS_LOTE, timeout, timeouts, procesos=0)
+        lim_pos, lim_neg, slant = r.limites
+        det = r.criticos
+        salida.update({
+            "expr": str(r.expr),
+            "xmin": xmin, "xmax": xmax,
+            "ceros": r.raices,
+            "ceros_simbolicos": [str(c) for c in r.ceros_sym],
+            "discontinuidades": [_valor(d) for d in r.discontinuidades],
+            "asintotas_verticales": r.asintotas_verticales,
+            "limites": {"+inf": None if lim_pos is None else str(lim_pos),
+                        "-inf": None if lim_neg is None else str(lim_neg),
+                        "oblicua": str(slant) if slant else None},
+            "extremos": [{"x": _valor(p), "tipo": tipo} for p, tipo in det.get('extrema', [])],
+            "inflexiones": [_valor(p) for p in det.get('inflexion', [])],
+            "agotadas": r.fallos,
+        })
+        n = opciones["muestras"]
+        if n:
+            xs, ys = r.muestras
+            idx = np.unique(np.linspace(0, len(xs) - 1, n).astype(int))
+            salida["muestras"] = {"x": [_valor(v) for v in xs[idx]], "y": [_valor(v) for v in ys[idx]]}
+    except Exception as e:
+        salida["error"] = f"{type(e).__name__}: {e}"
+    return salida
+
+def _iniciar_worker(cache_dir, cache_simbolica, max_bytes):
+    configurar_cache_compiladas(cache_dir)
+    configurar_cache_simbolica(cache_simbolica, max_bytes)
+
+def procesar_lote(args, timeouts, salida=None):
+    salida = salida or sys.stdout
+    workers = args.workers or os.cpu_count() or 1
+    opciones = {"xmin": args.xmin, "xmax": args.xmax, "npoints": args.npoints, "dtype": args.dtype,
+                "adaptive": args.adaptive, "tol": args.tol, "timeout": args.timeout, "timeouts": timeouts,
+                "muestras": args.samples}
+    extra = {}
+    # recicla workers: las cachés internas de sympy no crecen sin límite. Antes
+    # de 3.11 el pool no lo soporta; se recrea cada workers * N ítems.
+    por_pool = None
+    if args.max_tasks_per_child and sys.version_info >= (3, 11):
+        extra["max_tasks_per_child"] = args.max_tasks_per_child
+    elif args.max_tasks_per_child:
+        por_pool = workers * args.max_tasks_per_child
+    initargs = (args.cache_dir, args.symbolic_cache, int(args.symbolic_cache_mb * 2**20))
+
+    def emitir(res):
+        salida.write(json.dumps(res, ensure_ascii=False) + "\n")
+        salida.flush()
+
+    total = errores = 0
+    fh = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+    en_vuelo = {}
+
+    def recoger(futuros):
+        nonlocal total, errores
+        for fut in futuros:
+            indice = en_vuelo.pop(fut)
+            try:
+                res = fut.result()
+            except BrokenProcessPool:
+                res = {"indice": indice, "error": "el worker terminó abruptamente (memoria agotada o fallo nativo)"}
+            except Exception as e:
+                res = {"indice": indice, "error": f"{type(e).__name__}: {e}"}
+            total += 1
+            errores += "error" in res
+            emitir(res)
+
+    try:
+        items = _leer_lote(fh)
+        quedan, reintento = True, []
+        while quedan:
+            quedan = False
+            with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker, initargs=initargs, **extra) as ex:
+                enviados = 0
+                for indice, item in chain(reintento, items):
+                    reintento = []
+                    if "error" in item:
+                        total += 1; errores += 1
+                        emitir({"indice": indice, **item})
+                        continue
+                    try:
+                        fut = ex.submit(analizar_item, indice, item, opciones)
+                    except BrokenProcessPool:
+                        # murió un worker: lo que estaba en vuelo sale como error
+                        # y este ítem pasa a un pool nuevo
+                        recoger(list(en_vuelo))
+                        reintento, quedan = [(indice, item)], True
+                        break
+                    en_vuelo[fut] = indice
+                    enviados += 1
+                    if len(en_vuelo) >= workers * EN_VUELO_POR_WORKER:
+                        hechos, _ = wait(list(en_vuelo), return_when=FIRST_COMPLETED)
+                        recoger(hechos)
+                    if por_pool and enviados >= por_pool:
+                        quedan = True
+                        break
+                while en_vuelo:
+                    hechos, _ = wait(list(en_vuelo), return_when=FIRST_COMPLETED)
+                    recoger(hechos)
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    print(f"Lote: {total} ítems, {errores} con error", file=sys.stderr)
+
 # ---------------- main ----------------
 def main():
     parser = argparse.ArgumentParser(description="Analizador y graficador estilo GeoGebra (1 o 2 funciones)")
-    parser.add_argument("funciones", nargs="+", help='Una o dos funciones en variable x, ej: "x**2" o "sin(x)" "-4*x+6"')
+    parser.add_argument("funciones", nargs="*", help='Una o dos funciones en variable x, ej: "x**2" o "sin(x)" "-4*x+6"')
     parser.add_argument("--xmin", type=float, default=-10.0)
     parser.add_argument("--xmax", type=float, default=10.0)
     parser.add_argument("--npoints", type=int, default=1600)
+    parser.add_argument("--dtype", choices=['float64','float32'], default='float64', help="Precisión de la tabla muestreada")
+    parser.add_argument("--adaptive", action='store_true', help="Muestreo adaptativo (--npoints pasa a ser el máximo de evaluaciones)")
+    parser.add_argument("--tol", type=float, default=2e-3, help="Tolerancia relativa del muestreo adaptativo")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Carpeta donde guardar el código de las funciones compiladas entre ejecuciones "
+                             "(se ejecuta al cargarlo: debe ser privada, 0700)")
     parser.add_argument("--export", choices=['csv','none'], default='none', help="Exportar tabla a CSV")
     parser.add_argument("--detailed", action='store_true', help="Análisis detallado (derivadas, extremos simbólicos)")
     parser.add_argument("--saveplot", type=str, default=None, help="Guardar PNG o carpeta")
+    parser.add_argument("--symbolic-cache", type=str, default=None, metavar="DIR", help="Carpeta para guardar los resultados simbólicos entre ejecuciones "
+                             "(se lee con pickle: debe ser privada, 0700)")
+    parser.add_argument("--symbolic-cache-mb", type=float, default=64, help="Tamaño máximo de la caché simbólica (MB)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_ETAPA, help="Segundos por etapa simbólica (0 = sin límite, en serie)")
+    parser.add_argument("--timeout-etapa", action='append', default=[], metavar="ETAPA=SEG",
+                        help="Plazo propio para una etapa: simplificar, paridad, ceros_sym, discontinuidades, limites, criticos, "
+                             "intersecciones; con dos funciones, también simplificar:f1, discontinuidades:f2, etc.")
+    parser.add_argument("--batch", type=str, default=None, metavar="FILE|-",
+                        help="Analizar un lote: una expresión por línea o JSONL con expr/id/xmin/xmax/npoints; salida JSONL")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos para --batch (por defecto, uno por núcleo)")
+    parser.add_argument("--max-tasks-per-child", type=int, default=500, help="Ítems por worker antes de reciclarlo (0 = nunca)")
+    parser.add_argument("--samples", type=int, default=0, help="Con --batch, incluir una tabla de N puntos por ítem")
     args = parser.parse_args()
+    if not args.batch and not args.funciones:
+        parser.error("falta la función (o --batch FILE|-)")
+    if args.batch and args.batch != '-' and not os.path.isfile(args.batch):
+        parser.error(f"no existe el archivo de --batch: {args.batch}")
+    configurar_cache_compiladas(args.cache_dir)
+    configurar_cache_simbolica(args.symbolic_cache, int(args.symbolic_cache_mb * 2**20))
+    timeouts = {}
+    for item in args.timeout_etapa:
+        nombre, _, seg = item.partition('=')
+        try:
+            timeouts[nombre.strip()] = float(seg)
+        except ValueError:
+            print(f"--timeout-etapa inválido: {item!r}"); return
+
+    if args.batch:
+        procesar_lote(args, timeouts)
+        return
 
     x = symbols('x')
 
@@ -301,85 +1158,29 @@ def main():
         except Exception as e:
             print("Error al parsear la función:", e); return
 
-        expr_s = simplify(expr)
+        hecho, fallo = ejecutar_con_limite({'simplificar': (simplify, (expr,))}, args.timeout, timeouts)
+        expr_s = hecho.get('simplificar', expr)
+        if fallo:
+            print(f"\nSimplificación: {fallo['simplificar']}, se usa la expresión original")
         print(f"\nFunción simplificada: {expr_s}")
 
-        # paridad
-        try:
-            expr_negx = simplify(expr_s.subs(x, -x))
-            es_par = simplify(expr_negx - expr_s) == 0
-            es_impar = simplify(expr_negx + expr_s) == 0
-            if es_par:
-                print("Paridad: PAR")
-            elif es_impar:
-                print("Paridad: IMPAR")
-            else:
-                print("Paridad: NINGUNA")
-        except Exception:
-            print("Paridad: no se pudo determinar")
-
-        # ceros simbólicos y numéricos
-        ceros_sym = encontrar_ceros_simbólicos(expr_s, x)
-        ceros_num = encontrar_ceros_numéricos_por_muestreo(expr_s, x, args.xmin, args.xmax, n_intervals=800)
-        print("Ceros simbólicos (si aplica):", ceros_sym)
-        print("Ceros numéricos (aprox):", ceros_num)
-
-        # f(0)
-        try:
-            y0 = expr_s.subs(x, 0)
-            print("f(0) =", y0)
-        except Exception:
-            pass
-
-        # discontinuidades / asíntotas
-        discos = dominio_discontinuidades(expr_s, x)
-        if discos:
-            print("Discontinuidades simbólicas (denominador=0):", discos)
-        lim_pos, lim_neg, slant = asiintotas_horizontales_slant(expr_s, x)
-        if lim_pos is not None:
-            print("Límite x->+inf:", lim_pos)
-        if lim_neg is not None:
-            print("Límite x->-inf:", lim_neg)
-        if slant:
-            print("Posible asíntota oblicua (q):", slant)
-
-        # derivadas y extremos (opcional)
-        if args.detailed:
-            det = puntos_criticos_simb(expr_s, x)
-            print("\nDerivada f'(x):", det.get('f1'))
-            print("Derivada f''(x):", det.get('f2'))
-            print("Extremos simbólicos y clasificación:", det.get('extrema'))
-            print("Puntos de inflexión simbólicos:", det.get('inflexion'))
-
-        # muestreo numérico y tabla reducida
-        xs, ys = muestrear_funcion(expr_s, x, args.xmin, args.xmax, npoints=args.npoints)
-        print("\nTabla de valores (muestra ~10 puntos):")
-        step = max(1, len(xs)//10)
-        print(f"{'x':>12} | {'f(x)':>20}")
-        print("-"*36)
-        for i in range(0, len(xs), step):
-            v = ys[i]
-            if np.isfinite(v):
-                print(f"{xs[i]:12.6g} | {v:20.12g}")
-            else:
-                print(f"{xs[i]:12.6g} | {'NaN':>20}")
-
-        # monotonicidad aproximada (simple)
-        dy = np.diff(ys)
-        if np.any(np.isfinite(dy)):
-            sign_changes = np.sum(np.abs(np.sign(dy[:-1]) - np.sign(dy[1:])) > 0)
-            print("\nAproximación: cambios de tendencia detectados (num):", int(sign_changes))
+        # un solo análisis para consola, CSV y gráfica; las etapas simbólicas
+        # corren en paralelo y con plazo
+        res = analizar(expr_s, x, args)
+        etapas = ['paridad', 'ceros_sym', 'discontinuidades', 'limites'] + (['criticos'] if args.detailed else [])
+        res.precalcular(etapas, args.timeout, timeouts)
+        imprimir_analisis(res, detallado=args.detailed)
 
         # export CSV si piden
         if args.export == 'csv':
             fname = safe_name(str(expr_s)) + ".csv"
-            export_csv(xs, ys, fname)
+            export_csv(*res.muestras, fname)
 
         # plot
         guardar = args.saveplot
         if guardar and os.path.isdir(guardar):
             guardar = os.path.join(guardar, safe_name(str(expr_s)) + ".png")
-        plot_like_geogebra(expr_s, x, xs, ys, args.xmin, args.xmax, guardar=guardar, show=True, label=f"f(x) = {expr_s}")
+        plot_like_geogebra(res, guardar=guardar, show=True, label=f"f(x) = {expr_s}")
 
     # Caso 2: dos funciones -> graficar ambas y buscar intersecciones
     else:
@@ -390,16 +1191,33 @@ def main():
         except Exception as e:
             print("Error al parsear las funciones:", e); return
 
-        xs, ys1 = muestrear_funcion(expr1, x, args.xmin, args.xmax, npoints=args.npoints)
-        _, ys2 = muestrear_funcion(expr2, x, args.xmin, args.xmax, npoints=args.npoints)
+        # etapas simbólicas en paralelo y con plazo; mientras, el muestreo
+        # (con --adaptive cada función tiene su propia malla)
+        res1, res2 = analizar(expr1, x, args), analizar(expr2, x, args)
+        hecho, fallos = ejecutar_con_limite({
+            'simplificar:f1': (simplify, (expr1,)),
+            'simplificar:f2': (simplify, (expr2,)),
+            'intersecciones': (encontrar_ceros_simbólicos, (expr1 - expr2, x)),
+            'discontinuidades:f1': (dominio_discontinuidades, (expr1, x)),
+            'discontinuidades:f2': (dominio_discontinuidades, (expr2, x)),
+        }, args.timeout, timeouts, mientras=lambda: (res1.muestras, res2.muestras))
+        respaldo = {
+            'simplificar': "se usa la expresión sin simplificar",
+            'intersecciones': "se buscan numéricamente",
+            'discontinuidades': "se usan las asíntotas detectadas por muestreo",
+        }
+        for nombre, motivo in fallos.items():
+            print(f"{nombre}: {motivo}, {respaldo[nombre.partition(':')[0]]}")
+        xs1, ys1 = res1.muestras
+        xs2, ys2 = res2.muestras
 
         plt.figure(figsize=(10,6))
         mask1 = np.isfinite(ys1)
         mask2 = np.isfinite(ys2)
         if np.any(mask1):
-            plt.plot(xs[mask1], ys1[mask1], label=f"f1(x) = {simplify(expr1)}", linewidth=2)
+            plt.plot(xs1[mask1], ys1[mask1], label=f"f1(x) = {hecho.get('simplificar:f1', expr1)}", linewidth=2)
         if np.any(mask2):
-            plt.plot(xs[mask2], ys2[mask2], label=f"f2(x) = {simplify(expr2)}", linewidth=2, linestyle='--')
+            plt.plot(xs2[mask2], ys2[mask2], label=f"f2(x) = {hecho.get('simplificar:f2', expr2)}", linewidth=2, linestyle='--')
         plt.axhline(0, color='k', linewidth=0.8); plt.axvline(0, color='k', linewidth=0.8)
         plt.grid(True, linestyle=':', linewidth=0.7)
         plt.legend()
@@ -407,16 +1225,11 @@ def main():
         plt.xlim(args.xmin, args.xmax)
 
         # intento simbólico de intersecciones
-        try:
-            inter_sym = solveset(Eq(expr1, expr2), x, domain=S.Reals)
-            inter_list = list(inter_sym)
-        except Exception:
-            inter_list = []
+        inter_list = hecho.get('intersecciones', [])
 
         # si simbólico vacío o difícil, buscar numéricamente por muestreo de diferencia
         if not inter_list:
-            diff_expr = simplify(expr1 - expr2)
-            inter_list = encontrar_ceros_numéricos_por_muestreo(diff_expr, x, args.xmin, args.xmax, n_intervals=800)
+            inter_list = encontrar_ceros_numéricos_por_muestreo(expr1 - expr2, x, args.xmin, args.xmax, n_intervals=800)
 
         # mostrar intersecciones con coordenadas y marcarlas
         inter_coords = []
@@ -430,9 +1243,9 @@ def main():
                 # obtener y a partir de f1 (si finito)
                 yv = None
                 try:
-                    yv = float(lambdify(x, expr1, 'numpy')(xv))
+                    yv = float(compilar(expr1, x)(xv))
                     if not np.isfinite(yv):
-                        yv = float(lambdify(x, expr2, 'numpy')(xv))
+                        yv = float(compilar(expr2, x)(xv))
                 except Exception:
                     try:
                         yv = float(expr1.subs(x, xi))
@@ -445,12 +1258,10 @@ def main():
             except Exception:
                 continue
 
-        # eliminar duplicados por tolerancia
-        uniq = []
-        for (a,b) in inter_coords:
-            if all(abs(a - u[0]) > 1e-5 for u in uniq):
-                uniq.append((a,b))
-        inter_coords = sorted(uniq, key=lambda t: t[0])
+        # eliminar duplicados por tolerancia (ordenando por x)
+        inter_coords.sort(key=lambda t: t[0])
+        inter_coords = [p for i, p in enumerate(inter_coords)
+                        if i == 0 or p[0] - inter_coords[i-1][0] > 1e-5]
 
         print("Intersecciones (x, y) aproximadas:")
         for (a,b) in inter_coords:
@@ -462,8 +1273,8 @@ def main():
                 plt.annotate(f"({a:.4g}, {b:.4g})", (a,b), textcoords="offset points", xytext=(6,6), fontsize=8)
 
         # marcar discontinuidades de cada función
-        discos1 = dominio_discontinuidades(expr1, x)
-        discos2 = dominio_discontinuidades(expr2, x)
+        discos1 = hecho.get('discontinuidades:f1', res1.asintotas_verticales)
+        discos2 = hecho.get('discontinuidades:f2', res2.asintotas_verticales)
         for d in set(discos1 + discos2):
             df = to_float_safe(d)
             if df is not None and args.xmin <= df <= args.xmax:
@@ -483,10 +1294,10 @@ def main():
 
         # export CSV opcional: generar dos CSVs con tablas de cada función
         if args.export == 'csv':
-            fname1 = safe_name(str(simplify(expr1))) + ".csv"
-            fname2 = safe_name(str(simplify(expr2))) + ".csv"
-            export_csv(xs, ys1, fname1)
-            export_csv(xs, ys2, fname2)
+            fname1 = safe_name(str(hecho.get('simplificar:f1', expr1))) + ".csv"
+            fname2 = safe_name(str(hecho.get('simplificar:f2', expr2))) + ".csv"
+            export_csv(xs1, ys1, fname1)
+            export_csv(xs2, ys2, fname2)
 
 if __name__ == "__main__":
     main()
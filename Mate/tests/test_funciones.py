@@ -0,0 +1,306 @@
+# Mate/tests/test_funciones.py
+# Ejecutar desde la raíz del repo: python -m unittest discover -s Mate/tests
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from argparse import Namespace
+from unittest import mock
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import sympy as sp  # noqa: E402
+
+import Funciones as F  # noqa: E402
+
+x = sp.symbols("x")
+
+
+def _duplicar(v):
+    _duplicar.llamadas += 1
+    return 2 * v
+
+
+_duplicar.llamadas = 0
+
+
+class RaicesTest(unittest.TestCase):
+    def test_sin_50x_encuentra_todos_los_ceros(self):
+        ceros = F.encontrar_ceros_numéricos_por_muestreo(sp.sin(50 * x), x, 0.01, 1.0)
+        esperados = [k * np.pi / 50 for k in range(1, 16)]
+        self.assertEqual(len(ceros), len(esperados))
+        np.testing.assert_allclose(ceros, esperados, atol=1e-8)
+
+    def test_refinar_varios_corchetes_a_la_vez(self):
+        f = F.compilar(sp.sin(50 * x), x)
+        a = np.array([0.05, 0.11, 0.17])
+        b = a + 0.03
+        rs = F.refinar_raices(f, a, b, F.evaluar(f, a), F.evaluar(f, b), df=F.compilar(sp.sin(50 * x), x, 1))
+        np.testing.assert_allclose(rs, [np.pi / 50 * k for k in (1, 2, 3)], atol=1e-10)
+
+    def test_corchete_sobre_un_polo_no_es_raiz(self):
+        for expr, a, b in ((1 / x, -1.0, 0.5), (sp.tan(x), 1.5, 1.7)):
+            f = F.compilar(expr, x)
+            fa, fb = F.evaluar(f, np.array([a, b]))
+            self.assertLess(fa * fb, 0)
+            rs = F.refinar_raices(f, [a], [b], [fa], [fb])
+            self.assertTrue(np.isnan(rs[0]), expr)
+        self.assertEqual(F.encontrar_ceros_numéricos_por_muestreo(1 / x, x, -1, 1), [])
+
+    def test_fusionar_raices(self):
+        self.assertEqual(F.fusionar_raices([2.0, 1.0, None, 1.0 + 1e-7, 2.0 - 1e-9]), [1.0, 2.0 - 1e-9])
+        self.assertEqual(F.fusionar_raices([]), [])
+
+
+class MuestreoTest(unittest.TestCase):
+    def test_constante_se_expande_a_toda_la_malla(self):
+        for expr in (sp.Integer(3), sp.pi, x - x + 2):
+            xs, ys = F.muestrear_funcion(expr, x, -1, 1, npoints=50)
+            self.assertEqual(ys.shape, (50,), expr)
+            np.testing.assert_allclose(ys, float(sp.sympify(expr).subs(x, 0)))
+
+    def test_complejos_quedan_en_nan(self):
+        xs, ys = F.muestrear_funcion(sp.sqrt(x), x, -4, 4, npoints=9)
+        np.testing.assert_array_equal(np.isnan(ys), xs < 0)
+        np.testing.assert_allclose(ys[xs >= 0], np.sqrt(xs[xs >= 0]))
+        ys = F.valores_reales(np.array([1 + 0j, 2 + 1e-20j, 1j, np.inf]), (4,))
+        np.testing.assert_array_equal(ys, [1.0, 2.0, np.nan, np.nan])
+
+    def test_dtype_float32(self):
+        r = F.AnalysisResult(sp.exp(x), x, -2, 2, npoints=100, dtype="float32")
+        xs, ys = r.muestras
+        self.assertEqual((xs.dtype, ys.dtype), (np.float32, np.float32))
+        np.testing.assert_allclose(ys, np.exp(xs.astype(float)), rtol=1e-6)
+        ruta = os.path.join(tempfile.mkdtemp(), "tabla.csv")
+        with mock.patch("sys.stdout", io.StringIO()):
+            F.export_csv(xs, ys, ruta)
+        with open(ruta, encoding="utf-8") as fh:
+            filas = fh.read().splitlines()
+        self.assertEqual(len(filas), 101)
+        self.assertAlmostEqual(float(filas[1].split(",")[1]), np.exp(-2), places=6)
+
+
+class MuestreoAdaptativoTest(unittest.TestCase):
+    def _contar(self, expr, **kw):
+        evaluados = []
+        evaluar = F.evaluar
+
+        def contando(f, xs, dtype=np.float64):
+            evaluados.append(np.size(xs))
+            return evaluar(f, xs, dtype)
+
+        with mock.patch.object(F, "evaluar", contando):
+            xs, ys = F.muestrear_adaptativo(expr, x, -10, 10, **kw)
+        return xs, ys, sum(evaluados)
+
+    def test_recta_no_se_subdivide(self):
+        xs, _, n = self._contar(2 * x + 1, max_puntos=1600, n_inicial=65)
+        # un solo nivel de puntos medios confirma que es lineal
+        self.assertEqual(n, 2 * 65 - 1)
+        self.assertEqual(len(xs), n)
+
+    def test_respeta_el_presupuesto(self):
+        for expr in (sp.sin(x**2), 1 / x, sp.sqrt(x)):
+            xs, ys, n = self._contar(expr, max_puntos=400)
+            self.assertLessEqual(n, 400, expr)
+            self.assertEqual(n, len(xs))
+            self.assertTrue(np.all(np.diff(xs) > 0))
+            self.assertEqual(xs.shape, ys.shape)
+
+    def test_concentra_puntos_donde_hay_curvatura(self):
+        xs, _, _ = self._contar(sp.tanh(20 * x), max_puntos=300)
+        cerca = np.count_nonzero(np.abs(xs) < 1)
+        self.assertGreater(cerca, len(xs) // 3)
+
+
+class AnalysisResultTest(unittest.TestCase):
+    def test_nada_se_calcula_hasta_pedirlo(self):
+        with mock.patch.object(F, "muestrear_funcion", wraps=F.muestrear_funcion) as muestreo, mock.patch.object(
+            F, "encontrar_ceros_simbólicos", wraps=F.encontrar_ceros_simbólicos
+        ) as simbolicos:
+            r = F.AnalysisResult(x**2 - 1, x, -3, 3, npoints=200)
+            muestreo.assert_not_called()
+            simbolicos.assert_not_called()
+            r.muestras
+            r.muestras
+            r.asintotas_verticales
+            self.assertEqual(muestreo.call_count, 1)
+            simbolicos.assert_not_called()
+            self.assertEqual(r.raices, [-1.0, 1.0])
+            r.raices
+            self.assertEqual(simbolicos.call_count, 1)
+        self.assertIs(r._criticos, F._PENDIENTE)
+        self.assertIs(r._limites, F._PENDIENTE)
+
+    def test_etapa_agotada_usa_el_respaldo_numerico(self):
+        def agotar(tareas, timeout, timeouts=None, mientras=None, procesos=None):
+            mientras()
+            return {}, {n: "tiempo agotado" for n in tareas}
+
+        r = F.AnalysisResult(x**3, x, -2, 2, npoints=200)
+        with mock.patch.object(F, "ejecutar_con_limite", agotar):
+            r.precalcular(["paridad", "ceros_sym", "limites"])
+        self.assertEqual(r.paridad, "IMPAR")
+        self.assertEqual(r.ceros_sym, [])
+        self.assertEqual(r.limites, (None, None, None))
+        self.assertEqual(set(r.fallos), {"paridad", "ceros_sym", "limites"})
+
+
+class EjecutarConLimiteTest(unittest.TestCase):
+    def test_plazo_vencido_en_el_pool(self):
+        t0 = time.monotonic()
+        hecho, fallos = F.ejecutar_con_limite({"rapida": (abs, (-3,)), "lenta": (time.sleep, (30,))}, timeout=1)
+        self.assertLess(time.monotonic() - t0, 15)
+        self.assertEqual(hecho, {"rapida": 3})
+        self.assertEqual(fallos, {"lenta": "tiempo agotado"})
+
+    @unittest.skipUnless(F._puede_alarmar(), "sin SIGALRM")
+    def test_plazo_vencido_en_serie(self):
+        hecho, fallos = F.ejecutar_con_limite(
+            {"lenta": (time.sleep, (30,)), "rapida": (abs, (-3,))}, timeout=30, timeouts={"lenta": 0.2}, procesos=0
+        )
+        self.assertEqual(hecho, {"rapida": 3})
+        self.assertEqual(fallos, {"lenta": "tiempo agotado"})
+
+    def test_plazo_por_etapa_y_variante(self):
+        self.assertEqual(F._plazo("simplificar:f1", 30, {"simplificar": 5}), 5)
+        self.assertEqual(F._plazo("simplificar:f1", 30, {"simplificar": 5, "simplificar:f1": 2}), 2)
+        self.assertEqual(F._plazo("limites", 30, {"simplificar": 5}), 30)
+
+    def test_error_no_detiene_las_demas(self):
+        hecho, fallos = F.ejecutar_con_limite({"mal": (int, ("x",)), "bien": (abs, (-1,))}, timeout=0)
+        self.assertEqual(hecho, {"bien": 1})
+        self.assertEqual(fallos, {"mal": "error"})
+
+
+class CompiladasTest(unittest.TestCase):
+    def setUp(self):
+        self.maximo = F.COMPILADAS_MAX
+        F._compiladas.clear()
+
+    def tearDown(self):
+        F.configurar_cache_compiladas(None, self.maximo)
+        F._compiladas.clear()
+
+    def test_lru_desaloja_la_menos_usada(self):
+        F.configurar_cache_compiladas(None, 2)
+        f1 = F.compilar(x + 1, x)
+        F.compilar(x + 2, x)
+        self.assertIs(F.compilar(x + 1, x), f1)  # pasa a ser la más reciente
+        F.compilar(x + 3, x)
+        self.assertEqual(len(F._compiladas), 2)
+        self.assertIs(F.compilar(x + 1, x), f1)
+        with mock.patch.object(F, "lambdify", wraps=F.lambdify) as lambdify:
+            F.compilar(x + 2, x)
+        lambdify.assert_called_once()
+
+    def test_recarga_desde_disco_da_los_mismos_valores(self):
+        F.configurar_cache_compiladas(tempfile.mkdtemp())
+        xs = np.linspace(0.5, 3.0, 7)
+        exprs = [sp.gamma(x), sp.erf(x), sp.Max(x, 0) + sp.sin(x), sp.Piecewise((x, x > 1), (0, True))]
+        antes = [F.evaluar(F.compilar(e, x), xs) for e in exprs]
+        F._compiladas.clear()  # simula otra ejecución
+        with mock.patch.object(F, "lambdify", wraps=F.lambdify) as lambdify:
+            despues = [F.evaluar(F.compilar(e, x), xs) for e in exprs]
+        lambdify.assert_not_called()
+        for e, a, b in zip(exprs, antes, despues):
+            self.assertTrue(np.all(np.isfinite(a)), e)
+            np.testing.assert_array_equal(a, b)
+
+
+class CacheSimbolicaTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        F.configurar_cache_simbolica(self.dir)
+        _duplicar.llamadas = 0
+
+    def tearDown(self):
+        F.configurar_cache_simbolica(None)
+
+    def test_ida_y_vuelta(self):
+        tareas = {"doble": (_duplicar, (sp.sin(x),))}
+        primero, _ = F.ejecutar_con_limite(tareas, timeout=0)
+        segundo, _ = F.ejecutar_con_limite(tareas, timeout=0)
+        self.assertEqual(primero, {"doble": 2 * sp.sin(x)})
+        self.assertEqual(segundo, primero)
+        self.assertEqual(_duplicar.llamadas, 1)
+        self.assertEqual(len([n for n in os.listdir(self.dir) if n.endswith(".pkl")]), 1)
+
+    def test_archivo_corrupto_se_descarta(self):
+        clave = F.clave_simbolica(_duplicar, (x,))
+        with open(os.path.join(self.dir, clave + ".pkl"), "wb") as fh:
+            fh.write(b"no es pickle")
+        self.assertEqual(F.leer_cache_simbolica(clave), (False, None))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, clave + ".pkl")))
+
+    def test_carpeta_escribible_por_otros_se_ignora(self):
+        os.chmod(self.dir, 0o777)
+        with mock.patch("sys.stderr", io.StringIO()):
+            F.configurar_cache_simbolica(self.dir)
+        self.assertIsNone(F._dir_simbolico)
+
+
+class ProcesarLoteTest(unittest.TestCase):
+    def _args(self, **kw):
+        opciones = dict(
+            batch="-", workers=2, max_tasks_per_child=0, xmin=-5.0, xmax=5.0, npoints=200, dtype=np.float64,
+            adaptive=False, tol=2e-3, timeout=20.0, samples=0, cache_dir=None, symbolic_cache=None,
+            symbolic_cache_mb=64,
+        )
+        opciones.update(kw)
+        return Namespace(**opciones)
+
+    def _correr(self, entrada, **kw):
+        salida = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(entrada)), mock.patch("sys.stderr", io.StringIO()):
+            F.procesar_lote(self._args(**kw), {}, salida)
+        return [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+    def test_worker_muerto_no_aborta_el_lote(self):
+        # sympify evalúa la cadena: este ítem mata al worker como un OOM
+        lineas = ["x + 1", "__import__('os')._exit(1)"] + [f"x**2 - {k}" for k in range(12)]
+        res = self._correr("\n".join(lineas), workers=1)
+        self.assertEqual(sorted(r["indice"] for r in res), list(range(1, len(lineas) + 1)))
+        por_indice = {r["indice"]: r for r in res}
+        self.assertIn("error", por_indice[2])
+        self.assertNotIn("error", por_indice[len(lineas)])
+
+    def test_cada_item_se_emite_una_vez(self):
+        entrada = "\n".join(
+            [
+                "x**2 - 1",
+                "# comentario",
+                '{"id": "seno", "expr": "sin(x)", "xmin": -4, "xmax": 4}',
+                "{roto",
+                '{"sin_expr": 1}',
+                "1/x",
+                "x**2 - 1",
+            ]
+        )
+        args = Namespace(
+            batch="-", workers=2, max_tasks_per_child=0, xmin=-5.0, xmax=5.0, npoints=200, dtype=np.float64,
+            adaptive=False, tol=2e-3, timeout=20.0, samples=0, cache_dir=None, symbolic_cache=None,
+            symbolic_cache_mb=64,
+        )
+        salida = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(entrada)), mock.patch("sys.stderr", io.StringIO()):
+            F.procesar_lote(args, {}, salida)
+        res = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual(sorted(r["indice"] for r in res), [1, 3, 4, 5, 6, 7])
+        por_indice = {r["indice"]: r for r in res}
+        self.assertEqual(por_indice[1]["ceros"], [-1.0, 1.0])
+        self.assertEqual(por_indice[3]["id"], "seno")
+        self.assertIn("error", por_indice[4])
+        self.assertIn("error", por_indice[5])
+        self.assertEqual(len(por_indice[6]["asintotas_verticales"]), 1)
+        self.assertAlmostEqual(por_indice[6]["asintotas_verticales"][0], 0.0)
+        self.assertEqual(por_indice[7]["ceros"], por_indice[1]["ceros"])
+
+
+if __name__ == "__main__":
+    unittest.main()